@@ -2,9 +2,12 @@
 AI Chat Controller
 REST API endpoints for AI chatbot
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Any, List, Optional
 from ..schemas.ai_chat_schema import (
     CreateSessionRequest,
     SendMessageRequest,
@@ -14,18 +17,29 @@ from ..schemas.ai_chat_schema import (
     AIChatMessageResponse
 )
 from ..services.ai_chat_service import AIChatService
+from ..services.gemini_service import GeminiService, GeminiUnavailableError
 from ..repositories.ai_chat_repository import AIChatRepository
-from ..core.database import get_db
-from ..core.dependencies import get_current_user
+from ..core.database import get_db, AsyncSessionLocal
+from ..core.dependencies import get_current_user, get_gemini_service
+from ..core.pagination import Page, page_items
 
 
 router = APIRouter(prefix='/ai-chat', tags=['AI Chat'])
 
 
-def _get_ai_chat_service(db: AsyncSession = Depends(get_db)) -> AIChatService:
+def _get_ai_chat_service(
+    db: AsyncSession = Depends(get_db),
+    gemini_service: GeminiService = Depends(get_gemini_service)
+) -> AIChatService:
     """Dependency to get AI chat service"""
     repository = AIChatRepository(db)
-    return AIChatService(repository)
+    return AIChatService(repository, gemini_service)
+
+
+async def _compact_history(session_id: str, user_id: str, gemini_service: GeminiService) -> None:
+    """Update the session's rolling summary once the response has been sent (the request's DB session is closed by then)"""
+    async with AsyncSessionLocal() as db:
+        await AIChatService(AIChatRepository(db), gemini_service).compact_history(session_id, user_id)
 
 
 @router.post('/sessions', response_model=AIChatSessionResponse, status_code=status.HTTP_201_CREATED)
@@ -53,21 +67,29 @@ async def create_session(
 
 @router.get('/sessions', response_model=List[AIChatSessionResponse])
 async def get_sessions(
+    response: Response,
     is_archived: bool = False,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
     current_user: dict = Depends(get_current_user),
     service: AIChatService = Depends(_get_ai_chat_service)
 ):
     """
-    Get all chat sessions for current user
-    - Returns list of sessions ordered by most recent
+    Get chat sessions for current user
+    - Returns a page of sessions ordered by most recent
     - Filter by archived status
+    - Next page cursor is returned in the X-Next-Cursor header
     """
     try:
-        sessions = await service.get_user_sessions(
+        sessions, next_cursor = await service.get_user_sessions(
             user_id=current_user["id"],
-            is_archived=is_archived
+            is_archived=is_archived,
+            limit=limit,
+            cursor=cursor
         )
-        return [AIChatSessionResponse.model_validate(s) for s in sessions]
+        return page_items(response, Page([AIChatSessionResponse.model_validate(s) for s in sessions], next_cursor))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -116,6 +138,7 @@ async def get_session(
 async def send_message(
     session_id: str,
     request: SendMessageRequest,
+    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
     service: AIChatService = Depends(_get_ai_chat_service)
 ):
@@ -131,11 +154,17 @@ async def send_message(
             user_id=current_user["id"],
             content=request.content
         )
+        background_tasks.add_task(_compact_history, session_id, current_user["id"], service.gemini_service)
         
         return SendMessageResponse(
             user_message=AIChatMessageResponse.model_validate(user_msg),
             assistant_message=AIChatMessageResponse.model_validate(assistant_msg)
         )
+    except GeminiUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -148,6 +177,63 @@ async def send_message(
         )
 
 
+def _sse(event: str, data: Any) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post('/sessions/{session_id}/messages/stream')
+async def stream_message(
+    session_id: str,
+    request: SendMessageRequest,
+    current_user: dict = Depends(get_current_user),
+    service: AIChatService = Depends(_get_ai_chat_service)
+):
+    """
+    Send a message and stream the AI reply as server-sent events
+    - `user_message`: the stored user message
+    - `delta`: `{"text": ...}` for each chunk of the reply
+    - `done`: the stored assistant message
+    - `error`: `{"detail": ...}` if generation fails
+    """
+    try:
+        session, user_msg = await service.start_message(
+            session_id=session_id,
+            user_id=current_user["id"],
+            content=request.content
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    
+    user_event = AIChatMessageResponse.model_validate(user_msg).model_dump(mode='json')
+    
+    async def events():
+        yield _sse('user_message', user_event)
+        # The request's DB session is closed before the body is sent, so the
+        # reply is persisted through one owned by the stream. On client
+        # disconnect Starlette cancels this generator and nothing is stored.
+        async with AsyncSessionLocal() as db:
+            stream_service = AIChatService(AIChatRepository(db), service.gemini_service)
+            try:
+                async for event, data in stream_service.stream_reply(session, user_msg):
+                    if event == 'delta':
+                        yield _sse('delta', {'text': data})
+                    else:
+                        yield _sse('done', AIChatMessageResponse.model_validate(data).model_dump(mode='json'))
+            except (ValueError, GeminiUnavailableError) as e:
+                yield _sse('error', {'detail': str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        background=BackgroundTask(_compact_history, session_id, current_user["id"], service.gemini_service)
+    )
+
+
 @router.delete('/sessions/{session_id}', status_code=status.HTTP_204_NO_CONTENT)
 async def delete_session(
     session_id: str,
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..schemas.auth_schema import (
     SignupRequest, LoginRequest, TokenResponse, RefreshTokenRequest,
@@ -10,7 +11,7 @@ from ..services.auth_service import AuthService
 from ..repositories.role_application_repository import RoleApplicationRepository
 from ..core.database import get_db
 from ..core.dependencies import (
-    get_current_user, require_admin, get_current_active_user
+    get_current_user, require_admin, get_current_active_user, security
 )
 from ..models.role_application_model import UserRoleEnum, ApplicationStatusEnum
 
@@ -73,7 +74,10 @@ async def refresh_token(refresh_data: RefreshTokenRequest):
 
 
 @router.post('/logout')
-async def logout(current_user: dict = Depends(get_current_user)):
+async def logout(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """
     Logout current user
     - Invalidates the session
@@ -81,7 +85,7 @@ async def logout(current_user: dict = Depends(get_current_user)):
     auth_service = AuthService()
     
     try:
-        await auth_service.logout(current_user.get("id"))
+        await auth_service.logout(credentials.credentials)
         return {"message": "Logged out successfully"}
     except ValueError as e:
         raise HTTPException(
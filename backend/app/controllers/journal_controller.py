@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
 from ..core.dependencies import get_db, get_current_user
+from ..core.http_ranges import etag_matches, parse_byte_range
 from ..services.journal_service import JournalService
 from ..schemas.journal_schema import (
     JournalSessionCreate, JournalSessionResponse,
@@ -54,3 +56,39 @@ async def list_entries(
     service = JournalService(db)
     entries = await service.list_entries(session_id, current_user["id"])
     return JournalEntriesListResponse(entries=entries)
+
+
+@router.get("/entries/{entry_id}/image")
+async def get_entry_image(
+    entry_id: int,
+    request: Request,
+    variant: Literal["full", "thumbnail"] = Query(default="full"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream an entry's image (or its thumbnail) from storage
+    - If-None-Match: 304 before storage is touched
+    - Range: a single byte range is returned as 206, streamed in chunks
+    """
+    service = JournalService(db)
+    image = await service.get_entry_image(entry_id, current_user["id"], variant == "thumbnail")
+    headers = {"ETag": image.etag, "Cache-Control": "private, max-age=86400", "Accept-Ranges": "bytes"}
+    if etag_matches(request.headers.get("if-none-match"), image.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    size, content_type, read = await service.open_image(image)
+    byte_range = parse_byte_range(
+        request.headers.get("range"), size, request.headers.get("if-range"), image.etag
+    )
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    return StreamingResponse(
+        read(start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=content_type,
+        headers=headers,
+    )
@@ -0,0 +1,39 @@
+"""
+Metrics Controller
+Operational counters for caches and connection pools (Admin only)
+"""
+from fastapi import APIRouter, Depends
+from ..core.dependencies import require_admin
+from ..core.token_cache import verified_token_cache
+from ..core.ai_response_cache import ai_response_cache
+from ..core.database import get_pool_metrics
+
+
+router = APIRouter(prefix='/metrics', tags=['metrics'])
+
+
+@router.get('/auth-cache')
+async def get_auth_cache_metrics(admin_user: dict = Depends(require_admin)):
+    """
+    Verified-token cache statistics (Admin only)
+    - Hit/miss counters, size and evictions
+    """
+    return verified_token_cache.stats()
+
+
+@router.get('/db-pool')
+async def get_db_pool_metrics(admin_user: dict = Depends(require_admin)):
+    """
+    Connection-pool statistics for the async and sync engines (Admin only)
+    - Checked-out and overflow connections, checkout wait times and timeouts
+    """
+    return get_pool_metrics()
+
+
+@router.get('/ai-cache')
+async def get_ai_cache_metrics(admin_user: dict = Depends(require_admin)):
+    """
+    AI response cache statistics (Admin only)
+    - Exact/fuzzy hits, misses, bypasses for personal context, hit rate and tokens saved
+    """
+    return ai_response_cache.stats()
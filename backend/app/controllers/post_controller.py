@@ -1,21 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, File, UploadFile, Form, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from ..core.database import SessionLocal
 from ..core.dependencies import get_db, get_current_user
+from ..core.executors import run_db
 from ..services.post_service import PostService
-from ..schemas.post_schema import PostCreate, PostUpdate, PostWithUser, PostListResponse
-from ..schemas.user_schema import UserResponse
+from ..schemas.post_schema import (
+    PostCreate, PostUpdate, PostWithUser, PostListResponse,
+    PhotoUploadUrlsRequest, PhotoUploadUrlsResponse, PhotoFinalizeRequest
+)
 
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
 
+async def _process_direct_uploads(post_id: int, paths: List[str]) -> None:
+    """Render finalized direct uploads once the response has been sent (the request's DB session is closed by then)"""
+    db = SessionLocal()
+    try:
+        await PostService(db).process_direct_uploads(post_id, paths)
+    finally:
+        await run_db(db.close)
+
+
 @router.post("/", response_model=PostWithUser)
 async def create_post(
     content: Optional[str] = Form(None),
     photos: List[UploadFile] = File(default=[]),
     db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user)
 ):
     """Create a new post with optional photos"""
     post_service = PostService(db)
@@ -24,11 +37,11 @@ async def create_post(
     post_data = PostCreate(content=content)
     
     # Create the post
-    post = await post_service.create_post(post_data, current_user.id)
+    post = await post_service.create_post(post_data, current_user["id"])
     
     # Upload photos if provided
     if photos and photos[0].filename:  # Check if actual files were uploaded
-        await post_service.upload_photos_for_post(photos, post.id, current_user.id)
+        await post_service.upload_photos_for_post(photos, post.id, current_user["id"])
         # Get updated post with photos
         post = await post_service.get_post(post.id)
     
@@ -39,22 +52,23 @@ async def create_post(
 async def create_post_with_base64_photos(
     post_data: PostCreate,
     db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user)
 ):
     """Create a new post with base64 encoded photos"""
     post_service = PostService(db)
-    return await post_service.create_post(post_data, current_user.id)
+    return await post_service.create_post(post_data, current_user["id"])
 
 
 @router.get("/", response_model=PostListResponse)
 async def get_all_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (preferred over page)"),
     db: Session = Depends(get_db)
 ):
     """Get all posts with pagination"""
     post_service = PostService(db)
-    return await post_service.get_all_posts(page, page_size)
+    return await post_service.get_all_posts(page, page_size, cursor)
 
 
 @router.get("/user/{user_id}", response_model=PostListResponse)
@@ -62,23 +76,25 @@ async def get_user_posts(
     user_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (preferred over page)"),
     db: Session = Depends(get_db)
 ):
     """Get posts for a specific user (for profile page)"""
     post_service = PostService(db)
-    return await post_service.get_user_posts(user_id, page, page_size)
+    return await post_service.get_user_posts(user_id, page, page_size, cursor)
 
 
 @router.get("/my-posts", response_model=PostListResponse)
 async def get_my_posts(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (preferred over page)"),
     db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user)
 ):
     """Get current user's posts"""
     post_service = PostService(db)
-    return await post_service.get_user_posts(current_user.id, page, page_size)
+    return await post_service.get_user_posts(current_user["id"], page, page_size, cursor)
 
 
 @router.get("/{post_id}", response_model=PostWithUser)
@@ -96,11 +112,11 @@ async def update_post(
     post_id: int,
     post_data: PostUpdate,
     db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user)
 ):
     """Update a post (only by owner)"""
     post_service = PostService(db)
-    return await post_service.update_post(post_id, post_data, current_user.id)
+    return await post_service.update_post(post_id, post_data, current_user["id"])
 
 
 @router.post("/{post_id}/photos")
@@ -108,14 +124,14 @@ async def add_photos_to_post(
     post_id: int,
     photos: List[UploadFile] = File(...),
     db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user)
 ):
     """Add photos to an existing post"""
     if not photos or not photos[0].filename:
         raise HTTPException(status_code=400, detail="No photos provided")
     
     post_service = PostService(db)
-    uploaded_photos = await post_service.upload_photos_for_post(photos, post_id, current_user.id)
+    uploaded_photos = await post_service.upload_photos_for_post(photos, post_id, current_user["id"])
     
     return {
         "message": f"Successfully uploaded {len(uploaded_photos)} photos",
@@ -123,15 +139,43 @@ async def add_photos_to_post(
     }
 
 
+@router.post("/{post_id}/photos/upload-urls", response_model=PhotoUploadUrlsResponse)
+async def create_photo_upload_urls(
+    post_id: int,
+    request: PhotoUploadUrlsRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Get signed URLs to upload photos straight to storage (then call /photos/finalize)"""
+    post_service = PostService(db)
+    return await post_service.create_upload_urls(post_id, current_user["id"], request.content_types)
+
+
+@router.post("/{post_id}/photos/finalize", response_model=PostWithUser)
+async def finalize_photo_uploads(
+    post_id: int,
+    request: PhotoFinalizeRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Attach photos uploaded through signed URLs to the post (status 'processing' until their variants are stored)"""
+    post_service = PostService(db)
+    post, pending = await post_service.finalize_uploads(post_id, current_user["id"], request.paths)
+    if pending:
+        background_tasks.add_task(_process_direct_uploads, post_id, pending)
+    return post
+
+
 @router.delete("/{post_id}")
 async def delete_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user)
 ):
     """Delete a post (only by owner)"""
     post_service = PostService(db)
-    success = await post_service.delete_post(post_id, current_user.id)
+    success = await post_service.delete_post(post_id, current_user["id"])
     
     if not success:
         raise HTTPException(status_code=404, detail="Post not found or not authorized")
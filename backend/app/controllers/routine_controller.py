@@ -4,6 +4,7 @@ from typing import List
 from uuid import UUID
 
 from ..core.dependencies import get_db, get_current_user
+from ..core.executors import run_db
 from ..services.routine_service import RoutineService
 from ..schemas.routine_schema import (
     RoutineHeaderCreate,
@@ -22,7 +23,7 @@ async def get_all_routines(
 ):
     """Get all routines for the current user."""
     service = RoutineService(db)
-    return service.get_all_routines(current_user["id"], include_archived)
+    return await run_db(service.get_all_routines, current_user["id"], include_archived)
 
 
 @router.get("/{routine_id}", response_model=RoutineHeaderResponse)
@@ -33,7 +34,7 @@ async def get_routine(
 ):
     """Get a specific routine with all exercises."""
     service = RoutineService(db)
-    return service.get_routine_by_id(routine_id, current_user["id"])
+    return await run_db(service.get_routine_by_id, routine_id, current_user["id"])
 
 
 @router.post("", response_model=RoutineHeaderResponse, status_code=status.HTTP_201_CREATED)
@@ -44,7 +45,7 @@ async def create_routine(
 ):
     """Create a new routine with exercises."""
     service = RoutineService(db)
-    return service.create_routine(current_user["id"], routine_data)
+    return await run_db(service.create_routine, current_user["id"], routine_data)
 
 
 @router.put("/{routine_id}", response_model=RoutineHeaderResponse)
@@ -56,7 +57,7 @@ async def update_routine(
 ):
     """Update a routine and its exercises."""
     service = RoutineService(db)
-    return service.update_routine(routine_id, current_user["id"], routine_data)
+    return await run_db(service.update_routine, routine_id, current_user["id"], routine_data)
 
 
 @router.delete("/{routine_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -67,7 +68,7 @@ async def delete_routine(
 ):
     """Delete a routine (exercises will be cascade deleted)."""
     service = RoutineService(db)
-    service.delete_routine(routine_id, current_user["id"])
+    await run_db(service.delete_routine, routine_id, current_user["id"])
 
 
 @router.patch("/{routine_id}/archive", response_model=RoutineHeaderResponse)
@@ -79,4 +80,4 @@ async def archive_routine(
 ):
     """Archive or unarchive a routine."""
     service = RoutineService(db)
-    return service.archive_routine(routine_id, current_user["id"], is_archived)
+    return await run_db(service.archive_routine, routine_id, current_user["id"], is_archived)
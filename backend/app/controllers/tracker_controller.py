@@ -1,48 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Iterator, List, Literal, Optional
+from datetime import datetime
 
 from ..core.dependencies import get_db, get_current_user
+from ..core.database import SessionLocal
+from ..core.executors import run_db
+from ..core.pagination import page_items
 from ..services.tracker_service import TrackerService
 from ..schemas.tracker_schema import (
     TrackerCreate, TrackerUpdate, TrackerResponse, TrackerListResponse,
-    TrackerEntryCreate, TrackerEntryUpdate, TrackerEntryResponse
+    TrackerEntryCreate, TrackerEntryUpdate, TrackerEntryResponse, TrackerSeriesResponse,
+    TrackerEntryBatchCreate, TrackerEntryBatchResponse
 )
 
 
 router = APIRouter(prefix="/trackers", tags=["trackers"])
 
+# Entry window filters shared by the read endpoints (`from`/`to` are inclusive)
+DATE_FROM = Query(default=None, alias="from", description="Only entries at or after this date/time")
+DATE_TO = Query(default=None, alias="to", description="Only entries at or before this date/time")
+ENTRIES_LIMIT = Query(default=None, ge=1, le=10000, description="Newest N entries per tracker")
+
+# Lines per chunk written to an NDJSON export stream
+EXPORT_CHUNK_LINES = 500
+
 
 # Tracker endpoints
 @router.get("", response_model=List[TrackerResponse])  # Removed leading slash
 async def get_all_trackers(  # Made async
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
+    date_from: Optional[datetime] = DATE_FROM,
+    date_to: Optional[datetime] = DATE_TO,
+    entries_limit: Optional[int] = ENTRIES_LIMIT,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get all trackers for the current user with full entry data"""
+    """Get the current user's trackers with entry data (cursor paginated, entries windowed by from/to/entries_limit)"""
     tracker_service = TrackerService(db)
-    return tracker_service.get_all_trackers(current_user['id'])
+    page = await run_db(
+        tracker_service.get_all_trackers, current_user['id'], limit, cursor, date_from, date_to, entries_limit
+    )
+    return page_items(response, page)
 
 
 @router.get("/list", response_model=List[TrackerListResponse])
 async def get_trackers_list(  # Made async
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get all trackers for the current user (optimized for list view without full entry data)"""
+    """Get the current user's trackers (optimized for list view without full entry data, cursor paginated)"""
     tracker_service = TrackerService(db)
-    return tracker_service.get_trackers_list(current_user['id'])
+    page = await run_db(tracker_service.get_trackers_list, current_user['id'], limit, cursor)
+    return page_items(response, page)
+
+
+@router.get("/export")
+async def export_trackers(
+    date_from: Optional[datetime] = DATE_FROM,
+    date_to: Optional[datetime] = DATE_TO,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream all trackers and entries of the current user as NDJSON
+    - One "tracker" line per tracker, then "entry" lines grouped by tracker_id, newest first
+    - Rows are fetched and written in batches, so memory stays flat for any history size
+    """
+    return StreamingResponse(
+        _export_chunks(current_user['id'], date_from, date_to),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="trackers.ndjson"'}
+    )
+
+
+def _export_chunks(user_id, date_from: Optional[datetime], date_to: Optional[datetime]) -> Iterator[str]:
+    # The body is sent after Depends(get_db) has closed its session, so the stream owns one
+    db = SessionLocal()
+    try:
+        lines = []
+        for line in TrackerService(db).export_ndjson(user_id, date_from, date_to):
+            lines.append(line)
+            if len(lines) >= EXPORT_CHUNK_LINES:
+                yield "".join(lines)
+                lines.clear()
+        if lines:
+            yield "".join(lines)
+    finally:
+        db.close()
 
 
 @router.get("/{tracker_id}", response_model=TrackerResponse)
 async def get_tracker(  # Made async
     tracker_id: int,
+    date_from: Optional[datetime] = DATE_FROM,
+    date_to: Optional[datetime] = DATE_TO,
+    entries_limit: Optional[int] = ENTRIES_LIMIT,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get a specific tracker by ID"""
+    """Get a specific tracker by ID (entries windowed by from/to/entries_limit)"""
     tracker_service = TrackerService(db)
-    return tracker_service.get_tracker(tracker_id, current_user['id'])
+    return await run_db(
+        tracker_service.get_tracker, tracker_id, current_user['id'], date_from, date_to, entries_limit
+    )
 
 
 @router.post("", response_model=TrackerResponse, status_code=status.HTTP_201_CREATED)  # Removed leading slash
@@ -53,7 +119,7 @@ async def create_tracker(  # Made async
 ):
     """Create a new tracker"""
     tracker_service = TrackerService(db)
-    return tracker_service.create_tracker(current_user['id'], tracker_data)
+    return await run_db(tracker_service.create_tracker, current_user['id'], tracker_data)
 
 
 @router.put("/{tracker_id}", response_model=TrackerResponse)
@@ -65,7 +131,7 @@ async def update_tracker(  # Made async
 ):
     """Update a tracker"""
     tracker_service = TrackerService(db)
-    return tracker_service.update_tracker(tracker_id, current_user['id'], tracker_data)
+    return await run_db(tracker_service.update_tracker, tracker_id, current_user['id'], tracker_data)
 
 
 @router.delete("/{tracker_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -76,20 +142,50 @@ async def delete_tracker(  # Made async
 ):
     """Delete a tracker"""
     tracker_service = TrackerService(db)
-    tracker_service.delete_tracker(tracker_id, current_user['id'])
+    await run_db(tracker_service.delete_tracker, tracker_id, current_user['id'])
     return None
 
 
+@router.get("/{tracker_id}/series", response_model=TrackerSeriesResponse)
+async def get_tracker_series(
+    tracker_id: int,
+    bucket: Optional[Literal["day", "week", "month"]] = Query(default=None, description="Aggregate per bucket (default: day)"),
+    points: Optional[int] = Query(default=None, ge=3, le=5000, description="LTTB downsample to this many points instead"),
+    date_from: Optional[datetime] = DATE_FROM,
+    date_to: Optional[datetime] = DATE_TO,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get a tracker's history sized for charts
+    - bucket: min/max/avg/last/count per day, week or month, computed in SQL
+    - points: Largest-Triangle-Three-Buckets downsampling of the raw entries
+    """
+    if bucket and points:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Pass either bucket or points, not both"
+        )
+
+    tracker_service = TrackerService(db)
+    return await run_db(
+        tracker_service.get_series, tracker_id, current_user['id'], bucket, points, date_from, date_to
+    )
+
+
 # TrackerEntry endpoints
 @router.get("/{tracker_id}/entries", response_model=List[TrackerEntryResponse])
 async def get_tracker_entries(  # Made async
     tracker_id: int,
+    date_from: Optional[datetime] = DATE_FROM,
+    date_to: Optional[datetime] = DATE_TO,
+    limit: Optional[int] = Query(default=None, ge=1, le=10000, description="Newest N entries"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get all entries for a tracker"""
+    """Get entries for a tracker, newest first (windowed by from/to/limit)"""
     tracker_service = TrackerService(db)
-    return tracker_service.get_entries(tracker_id, current_user['id'])
+    return await run_db(tracker_service.get_entries, tracker_id, current_user['id'], date_from, date_to, limit)
 
 
 @router.post("/{tracker_id}/entries", response_model=TrackerEntryResponse, status_code=status.HTTP_201_CREATED)
@@ -101,7 +197,24 @@ async def create_entry(  # Made async
 ):
     """Create a new entry for a tracker"""
     tracker_service = TrackerService(db)
-    return tracker_service.create_entry(tracker_id, current_user['id'], entry_data)
+    return await run_db(tracker_service.create_entry, tracker_id, current_user['id'], entry_data)
+
+
+@router.post("/{tracker_id}/entries:batch", response_model=TrackerEntryBatchResponse)
+async def create_entries_batch(
+    tracker_id: int,
+    batch: TrackerEntryBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Import many entries in one request (device/wearable sync)
+    - Entries are written with multi-row inserts
+    - Each entry carries a client-chosen external_id; an existing entry with the same
+      external_id is overwritten, so retries are safe
+    """
+    tracker_service = TrackerService(db)
+    return await run_db(tracker_service.create_entries_batch, tracker_id, current_user['id'], batch)
 
 
 @router.put("/{tracker_id}/entries/{entry_id}", response_model=TrackerEntryResponse)
@@ -114,7 +227,7 @@ async def update_entry(  # Made async
 ):
     """Update an entry"""
     tracker_service = TrackerService(db)
-    return tracker_service.update_entry(entry_id, tracker_id, current_user['id'], entry_data)
+    return await run_db(tracker_service.update_entry, entry_id, tracker_id, current_user['id'], entry_data)
 
 
 @router.delete("/{tracker_id}/entries/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -126,5 +239,5 @@ async def delete_entry(  # Made async
 ):
     """Delete an entry"""
     tracker_service = TrackerService(db)
-    tracker_service.delete_entry(entry_id, tracker_id, current_user['id'])
+    await run_db(tracker_service.delete_entry, entry_id, tracker_id, current_user['id'])
     return None
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from datetime import date
 
 from ..core.dependencies import get_db, get_current_user
+from ..core.executors import run_db
+from ..core.pagination import page_items
 from ..services.workout_log_service import WorkoutLogService
 from ..schemas.workout_log_schema import (
     WorkoutLogCreate,
@@ -18,24 +20,30 @@ router = APIRouter(prefix="/workout-logs", tags=["Workout Logs"])
 
 @router.get("", response_model=List[WorkoutLogResponse])
 async def get_all_workout_logs(
+    response: Response,
     limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),  # dict not UserResponse!
 ):
-    """Get all workout logs for the current user with full exercise and set data."""
+    """Get the current user's workout logs with full exercise and set data, newest first (cursor paginated)."""
     service = WorkoutLogService(db)
-    return service.get_all_workout_logs(current_user["id"], limit)
+    page = await run_db(service.get_all_workout_logs, current_user["id"], limit, cursor)
+    return page_items(response, page)
 
 
 @router.get("/list", response_model=List[WorkoutLogListResponse])
 async def get_workout_logs_list(
+    response: Response,
     limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
-    """Get all workout logs for the current user (optimized for list view without full exercise data)."""
+    """Get the current user's workout logs (optimized for list view without full exercise data, cursor paginated)."""
     service = WorkoutLogService(db)
-    return service.get_workout_logs_list(current_user["id"], limit)
+    page = await run_db(service.get_workout_logs_list, current_user["id"], limit, cursor)
+    return page_items(response, page)
 
 
 @router.get("/date-range", response_model=List[WorkoutLogResponse])
@@ -47,7 +55,7 @@ async def get_workout_logs_by_date_range(
 ):
     """Get workout logs within a date range."""
     service = WorkoutLogService(db)
-    return service.get_workout_logs_by_date_range(current_user["id"], start_date, end_date)
+    return await run_db(service.get_workout_logs_by_date_range, current_user["id"], start_date, end_date)
 
 
 @router.get("/{log_id}", response_model=WorkoutLogResponse)
@@ -58,7 +66,7 @@ async def get_workout_log(
 ):
     """Get a specific workout log with all exercises and sets."""
     service = WorkoutLogService(db)
-    return service.get_workout_log_by_id(log_id, current_user["id"])
+    return await run_db(service.get_workout_log_by_id, log_id, current_user["id"])
 
 
 @router.post("", response_model=WorkoutLogResponse, status_code=status.HTTP_201_CREATED)
@@ -69,7 +77,7 @@ async def create_workout_log(
 ):
     """Create a new workout log with exercises and sets."""
     service = WorkoutLogService(db)
-    return service.create_workout_log(current_user["id"], log_data)
+    return await run_db(service.create_workout_log, current_user["id"], log_data)
 
 
 @router.put("/{log_id}", response_model=WorkoutLogResponse)
@@ -81,7 +89,7 @@ async def update_workout_log(
 ):
     """Update a workout log and its exercises."""
     service = WorkoutLogService(db)
-    return service.update_workout_log(log_id, current_user["id"], log_data)
+    return await run_db(service.update_workout_log, log_id, current_user["id"], log_data)
 
 
 @router.delete("/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -92,7 +100,7 @@ async def delete_workout_log(
 ):
     """Delete a workout log (exercises and sets will be cascade deleted)."""
     service = WorkoutLogService(db)
-    service.delete_workout_log(log_id, current_user["id"])
+    await run_db(service.delete_workout_log, log_id, current_user["id"])
 
 
 @router.get("/exercise/{exercise_name}/history", response_model=dict)
@@ -103,7 +111,7 @@ async def get_exercise_history(
 ):
     """Get history of a specific exercise across all workouts."""
     service = WorkoutLogService(db)
-    return service.get_exercise_history(current_user["id"], exercise_name)
+    return await run_db(service.get_exercise_history, current_user["id"], exercise_name)
 
 
 @router.get("/stats/summary", response_model=dict)
@@ -113,4 +121,4 @@ async def get_workout_stats(
 ):
     """Get workout statistics for the current user."""
     service = WorkoutLogService(db)
-    return service.get_workout_stats(current_user["id"])
+    return await run_db(service.get_workout_stats, current_user["id"])
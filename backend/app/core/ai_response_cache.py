@@ -0,0 +1,165 @@
+"""
+AI response cache
+Reuses Gemini answers to repeated, context-free coaching questions ("how many
+sets for hypertrophy"). The cache is shared by all users, so callers skip it for
+messages with personal details (chat_context.has_personal_context). Entries are
+keyed on the normalized question plus a hash of the system prompt, so editing
+the prompt starts a fresh cache. On an exact miss, a TF-IDF cosine scan over the
+cached questions can return a near-identical one (AI_CACHE_SIMILARITY; off by default).
+"""
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .cache import TTLCache
+from .config import settings
+
+# Words too common to tell questions apart ("not"/"no" stay: they flip meanings)
+STOPWORDS = frozenset(
+    "a an the i im i'm me my we you your it is are am be do does did can could should would "
+    "will to of for in on at with and or how what which when why much many please hi hey "
+    "there this that some any".split()
+)
+
+
+@dataclass(frozen=True)
+class CachedReply:
+    key: str
+    prompt_version: str
+    terms: Counter
+    response: Dict[str, Any]
+    tokens: int  # what a fresh answer cost (or an estimate of it)
+
+
+def normalize(text: str) -> str:
+    """Lowercase, join hyphenated words ("warm-up"), drop punctuation and collapse whitespace"""
+    text = re.sub(r"(?<=[a-z])-(?=[a-z])", "", text.lower())
+    return " ".join(re.sub(r"[^\w\s']", " ", text).split())
+
+
+def _terms(normalized: str) -> Counter:
+    return Counter(word for word in normalized.split() if word not in STOPWORDS)
+
+
+def _prompt_version(system_prompt: Optional[str]) -> str:
+    return hashlib.sha256((system_prompt or "").encode()).hexdigest()[:16]
+
+
+class AIResponseCache:
+    """Process-local TTL + LRU cache of Gemini responses with optional fuzzy matching"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, similarity: float):
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self._cache = TTLCache(max_entries=max_entries, default_ttl=ttl_seconds)
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.tokens_saved = 0
+
+    @staticmethod
+    def _key(normalized: str, prompt_version: str) -> str:
+        return hashlib.sha256(f"{prompt_version}\0{normalized}".encode()).hexdigest()
+
+    def get(self, prompt: str, system_prompt: Optional[str]) -> Optional[Dict[str, Any]]:
+        """A cached response for this question, or None"""
+        normalized = normalize(prompt)
+        version = _prompt_version(system_prompt)
+        reply = self._cache.get(self._key(normalized, version))
+        exact = reply is not None
+        if not exact and self.similarity > 0:
+            reply = self._most_similar(_terms(normalized), version)
+            if reply is not None:
+                # Refresh its LRU position too
+                self._cache.get(reply.key)
+
+        with self._lock:
+            if reply is None:
+                self.misses += 1
+                return None
+            if exact:
+                self.exact_hits += 1
+            else:
+                self.fuzzy_hits += 1
+            self.tokens_saved += reply.tokens
+        return dict(reply.response)
+
+    def set(self, prompt: str, system_prompt: Optional[str], response: Dict[str, Any]) -> None:
+        normalized = normalize(prompt)
+        version = _prompt_version(system_prompt)
+        tokens = response.get("tokens_used") or (
+            # ~4 characters per token when Gemini doesn't report usage
+            (len(prompt) + len(system_prompt or "") + len(response.get("response_text", ""))) // 4
+        )
+        key = self._key(normalized, version)
+        self._cache.set(key, CachedReply(key, version, _terms(normalized), dict(response), tokens))
+
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache because it carries personal context"""
+        with self._lock:
+            self.bypassed += 1
+
+    def _most_similar(self, terms: Counter, version: str) -> Optional[CachedReply]:
+        """Cached reply whose question has the highest TF-IDF cosine with terms, if above the threshold"""
+        if not terms:
+            return None
+        replies = [reply for reply in self._cache.values() if reply.prompt_version == version]
+        if not replies:
+            return None
+
+        document_frequency = Counter(term for reply in replies for term in reply.terms)
+        count = len(replies) + 1  # the query counts as a document
+
+        def weights(term_counts: Counter) -> Dict[str, float]:
+            return {
+                term: (1 + math.log(tf)) * (math.log(count / (1 + document_frequency[term])) + 1)
+                for term, tf in term_counts.items()
+            }
+
+        query = weights(terms)
+        query_norm = math.sqrt(sum(w * w for w in query.values()))
+        best, best_score = None, self.similarity
+        for reply in replies:
+            candidate = weights(reply.terms)
+            norm = math.sqrt(sum(w * w for w in candidate.values()))
+            if not norm:
+                continue
+            score = sum(w * candidate.get(term, 0.0) for term, w in query.items()) / (query_norm * norm)
+            if score >= best_score:
+                best, best_score = reply, score
+        return best
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        cache_stats = self._cache.stats()
+        with self._lock:
+            hits = self.exact_hits + self.fuzzy_hits
+            lookups = hits + self.misses
+            return {
+                "size": cache_stats["size"],
+                "max_entries": cache_stats["max_entries"],
+                "evictions": cache_stats["evictions"],
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "tokens_saved": self.tokens_saved,
+                "ttl_seconds": self.ttl_seconds,
+                "similarity": self.similarity,
+            }
+
+
+ai_response_cache = AIResponseCache(
+    max_entries=settings.AI_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AI_CACHE_TTL_SECONDS,
+    similarity=settings.AI_CACHE_SIMILARITY,
+)
@@ -0,0 +1,93 @@
+"""
+In-process caching helpers
+Thread-safe TTL + LRU cache used for hot lookups
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class TTLCache:
+    """LRU cache where every entry also carries its own expiry time"""
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value (refreshing its LRU position) or default"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; entries with a non-positive TTL are not cached"""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        """Remove a single entry, returning its value if it was cached"""
+        with self._lock:
+            item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def pop_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Remove every entry whose value matches predicate, returning the count"""
+        with self._lock:
+            stale_keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in stale_keys:
+                del self._data[key]
+        return len(stale_keys)
+
+    def values(self) -> List[Any]:
+        """Snapshot of the unexpired values (doesn't touch LRU order or counters)"""
+        now = time.monotonic()
+        with self._lock:
+            return [value for expires_at, value in self._data.values() if expires_at > now]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for metrics endpoints"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
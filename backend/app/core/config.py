@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -7,13 +8,89 @@ class Settings(BaseSettings):
     ALGORITHM: str = 'HS256'
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     DATABASE_URL: str = 'sqlite+aiosqlite:///./test.db'
+
+    # Database connection pools (applied to both the async and sync engines)
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Server-side statement_timeout in milliseconds (0 disables it)
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
     
     # Supabase settings
     SUPABASE_URL: str = Field(..., env='SUPABASE_URL')
     SUPABASE_SERVICE_KEY: str = Field(..., env='SUPABASE_SERVICE_KEY')
+    # Worker threads for blocking Supabase calls (auth, PostgREST, storage)
+    SUPABASE_MAX_WORKERS: int = 16
+
+    # Object storage for uploaded images: 'supabase' (storage buckets) or
+    # 'local' (files under LOCAL_BLOB_DIR served at LOCAL_BLOB_URL; dev/tests only)
+    BLOB_STORE: Literal['supabase', 'local'] = 'supabase'
+    LOCAL_BLOB_DIR: str = './media'
+    LOCAL_BLOB_URL: str = '/media'
+    # Lifetime of signed URLs handed out for private buckets
+    BLOB_SIGNED_URL_SECONDS: int = 3600
+
+    # Processes for CPU-bound work such as image resizing
+    CPU_WORKERS: int = 2
+
+    # Post photo uploads: per-photo size cap (checked before buffering) and
+    # how many photos of one request are sent to storage at once
+    POST_PHOTO_MAX_BYTES: int = 10 * 1024 * 1024
+    POST_UPLOAD_CONCURRENCY: int = 4
+    # WebP quality of the stored post photo variants
+    POST_PHOTO_QUALITY: int = 80
+    # Direct-to-storage uploads through signed URLs. Originals land in a private
+    # staging bucket (size/type limits set on the bucket) and are deleted once
+    # their public WebP variants are rendered
+    POST_DIRECT_UPLOADS_ENABLED: bool = True
+    POST_UPLOADS_BUCKET: str = 'post-uploads'
+    # Most signed upload URLs issued per request (direct-to-storage uploads)
+    POST_SIGNED_UPLOADS_MAX: int = 10
+
+    # Journal progress photos (private bucket) and their list-view thumbnails
+    JOURNAL_BUCKET: str = 'journal-photos'
+    JOURNAL_THUMBNAIL_PX: int = 320
+
+    # Verified-token cache (set AUTH_CACHE_MAX_ENTRIES=0 to disable)
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Access-token verification: 'remote' asks Supabase on every cache miss,
+    # 'local' checks the JWT signature in-process (JWT secret or project JWKS).
+    # Local mode never sees revocations: a token stays valid after logout until
+    # its `exp` (the project's JWT expiry, 1 hour by default)
+    AUTH_VERIFY_MODE: Literal['remote', 'local'] = 'remote'
+    SUPABASE_JWT_SECRET: Optional[str] = None
+    SUPABASE_JWT_AUDIENCE: str = 'authenticated'
+    SUPABASE_JWKS_CACHE_SECONDS: int = 3600
+    # Tokens with an unknown key id refetch the JWKS at most this often
+    SUPABASE_JWKS_MIN_REFETCH_SECONDS: int = 60
 
     # Google Gemini AI
     GEMINI_API_KEY: str = Field(..., env='GEMINI_API_KEY')
+    # Gemini calls in flight per process (others wait for a slot) and how long
+    # a call may take, slot wait included; streams apply it between chunks
+    GEMINI_MAX_CONCURRENCY: int = 8
+    GEMINI_TIMEOUT_SECONDS: float = 30.0
+    # Open the Gemini connection at startup (one token-count call) rather than
+    # on the first chat message
+    GEMINI_WARM_UP: bool = True
+
+    # AI chat memory: recent turns replayed with each message (estimated tokens);
+    # older turns are folded into a rolling summary of at most AI_SUMMARY_MAX_TOKENS
+    AI_CONTEXT_TOKEN_BUDGET: int = 2000
+    AI_SUMMARY_MAX_TOKENS: int = 400
+
+    # Cache of answers to context-free chat questions (set AI_CACHE_MAX_ENTRIES=0
+    # to disable); AI_CACHE_SIMILARITY is the TF-IDF cosine a different wording
+    # needs to reuse an answer. 0 (the default) allows exact matches only: a
+    # near-identical question can differ in the one word that matters ("low"/"high")
+    AI_CACHE_TTL_SECONDS: int = 86400
+    AI_CACHE_MAX_ENTRIES: int = 1000
+    AI_CACHE_SIMILARITY: float = 0.0
 
     class Config:
         env_file = '.env'
@@ -1,12 +1,67 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy import create_engine, exc
+from typing import Any, Dict
 from .config import settings
-import re
+import threading
+import time
 
-# Async engine and session for async operations (for parts of the app that use async ORM)
-async_engine = create_async_engine(settings.DATABASE_URL, echo=True)
-AsyncSessionLocal = sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+
+class PoolMetrics:
+    """Checkout wait-time counters for one connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    """Measures how long each checkout waits for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
 
 
 def _make_sync_db_url(url: str) -> str:
@@ -22,17 +77,71 @@ def _make_sync_db_url(url: str) -> str:
         return url.replace('psycopg_async', 'psycopg')
     return url
 
+
+def _engine_options(url: str, poolclass: type) -> Dict[str, Any]:
+    """Pool and timeout options from Settings (SQLite keeps SQLAlchemy's defaults)"""
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    if url.startswith('sqlite'):
+        return options
+
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        if '+asyncpg' in url:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+# Async engine and session for async operations (for parts of the app that use async ORM)
+async_engine = create_async_engine(
+    settings.DATABASE_URL,
+    **_engine_options(settings.DATABASE_URL, TimedAsyncAdaptedQueuePool)
+)
+AsyncSessionLocal = sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
+
 # Sync engine and session for sync operations used across most of the app
 sync_database_url = _make_sync_db_url(settings.DATABASE_URL)
-# Sync engine and session for sync operations
-# Convert async driver to sync driver
-sync_database_url = settings.DATABASE_URL.replace('postgresql+psycopg_async', 'postgresql+psycopg')
-sync_database_url = sync_database_url.replace('+aiosqlite', '')  # For SQLite compatibility
-sync_engine = create_engine(sync_database_url, echo=True)
+sync_engine = create_engine(sync_database_url, **_engine_options(sync_database_url, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 
 Base = declarative_base()
 
+
+def _pool_stats(pool) -> Dict[str, Any]:
+    if not isinstance(pool, QueuePool):
+        return {"pool": pool.status()}
+
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_s": pool.timeout(),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Connection-pool usage and checkout wait times for both engines"""
+    return {
+        "async": _pool_stats(async_engine.sync_engine.pool),
+        "sync": _pool_stats(sync_engine.pool),
+    }
+
+
 async def get_db():
     # Provide async session if needed elsewhere (not used by journal currently)
     async with AsyncSessionLocal() as session:
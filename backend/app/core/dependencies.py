@@ -1,8 +1,9 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from ..services.auth_service import AuthService
+from ..services.gemini_service import GeminiService
 from ..schemas.auth_schema import UserRole
 from ..core.database import get_sync_db
 
@@ -18,6 +19,7 @@ async def get_current_user(
 ) -> dict:
     """
     Dependency to get current authenticated user from JWT token
+    Verification is remote or local depending on settings.AUTH_VERIFY_MODE
     Raises HTTPException if token is invalid
     """
     token = credentials.credentials
@@ -110,3 +112,8 @@ async def get_optional_user(
         return user
     except:
         return None
+
+
+def get_gemini_service(request: Request) -> GeminiService:
+    """The process-wide Gemini client created in the app lifespan"""
+    return request.app.state.gemini
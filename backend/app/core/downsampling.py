@@ -0,0 +1,44 @@
+"""
+Time-series downsampling
+Largest-Triangle-Three-Buckets (LTTB): keeps the points that preserve the
+visual shape of a line chart, so long histories can be drawn from a few
+hundred points instead of every raw sample.
+"""
+from typing import List, Sequence
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """Return indices of the points LTTB keeps (always the first and last).
+
+    xs must be ascending. Inputs no longer than threshold are returned whole.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    # First and last points are fixed; the rest are split into threshold - 2 buckets
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        # Keep the point in this bucket forming the largest triangle with a and the average
+        ax, ay = xs[a], ys[a]
+        best, best_area = -1, -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+
+        selected.append(best)
+        a = best
+
+    selected.append(n - 1)
+    return selected
@@ -0,0 +1,86 @@
+"""
+Bounded executors for blocking work
+Sync SDK and driver calls are dispatched here so they never run on the event loop
+"""
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+from sqlalchemy.pool import QueuePool
+from .config import settings
+from .database import sync_engine
+
+T = TypeVar('T')
+
+# Supabase (auth, PostgREST, storage) HTTP calls
+supabase_executor = ThreadPoolExecutor(
+    max_workers=settings.SUPABASE_MAX_WORKERS,
+    thread_name_prefix='supabase',
+)
+
+
+def _sync_pool_capacity() -> int:
+    """Connections the sync engine can hand out at once (pool size + overflow)"""
+    pool = sync_engine.pool
+    if isinstance(pool, QueuePool):
+        return pool.size() + max(settings.DB_MAX_OVERFLOW, 0)
+    return 5
+
+
+# Sync SQLAlchemy repository calls. Sized to the sync engine's pool plus a few
+# threads of headroom, so calls that don't need a connection (closing a session,
+# building a response) aren't stuck behind ones waiting on checkout.
+DB_EXECUTOR_HEADROOM = 4
+db_executor = ThreadPoolExecutor(
+    max_workers=_sync_pool_capacity() + DB_EXECUTOR_HEADROOM,
+    thread_name_prefix='db',
+)
+
+
+# CPU-bound work (image decoding/resizing). Separate processes, so it neither
+# blocks the event loop nor competes with request threads for the GIL.
+# Submitted callables and their arguments must be picklable (module-level functions).
+# Workers come from a forkserver: forking this process, which already runs the
+# thread pools above, could hand children locks held by another thread.
+# Created on first use so importing the app never starts processes.
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_cpu_executor() -> ProcessPoolExecutor:
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = ProcessPoolExecutor(
+            max_workers=settings.CPU_WORKERS,
+            mp_context=multiprocessing.get_context('forkserver'),
+        )
+    return _cpu_executor
+
+
+async def run_in_executor(executor: Executor, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable on the given executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+
+async def run_supabase(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Supabase client call off the event loop"""
+    return await run_in_executor(supabase_executor, fn, *args, **kwargs)
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking sync-Session repository/service call off the event loop"""
+    return await run_in_executor(db_executor, fn, *args, **kwargs)
+
+
+async def run_cpu(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a CPU-bound module-level function in the process pool"""
+    return await run_in_executor(_get_cpu_executor(), fn, *args, **kwargs)
+
+
+def shutdown_executors() -> None:
+    """Stop accepting work and wait for in-flight calls (app shutdown; blocking)"""
+    supabase_executor.shutdown(wait=True)
+    db_executor.shutdown(wait=True)
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=True)
@@ -0,0 +1,63 @@
+"""
+Conditional and partial GET helpers
+ETag revalidation and single byte-range requests for endpoints that stream
+stored files, so clients can resume downloads and skip unchanged ones.
+"""
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header covers this ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def _unsatisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{size}"},
+    )
+
+
+def parse_byte_range(
+    range_header: Optional[str], size: int, if_range: Optional[str] = None, etag: Optional[str] = None
+) -> Optional[Tuple[int, int]]:
+    """Return the inclusive (start, end) of a single `bytes=` range, or None to send the whole body.
+
+    Multi-range requests, other units, a stale If-Range and syntactically invalid
+    ranges (e.g. end before start) fall back to the whole body (RFC 9110 §14.2);
+    a range starting past the end raises 416.
+    """
+    if not range_header or (if_range is not None and if_range != etag):
+        return None
+
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise _unsatisfiable(size)
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if end is not None and end < start:
+        return None
+
+    if start >= size:
+        raise _unsatisfiable(size)
+    return start, size - 1 if end is None else min(end, size - 1)
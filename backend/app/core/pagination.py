@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination
+Lists are ordered newest first on (sort column, id). A page ends with an opaque
+cursor holding the last row's values, and the next page starts strictly after
+it, so deep pages cost the same index seek as the first one (no OFFSET scan).
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Generic, List, NamedTuple, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+
+# Response header carrying the cursor for endpoints that return a bare list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+class Page(NamedTuple, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str]
+
+
+def _encode_value(value: Any) -> list:
+    # Tag non-JSON types so they decode back to values the column can compare with
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, UUID):
+        return ["u", str(value)]
+    return ["v", value]
+
+
+def _decode_value(tagged: list) -> Any:
+    tag, value = tagged
+    if tag == "dt":
+        return datetime.fromisoformat(value)
+    if tag == "d":
+        return date.fromisoformat(value)
+    if tag == "u":
+        return UUID(value)
+    if tag == "v" and isinstance(value, (int, float, str)):
+        return value
+    raise ValueError(f"Unknown cursor value tag: {tag}")
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """Build an opaque, URL-safe cursor for the row with these keys"""
+    payload = json.dumps([_encode_value(sort_value), _encode_value(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, Any]:
+    """Return (sort_value, id) from a cursor, or raise 400 if it was tampered with"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = (_decode_value(item) for item in json.loads(base64.urlsafe_b64decode(padded)))
+        return sort_value, row_id
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_page(query, sort_column, id_column, cursor: Optional[str], limit: int):
+    """Apply cursor filter, (sort, id) DESC ordering and a limit+1 probe to a Query or select()"""
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        bound = tuple_(sort_value, row_id, types=[sort_column.type, id_column.type])
+        query = query.where(tuple_(sort_column, id_column) < bound)
+
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def split_page(rows: List[T], limit: int, key: Callable[[T], Tuple[Any, Any]]) -> Page[T]:
+    """Trim the limit+1 probe row and build the cursor from key(last item) = (sort, id)"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return Page(rows, None)
+
+    items = rows[:limit]
+    return Page(items, encode_cursor(*key(items[-1])))
+
+
+def page_items(response: Response, page: Page[T]) -> List[T]:
+    """Expose the next cursor as a header and return the page's items"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
@@ -1,7 +1,10 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt
+from typing import Any, Dict, Optional
+from jose import jwt, JWTError
+import asyncio
+import httpx
+import time
 from .config import settings
 
 pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
@@ -17,3 +20,73 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
     to_encode = {'sub': subject, 'exp': expire}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+
+# ========== Supabase access-token verification ==========
+
+SUPABASE_JWT_ALGORITHMS = ['HS256', 'RS256', 'ES256']
+
+_jwks_keys: Dict[str, dict] = {}
+_jwks_fetched_at: Optional[float] = None
+_jwks_lock = asyncio.Lock()
+
+
+def _jwks_needs_fetch(kid: Optional[str]) -> bool:
+    if _jwks_fetched_at is None:
+        return True
+    age = time.monotonic() - _jwks_fetched_at
+    if age > settings.SUPABASE_JWKS_CACHE_SECONDS:
+        return True
+    # An unknown kid may mean the keys were rotated, but refetching for every such
+    # token would turn forged tokens into outbound requests, so it's rate limited
+    return kid not in _jwks_keys and age >= settings.SUPABASE_JWKS_MIN_REFETCH_SECONDS
+
+
+async def _get_jwks_key(kid: Optional[str]) -> dict:
+    """Return the signing key for `kid` from the project's JWKS, refreshing the cache when needed"""
+    global _jwks_fetched_at
+
+    if _jwks_needs_fetch(kid):
+        # One fetch per refresh; other requests wait on the lock, not the event loop
+        async with _jwks_lock:
+            if _jwks_needs_fetch(kid):
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    response = await client.get(f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json")
+                response.raise_for_status()
+                _jwks_keys.clear()
+                _jwks_keys.update({key.get('kid'): key for key in response.json().get('keys', [])})
+                _jwks_fetched_at = time.monotonic()
+
+    key = _jwks_keys.get(kid)
+    if key is None:
+        raise JWTError(f"No JWKS key found for kid {kid}")
+    return key
+
+
+async def decode_supabase_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a Supabase access token locally and return its claims
+    HS256 tokens use SUPABASE_JWT_SECRET, asymmetric tokens use the project JWKS.
+    Raises JWTError if the token is invalid, expired or cannot be verified.
+    """
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get('alg')
+    if algorithm not in SUPABASE_JWT_ALGORITHMS:
+        raise JWTError(f"Unsupported token algorithm: {algorithm}")
+
+    if algorithm == 'HS256':
+        if not settings.SUPABASE_JWT_SECRET:
+            raise JWTError("SUPABASE_JWT_SECRET is not configured")
+        key = settings.SUPABASE_JWT_SECRET
+    else:
+        try:
+            key = await _get_jwks_key(header.get('kid'))
+        except httpx.HTTPError as e:
+            raise JWTError(f"Unable to fetch JWKS: {e}")
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=settings.SUPABASE_JWT_AUDIENCE,
+    )
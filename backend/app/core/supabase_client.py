@@ -1,4 +1,4 @@
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from .config import settings
 
 # Initialize Supabase client with service key for backend operations
@@ -8,7 +8,22 @@ supabase: Client = create_client(
     settings.SUPABASE_SERVICE_KEY
 )
 
+# Separate client for end-user session flows (sign up, sign in, refresh, sign out).
+# A sign-in event on a client swaps its Authorization header to the user's token and
+# drops its PostgREST/storage HTTP clients, so the service client above never signs
+# users in and keeps its pooled connections for the lifetime of the process.
+supabase_auth: Client = create_client(
+    settings.SUPABASE_URL,
+    settings.SUPABASE_SERVICE_KEY,
+    options=ClientOptions(auto_refresh_token=False, persist_session=False)
+)
+
 
 def get_supabase_client() -> Client:
     """Get Supabase client instance"""
     return supabase
+
+
+def get_supabase_auth_client() -> Client:
+    """Get Supabase client used for end-user auth sessions"""
+    return supabase_auth
@@ -0,0 +1,72 @@
+"""
+Verified token cache
+Keeps resolved user dicts for access tokens that Supabase already accepted,
+so repeated requests with the same token skip the auth round trips.
+"""
+import hashlib
+import time
+from typing import Any, Dict, Optional
+from jose import jwt, JWTError
+from .cache import TTLCache
+from .config import settings
+
+
+class VerifiedTokenCache:
+    """Process-local TTL + LRU cache keyed by a hash of the access token"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._cache = TTLCache(max_entries=max_entries, default_ttl=ttl_seconds)
+        # user_id -> wall-clock time of the last local role/profile change,
+        # kept for a day so tokens issued before the change are treated as stale
+        self._changed_at = TTLCache(max_entries=max(max_entries, 1024), default_ttl=86400)
+
+    @staticmethod
+    def _key(access_token: str) -> str:
+        # Never keep raw bearer tokens in memory longer than the request
+        return hashlib.sha256(access_token.encode()).hexdigest()
+
+    def get(self, access_token: str) -> Optional[Dict[str, Any]]:
+        user = self._cache.get(self._key(access_token))
+        return dict(user) if user else None
+
+    def set(self, access_token: str, user: Dict[str, Any]) -> None:
+        """Cache a user for this token, never beyond the token's own `exp`"""
+        ttl = self.ttl_seconds
+        try:
+            exp = jwt.get_unverified_claims(access_token).get("exp")
+        except JWTError:
+            exp = None
+        if exp is not None:
+            ttl = min(ttl, int(exp - time.time()))
+
+        self._cache.set(self._key(access_token), dict(user), ttl=ttl)
+
+    def invalidate(self, access_token: str) -> None:
+        """Drop a single token, e.g. on logout"""
+        self._cache.pop(self._key(access_token))
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached token that resolved to this user"""
+        self._changed_at.set(str(user_id), time.time())
+        return self._cache.pop_where(lambda user: str(user.get("id")) == str(user_id))
+
+    def changed_since(self, user_id: str, issued_at: Optional[float]) -> bool:
+        """True if the user's record changed after a token with this `iat` was issued"""
+        changed_at = self._changed_at.get(str(user_id))
+        if changed_at is None:
+            return False
+        return issued_at is None or issued_at <= changed_at
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._changed_at.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "ttl_seconds": self.ttl_seconds}
+
+
+verified_token_cache = VerifiedTokenCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
@@ -1,9 +1,39 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from .routers import router
+from .core.config import settings
+from .core.executors import shutdown_executors
+from .core.pagination import NEXT_CURSOR_HEADER
+from .services.gemini_service import GeminiService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One Gemini client for the whole process, connected in the background so
+    # an unreachable API doesn't hold up startup
+    app.state.gemini = GeminiService()
+    warm_up = asyncio.create_task(_warm_up(app.state.gemini)) if settings.GEMINI_WARM_UP else None
+    yield
+    if warm_up:
+        warm_up.cancel()
+    # Let in-flight blocking calls finish before the worker exits, without
+    # blocking the event loop while they do
+    await asyncio.to_thread(shutdown_executors)
+
+
+async def _warm_up(gemini: GeminiService) -> None:
+    try:
+        await gemini.warm_up()
+    except Exception as e:
+        print(f"Warning: Gemini warm-up failed, connecting on first use: {e!r}")
+
 
 def create_app() -> FastAPI:
-    app = FastAPI(title='Pump-Fiction API')
+    app = FastAPI(title='Pump-Fiction API', lifespan=lifespan)
     
     # Add CORS middleware
     app.add_middleware(
@@ -12,9 +42,15 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],  # Allows all methods
         allow_headers=["*"],  # Allows all headers
+        expose_headers=[NEXT_CURSOR_HEADER],  # Let browsers read pagination cursors
     )
     
     app.include_router(router)
+
+    if settings.BLOB_STORE == 'local':
+        # Serve the filesystem blob store (development only; no auth on these URLs)
+        os.makedirs(settings.LOCAL_BLOB_DIR, exist_ok=True)
+        app.mount(settings.LOCAL_BLOB_URL, StaticFiles(directory=settings.LOCAL_BLOB_DIR), name='media')
     return app
 
 app = create_app()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Integer, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Boolean, Integer, Text, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,6 +17,9 @@ class ChatRoleEnum(str, enum.Enum):
 class AIChatSession(Base):
     """AI chatbot conversation session"""
     __tablename__ = "ai_chat_sessions"
+    __table_args__ = (
+        Index('idx_ai_chat_sessions_user_archived_last', 'user_id', 'is_archived', 'last_message_at', 'id'),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
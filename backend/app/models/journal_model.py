@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from ..core.database import Base
 
@@ -11,8 +11,11 @@ class JournalSession(Base):
     # Supabase users.id is UUID; store as string
     user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
     name = Column(String, nullable=False)
-    # Store cover image as base64 string (no external storage dependency)
-    cover_image_base64 = Column(Text, nullable=True)
+    # Blob store key of the cover thumbnail (the first entry's thumbnail)
+    cover_image_path = Column(String, nullable=True)
+    # Legacy inline cover; emptied by migrate_journal_images.py. Never loaded with the row
+    # (raiseload: touching it on a loaded session raises instead of silently fetching it)
+    cover_image_base64 = deferred(Column(Text, nullable=True), raiseload=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Avoid ORM FK issues with Supabase managed users; no back_populates
@@ -31,8 +34,12 @@ class JournalEntry(Base):
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey('journal_sessions.id'), nullable=False, index=True)
     date = Column(DateTime, default=datetime.utcnow)
-    # Store image content as base64 string
-    image_base64 = Column(Text, nullable=False)
+    # Blob store keys (settings.JOURNAL_BUCKET) of the original image and its thumbnail
+    image_path = Column(String, nullable=True)
+    thumbnail_path = Column(String, nullable=True)
+    # Legacy inline image; emptied by migrate_journal_images.py. Only read by the image
+    # endpoint, through an explicit column query
+    image_base64 = deferred(Column(Text, nullable=True), raiseload=True)
     weight = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
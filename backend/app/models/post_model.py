@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -6,6 +6,11 @@ from ..core.database import Base
 
 class Post(Base):
     __tablename__ = 'posts'
+    __table_args__ = (
+        # Global feed and profile feed, newest first
+        Index('idx_posts_active_created', 'is_active', 'created_at', 'id'),
+        Index('idx_posts_user_active_created', 'user_id', 'is_active', 'created_at', 'id'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -23,12 +28,27 @@ class Post(Base):
 
 class PostPhoto(Base):
     __tablename__ = 'post_photos'
+    __table_args__ = (
+        Index('idx_post_photos_post_id', 'post_id'),
+        # A direct upload is claimed by inserting its row, so finalizing it twice can't attach it twice
+        Index('uq_post_photos_post_path', 'post_id', 'photo_path', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey('posts.id'), nullable=False)
+    # Full-size variant (longest edge 2048px, WebP); originals are not kept
     photo_url = Column(String, nullable=False)
     photo_path = Column(String, nullable=False)
+    # Smaller variants for grids and the feed; NULL for photos uploaded before processing existed
+    thumbnail_url = Column(String, nullable=True)
+    thumbnail_path = Column(String, nullable=True)
+    feed_url = Column(String, nullable=True)
+    feed_path = Column(String, nullable=True)
+    width = Column(Integer, nullable=True)  # of the full-size variant
+    height = Column(Integer, nullable=True)
     is_primary = Column(Boolean, default=False)  # If this is the main photo
+    # 'processing' while a direct upload's variants are rendered in the background, then 'ready'
+    status = Column(String(20), nullable=False, default='ready')
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationship to post
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,9 @@ import uuid
 
 class RoutineHeader(Base):
     __tablename__ = 'routine_headers'
+    __table_args__ = (
+        Index('idx_routine_headers_user_archived_created', 'user_id', 'is_archived', 'created_at'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
@@ -19,11 +22,14 @@ class RoutineHeader(Base):
 
     # Relationships
     user = relationship("User", back_populates="routines")
-    exercises = relationship("RoutineExercise", back_populates="routine", cascade="all, delete-orphan", order_by="RoutineExercise.position")
+    exercises = relationship("RoutineExercise", back_populates="routine", cascade="all, delete-orphan", passive_deletes=True, order_by="RoutineExercise.position")
 
 
 class RoutineExercise(Base):
     __tablename__ = 'routine_exercises'
+    __table_args__ = (
+        Index('idx_routine_exercises_routine_id', 'routine_id'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     routine_id = Column(UUID(as_uuid=True), ForeignKey('routine_headers.id', ondelete='CASCADE'), nullable=False)
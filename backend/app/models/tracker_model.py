@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -7,6 +7,9 @@ from ..core.database import Base
 
 class Tracker(Base):
     __tablename__ = 'trackers'
+    __table_args__ = (
+        Index('idx_trackers_user_created', 'user_id', 'created_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
@@ -18,16 +21,28 @@ class Tracker(Base):
 
     # Relationships
     user = relationship("User", back_populates="trackers")
-    entries = relationship("TrackerEntry", back_populates="tracker", cascade="all, delete-orphan")
+    entries = relationship(
+        "TrackerEntry",
+        back_populates="tracker",
+        cascade="all, delete-orphan",
+        passive_deletes=True,  # the database's ON DELETE CASCADE removes entries
+        order_by="desc(TrackerEntry.date)"
+    )
 
 
 class TrackerEntry(Base):
     __tablename__ = 'tracker_entries'
+    __table_args__ = (
+        Index('idx_tracker_entries_tracker_date', 'tracker_id', 'date'),
+        # Client-supplied import key; NULLs never collide, so manual entries are unaffected
+        Index('uq_tracker_entries_tracker_external_id', 'tracker_id', 'external_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    tracker_id = Column(Integer, ForeignKey('trackers.id'), nullable=False)
+    tracker_id = Column(Integer, ForeignKey('trackers.id', ondelete='CASCADE'), nullable=False)
     date = Column(DateTime, nullable=False)
     value = Column(Float, nullable=False)
+    external_id = Column(String(255), nullable=True)  # set by batch imports, e.g. a device sample id
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Date, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Date, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,10 @@ import uuid
 
 class WorkoutLog(Base):
     __tablename__ = 'workout_logs'
+    __table_args__ = (
+        # Per-user history, newest first; trailing id keeps keyset pages on the index
+        Index('idx_workout_logs_user_date_id', 'user_id', 'workout_date', 'id'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
@@ -29,6 +33,10 @@ class WorkoutLog(Base):
 
 class WorkoutExercise(Base):
     __tablename__ = 'workout_exercises'
+    __table_args__ = (
+        Index('idx_workout_exercises_workout_log_id', 'workout_log_id'),
+        Index('idx_workout_exercises_position', 'workout_log_id', 'position'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     workout_log_id = Column(UUID(as_uuid=True), ForeignKey('workout_logs.id', ondelete='CASCADE'), nullable=False)
@@ -48,6 +56,10 @@ class WorkoutExercise(Base):
 
 class WorkoutSet(Base):
     __tablename__ = 'workout_sets'
+    __table_args__ = (
+        Index('idx_workout_sets_workout_exercise_id', 'workout_exercise_id'),
+        Index('idx_workout_sets_position', 'workout_exercise_id', 'position'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     workout_exercise_id = Column(UUID(as_uuid=True), ForeignKey('workout_exercises.id', ondelete='CASCADE'), nullable=False)
@@ -2,11 +2,12 @@
 AI Chat Repository
 Data access layer for chat sessions and messages
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, update, and_
 from sqlalchemy.orm import selectinload
 from datetime import datetime
+from ..core.pagination import Page, keyset_page, split_page
 from ..models.ai_chat_model import AIChatSession, AIChatMessage, ChatRoleEnum
 import uuid
 
@@ -61,18 +62,20 @@ class AIChatRepository:
         self, 
         user_id: str, 
         is_archived: bool = False,
-        limit: int = 50
-    ) -> List[AIChatSession]:
-        """Get all sessions for a user"""
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Page[AIChatSession]:
+        """Get a page of sessions for a user, most recently active first"""
         query = select(AIChatSession).where(
             and_(
                 AIChatSession.user_id == uuid.UUID(user_id),
                 AIChatSession.is_archived == is_archived
             )
-        ).order_by(desc(AIChatSession.last_message_at)).limit(limit)
+        )
+        query = keyset_page(query, AIChatSession.last_message_at, AIChatSession.id, cursor, limit)
         
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return split_page(result.scalars().all(), limit, key=lambda s: (s.last_message_at, s.id))
     
     async def update_session_last_message(
         self, 
@@ -87,6 +90,15 @@ class AIChatRepository:
                 session.title = title
             await self.db.commit()
     
+    async def update_context_snapshot(self, session_id: str, snapshot: Dict[str, Any]) -> None:
+        """Replace a session's context_snapshot (rolling conversation summary)"""
+        await self.db.execute(
+            update(AIChatSession)
+            .where(AIChatSession.id == uuid.UUID(session_id))
+            .values(context_snapshot=snapshot)
+        )
+        await self.db.commit()
+    
     async def archive_session(self, session_id: str, user_id: str) -> bool:
         """Archive a session"""
         session = await self.get_session_by_id(session_id, user_id)
@@ -149,3 +161,20 @@ class AIChatRepository:
         
         result = await self.db.execute(query)
         return result.scalars().all()
+    
+    async def get_recent_messages(
+        self,
+        session_id: str,
+        after: Optional[datetime] = None,
+        limit: int = 200
+    ) -> List[AIChatMessage]:
+        """Get a session's latest messages, newest first (only those created after `after` if given)"""
+        query = select(AIChatMessage).where(
+            AIChatMessage.session_id == uuid.UUID(session_id)
+        )
+        if after is not None:
+            query = query.where(AIChatMessage.created_at > after)
+        query = query.order_by(AIChatMessage.created_at.desc()).limit(limit)
+        
+        result = await self.db.execute(query)
+        return result.scalars().all()
@@ -1,48 +1,51 @@
 from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, asc
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import desc, asc, select, update
 from ..models.journal_model import JournalSession, JournalEntry
+from .ownership import OwnershipMixin
 
 
-class JournalRepository:
+class JournalRepository(OwnershipMixin):
     def __init__(self, db: Session):
         self.db = db
 
-    async def create_session(self, user_id: str, name: str) -> JournalSession:
+    def create_session(self, user_id: str, name: str) -> JournalSession:
         session = JournalSession(user_id=user_id, name=name)
         self.db.add(session)
         self.db.commit()
         self.db.refresh(session)
         return session
 
-    async def list_sessions(self, user_id: str) -> List[JournalSession]:
+    def list_sessions(self, user_id: str) -> List[JournalSession]:
         return (
             self.db.query(JournalSession)
+            .options(load_only(JournalSession.id, JournalSession.name, JournalSession.cover_image_path, JournalSession.created_at))
             .filter(JournalSession.user_id == user_id)
             .order_by(desc(JournalSession.created_at))
             .all()
         )
 
-    async def get_session(self, session_id: int, user_id: str) -> Optional[JournalSession]:
+    def get_session(self, session_id: int, user_id: str) -> Optional[JournalSession]:
         return (
             self.db.query(JournalSession)
-            .options(joinedload(JournalSession.entries))
             .filter(JournalSession.id == session_id, JournalSession.user_id == user_id)
             .first()
         )
 
-    async def set_session_cover(self, session_id: int, cover_image_base64: str):
-        session = self.db.query(JournalSession).filter(JournalSession.id == session_id).first()
-        if session:
-            session.cover_image_base64 = cover_image_base64
-            self.db.commit()
-            self.db.refresh(session)
-        return session
+    def set_session_cover(self, session_id: int, cover_image_path: str, only_if_missing: bool = False) -> bool:
+        # Single UPDATE; only_if_missing makes "first image becomes the cover" atomic
+        query = update(JournalSession).where(JournalSession.id == session_id)
+        if only_if_missing:
+            query = query.where(JournalSession.cover_image_path.is_(None))
+        result = self.db.execute(query.values(cover_image_path=cover_image_path))
+        self.db.commit()
+        return result.rowcount > 0
 
-    async def add_entry(self, session_id: int, image_base64: str, weight: Optional[float]) -> JournalEntry:
+    def add_entry(self, session_id: int, image_path: str, thumbnail_path: str, weight: Optional[float]) -> JournalEntry:
         entry = JournalEntry(
             session_id=session_id,
-            image_base64=image_base64,
+            image_path=image_path,
+            thumbnail_path=thumbnail_path,
             weight=weight,
         )
         self.db.add(entry)
@@ -50,14 +53,9 @@ class JournalRepository:
         self.db.refresh(entry)
         return entry
 
-    async def list_entries(self, session_id: int, user_id: str) -> List[JournalEntry]:
+    def list_entries(self, session_id: int, user_id: str) -> List[JournalEntry]:
         # ensure session belongs to user
-        session = (
-            self.db.query(JournalSession)
-            .filter(JournalSession.id == session_id, JournalSession.user_id == user_id)
-            .first()
-        )
-        if not session:
+        if not self.exists_for_user(JournalSession, session_id, user_id):
             return []
 
         return (
@@ -66,3 +64,18 @@ class JournalRepository:
             .order_by(asc(JournalEntry.date))
             .all()
         )
+
+    def get_entry_image_ref(self, entry_id: int, user_id: str):
+        """(image_path, thumbnail_path, has_legacy_image) for the user's entry, or None; never reads the image"""
+        return self.db.execute(
+            select(
+                JournalEntry.image_path,
+                JournalEntry.thumbnail_path,
+                JournalEntry.image_base64.isnot(None).label("has_legacy_image"),
+            )
+            .join(JournalSession, JournalSession.id == JournalEntry.session_id)
+            .where(JournalEntry.id == entry_id, JournalSession.user_id == user_id)
+        ).first()
+
+    def get_legacy_image(self, entry_id: int) -> Optional[str]:
+        return self.db.scalar(select(JournalEntry.image_base64).where(JournalEntry.id == entry_id))
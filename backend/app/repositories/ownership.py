@@ -0,0 +1,34 @@
+"""
+Ownership checks for user-scoped rows
+Mutations only need to know that a row exists and belongs to the caller, so
+these read the parent row alone by primary key + user_id: never its child
+collections. Cost stays the same however much history hangs off the row.
+"""
+from typing import Any, Optional, Type, TypeVar
+
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session, lazyload
+
+M = TypeVar("M")
+
+
+class OwnershipMixin:
+    """For repositories holding a sync Session as self.db; models need `id` and `user_id` columns"""
+
+    db: Session
+
+    def exists_for_user(self, model: Type[M], row_id: Any, user_id: Any) -> bool:
+        """SELECT 1 for the row if it belongs to the user"""
+        query = select(literal(1)).where(model.id == row_id, model.user_id == user_id)
+        return self.db.scalar(query) is not None
+
+    def lock_for_user(self, model: Type[M], row_id: Any, user_id: Any) -> Optional[M]:
+        """SELECT ... FOR UPDATE the row if it belongs to the user, with no relationships loaded.
+
+        The lock is held until the caller commits or rolls back (SQLite has no row locks and skips it).
+        """
+        query = select(model)\
+            .where(model.id == row_id, model.user_id == user_id)\
+            .options(lazyload("*"))\
+            .with_for_update()
+        return self.db.scalar(query)
@@ -1,16 +1,19 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
 from typing import List, Optional
+from datetime import datetime
 from ..models.post_model import Post, PostPhoto
 from ..models.user_model import User
 from ..schemas.post_schema import PostCreate, PostUpdate
+from ..core.pagination import Page, keyset_page, split_page
 
 
 class PostRepository:
     def __init__(self, db: Session):
         self.db = db
     
-    async def create_post(self, post_data: PostCreate, user_id: int) -> Post:
+    def create_post(self, post_data: PostCreate, user_id: int) -> Post:
         """Create a new post"""
         db_post = Post(
             user_id=user_id,
@@ -21,7 +24,7 @@ class PostRepository:
         self.db.refresh(db_post)
         return db_post
     
-    async def add_photos_to_post(self, post_id: int, photos: List[dict]) -> List[PostPhoto]:
+    def add_photos_to_post(self, post_id: int, photos: List[dict]) -> List[PostPhoto]:
         """Add photos to a post"""
         db_photos = []
         for i, photo in enumerate(photos):
@@ -29,6 +32,12 @@ class PostRepository:
                 post_id=post_id,
                 photo_url=photo['url'],
                 photo_path=photo['path'],
+                thumbnail_url=photo.get('thumbnail_url'),
+                thumbnail_path=photo.get('thumbnail_path'),
+                feed_url=photo.get('feed_url'),
+                feed_path=photo.get('feed_path'),
+                width=photo.get('width'),
+                height=photo.get('height'),
                 is_primary=(i == 0)  # First photo is primary
             )
             self.db.add(db_photo)
@@ -39,31 +48,91 @@ class PostRepository:
             self.db.refresh(photo)
         return db_photos
     
-    async def get_post_by_id(self, post_id: int) -> Optional[Post]:
+    def add_pending_photos(self, post_id: int, photos: List[dict]) -> List[str]:
+        """Insert photos as 'processing', skipping paths the post already has; returns the paths inserted.
+        
+        The unique (post_id, photo_path) index makes this the claim: of two concurrent
+        calls with the same path, only one gets it back.
+        """
+        dialect_insert = sqlite.insert if self.db.get_bind().dialect.name == "sqlite" else postgresql.insert
+        stmt = dialect_insert(PostPhoto).values([
+            {
+                "post_id": post_id,
+                "photo_url": photo['url'],
+                "photo_path": photo['path'],
+                "is_primary": i == 0,
+                "status": "processing",
+                "created_at": datetime.utcnow(),
+            }
+            for i, photo in enumerate(photos)
+        ])
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[PostPhoto.post_id, PostPhoto.photo_path]
+        ).returning(PostPhoto.photo_path)
+        claimed = [path for (path,) in self.db.execute(stmt)]
+        self.db.commit()
+        return claimed
+    
+    def complete_photo(self, post_id: int, photo: dict) -> bool:
+        """Store a processed photo's variants and mark it ready; False if the photo or its post is gone"""
+        active_post = select(Post.id).where(Post.id == post_id, Post.is_active == True)
+        updated = self.db.query(PostPhoto).filter(
+            PostPhoto.post_id.in_(active_post),
+            PostPhoto.photo_path == photo['path']
+        ).update({
+            PostPhoto.thumbnail_url: photo['thumbnail_url'],
+            PostPhoto.thumbnail_path: photo['thumbnail_path'],
+            PostPhoto.feed_url: photo['feed_url'],
+            PostPhoto.feed_path: photo['feed_path'],
+            PostPhoto.width: photo['width'],
+            PostPhoto.height: photo['height'],
+            PostPhoto.status: 'ready',
+        }, synchronize_session=False)
+        self.db.commit()
+        return updated > 0
+    
+    def remove_photos(self, post_id: int, photo_paths: List[str]) -> None:
+        """Delete photo rows by path (direct uploads that were rejected or could not be processed)"""
+        self.db.query(PostPhoto).filter(
+            PostPhoto.post_id == post_id,
+            PostPhoto.photo_path.in_(photo_paths)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+    
+    def get_post_by_id(self, post_id: int) -> Optional[Post]:
         """Get a post by ID with photos and user info"""
         return self.db.query(Post).options(
             joinedload(Post.photos),
             joinedload(Post.user)
         ).filter(Post.id == post_id, Post.is_active == True).first()
     
-    async def get_posts_by_user(self, user_id: int, skip: int = 0, limit: int = 20) -> List[Post]:
+    def get_posts_by_user(self, user_id: int, skip: int = 0, limit: int = 20, cursor: Optional[str] = None) -> Page[Post]:
         """Get posts by user ID with pagination"""
-        return self.db.query(Post).options(
+        query = self.db.query(Post).options(
             joinedload(Post.photos),
             joinedload(Post.user)
         ).filter(
             Post.user_id == user_id,
             Post.is_active == True
-        ).order_by(desc(Post.created_at)).offset(skip).limit(limit).all()
+        )
+        return self._page(query, skip, limit, cursor)
     
-    async def get_all_posts(self, skip: int = 0, limit: int = 20) -> List[Post]:
+    def get_all_posts(self, skip: int = 0, limit: int = 20, cursor: Optional[str] = None) -> Page[Post]:
         """Get all posts with pagination"""
-        return self.db.query(Post).options(
+        query = self.db.query(Post).options(
             joinedload(Post.photos),
             joinedload(Post.user)
-        ).filter(Post.is_active == True).order_by(desc(Post.created_at)).offset(skip).limit(limit).all()
+        ).filter(Post.is_active == True)
+        return self._page(query, skip, limit, cursor)
+    
+    def _page(self, query, skip: int, limit: int, cursor: Optional[str]) -> Page[Post]:
+        """Newest-first page after `cursor`; `skip` (OFFSET) is only honoured for legacy page numbers"""
+        query = keyset_page(query, Post.created_at, Post.id, cursor, limit)
+        if not cursor and skip:
+            query = query.offset(skip)
+        return split_page(query.all(), limit, key=lambda post: (post.created_at, post.id))
     
-    async def update_post(self, post_id: int, post_data: PostUpdate, user_id: int) -> Optional[Post]:
+    def update_post(self, post_id: int, post_data: PostUpdate, user_id: int) -> Optional[Post]:
         """Update a post (only by the owner)"""
         db_post = self.db.query(Post).filter(
             Post.id == post_id,
@@ -82,7 +151,7 @@ class PostRepository:
         self.db.refresh(db_post)
         return db_post
     
-    async def delete_post(self, post_id: int, user_id: int) -> bool:
+    def delete_post(self, post_id: int, user_id: int) -> bool:
         """Soft delete a post (only by the owner)"""
         db_post = self.db.query(Post).filter(
             Post.id == post_id,
@@ -97,13 +166,13 @@ class PostRepository:
         self.db.commit()
         return True
     
-    async def count_user_posts(self, user_id: int) -> int:
+    def count_user_posts(self, user_id: int) -> int:
         """Count total posts for a user"""
         return self.db.query(Post).filter(
             Post.user_id == user_id,
             Post.is_active == True
         ).count()
     
-    async def count_all_posts(self) -> int:
+    def count_all_posts(self) -> int:
         """Count total active posts"""
         return self.db.query(Post).filter(Post.is_active == True).count()
\ No newline at end of file
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import delete
 from typing import List, Optional
 from uuid import UUID
 
 from ..models.routine_model import RoutineHeader, RoutineExercise
+from .ownership import OwnershipMixin
 from ..schemas.routine_schema import (
     RoutineHeaderCreate,
     RoutineHeaderUpdate,
@@ -11,7 +13,7 @@ from ..schemas.routine_schema import (
 )
 
 
-class RoutineRepository:
+class RoutineRepository(OwnershipMixin):
     def __init__(self, db: Session):
         self.db = db
 
@@ -92,7 +94,8 @@ class RoutineRepository:
     ) -> Optional[RoutineHeader]:
         """Update a routine and its exercises."""
         try:
-            routine = self.get_routine_by_id(routine_id, user_id)
+            # Exercises are replaced wholesale, so only the header row is needed
+            routine = self.lock_for_user(RoutineHeader, routine_id, user_id)
             if not routine:
                 return None
 
@@ -129,15 +132,13 @@ class RoutineRepository:
             raise e
 
     def delete_routine(self, routine_id: UUID, user_id: UUID) -> bool:
-        """Delete a routine (exercises will be cascade deleted)."""
+        """Delete a routine in one statement (exercises go with it via ON DELETE CASCADE)."""
         try:
-            routine = self.get_routine_by_id(routine_id, user_id)
-            if not routine:
-                return False
-
-            self.db.delete(routine)
+            result = self.db.execute(
+                delete(RoutineHeader).where(RoutineHeader.id == routine_id, RoutineHeader.user_id == user_id)
+            )
             self.db.commit()
-            return True
+            return result.rowcount > 0
         except SQLAlchemyError as e:
             self.db.rollback()
             raise e
@@ -145,7 +146,7 @@ class RoutineRepository:
     def archive_routine(self, routine_id: UUID, user_id: UUID, is_archived: bool) -> Optional[RoutineHeader]:
         """Archive or unarchive a routine."""
         try:
-            routine = self.get_routine_by_id(routine_id, user_id)
+            routine = self.lock_for_user(RoutineHeader, routine_id, user_id)
             if not routine:
                 return None
 
@@ -1,40 +1,129 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
-from typing import List, Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from collections import defaultdict
+from typing import Iterator, List, Optional
 from datetime import datetime
 
+from ..core.pagination import Page, keyset_page, split_page
 from ..models.tracker_model import Tracker, TrackerEntry
-from ..schemas.tracker_schema import TrackerCreate, TrackerUpdate, TrackerEntryCreate, TrackerEntryUpdate
+from .ownership import OwnershipMixin
+from ..schemas.tracker_schema import (
+    TrackerCreate, TrackerUpdate, TrackerEntryCreate, TrackerEntryUpdate, TrackerEntryBatchItem
+)
 
 
-class TrackerRepository:
+class TrackerRepository(OwnershipMixin):
     """Repository for tracker data access operations"""
 
     def __init__(self, db: Session):
         self.db = db
 
     # Tracker CRUD operations
-    def get_tracker_by_id(self, tracker_id: int, user_id: int) -> Optional[Tracker]:
-        """Get a tracker by ID and user ID (with entries loaded)"""
-        return self.db.query(Tracker)\
-            .options(joinedload(Tracker.entries))\
+    def get_tracker_by_id(
+        self, tracker_id: int, user_id: int,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, entries_limit: Optional[int] = None
+    ) -> Optional[Tracker]:
+        """Get a tracker by ID and user ID (with entries loaded, newest first, optionally windowed)"""
+        tracker = self.db.query(Tracker)\
             .filter(Tracker.id == tracker_id, Tracker.user_id == user_id)\
             .first()
+        if tracker:
+            self._load_entries([tracker], date_from, date_to, entries_limit)
+        return tracker
 
-    def get_trackers_by_user(self, user_id: int) -> List[Tracker]:
-        """Get all trackers for a user (with entries loaded)"""
-        return self.db.query(Tracker)\
-            .options(joinedload(Tracker.entries))\
-            .filter(Tracker.user_id == user_id)\
-            .order_by(desc(Tracker.created_at))\
-            .all()
-
-    def get_trackers_list_by_user(self, user_id: int) -> List[Tracker]:
-        """Get all trackers for a user (without entries for list view performance)"""
-        return self.db.query(Tracker)\
-            .filter(Tracker.user_id == user_id)\
-            .order_by(desc(Tracker.created_at))\
-            .all()
+    def get_trackers_by_user(
+        self, user_id: int, limit: int = 100, cursor: Optional[str] = None,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, entries_limit: Optional[int] = None
+    ) -> Page[Tracker]:
+        """Get a page of trackers for a user, newest first (with entries loaded, optionally windowed)"""
+        query = self.db.query(Tracker).filter(Tracker.user_id == user_id)
+        query = keyset_page(query, Tracker.created_at, Tracker.id, cursor, limit)
+        page = split_page(query.all(), limit, key=lambda tracker: (tracker.created_at, tracker.id))
+        self._load_entries(page.items, date_from, date_to, entries_limit)
+        return page
+
+    def _load_entries(
+        self, trackers: List[Tracker],
+        date_from: Optional[datetime], date_to: Optional[datetime], limit: Optional[int]
+    ) -> None:
+        """Populate tracker.entries for all trackers in one query, newest first.
+
+        Only entries within [date_from, date_to] are loaded, and at most `limit`
+        per tracker (picked in SQL with row_number, so old history is never read).
+        """
+        if not trackers:
+            return
+
+        query = select(TrackerEntry).where(TrackerEntry.tracker_id.in_([tracker.id for tracker in trackers]))
+        query = self._entry_window(query, date_from, date_to)
+        newest_first = (TrackerEntry.date.desc(), TrackerEntry.id.desc())
+
+        if limit:
+            row_number = func.row_number().over(partition_by=TrackerEntry.tracker_id, order_by=newest_first)
+            windowed = query.add_columns(row_number.label("rn")).subquery()
+            entry = aliased(TrackerEntry, windowed)
+            query = select(entry)\
+                .where(windowed.c.rn <= limit)\
+                .order_by(entry.tracker_id, entry.date.desc(), entry.id.desc())
+        else:
+            query = query.order_by(TrackerEntry.tracker_id, *newest_first)
+
+        entries_by_tracker = defaultdict(list)
+        for entry in self.db.scalars(query):
+            entries_by_tracker[entry.tracker_id].append(entry)
+
+        # Mark the collection as loaded so accessing it doesn't lazy-load the full history
+        for tracker in trackers:
+            set_committed_value(tracker, "entries", entries_by_tracker.get(tracker.id, []))
+
+    @staticmethod
+    def _entry_window(query, date_from: Optional[datetime], date_to: Optional[datetime]):
+        if date_from is not None:
+            query = query.where(TrackerEntry.date >= date_from)
+        if date_to is not None:
+            query = query.where(TrackerEntry.date <= date_to)
+        return query
+
+    def get_trackers_list_by_user(self, user_id: int, limit: int = 100, cursor: Optional[str] = None) -> Page[Tracker]:
+        """Get a page of trackers for a user (without entries for list view performance)"""
+        query = self.db.query(Tracker).filter(Tracker.user_id == user_id)
+        query = keyset_page(query, Tracker.created_at, Tracker.id, cursor, limit)
+        return split_page(query.all(), limit, key=lambda tracker: (tracker.created_at, tracker.id))
+
+    def get_tracker_summaries(self, user_id: int, limit: int = 100, cursor: Optional[str] = None) -> Page:
+        """Get a page of trackers with entry_count, last_entry_date and last_entry_value in one query.
+
+        Returns rows of (Tracker, entry_count, last_entry_date, last_entry_value).
+        Window functions over the page's entries give the count and the newest row per tracker.
+        """
+        page = keyset_page(
+            select(Tracker).where(Tracker.user_id == user_id),
+            Tracker.created_at, Tracker.id, cursor, limit,
+        ).cte("tracker_page")
+        tracker = aliased(Tracker, page)
+
+        newest_first = (TrackerEntry.date.desc(), TrackerEntry.id.desc())
+        ranked = select(
+            TrackerEntry.tracker_id,
+            TrackerEntry.date,
+            TrackerEntry.value,
+            func.row_number().over(partition_by=TrackerEntry.tracker_id, order_by=newest_first).label("rn"),
+            func.count().over(partition_by=TrackerEntry.tracker_id).label("entry_count"),
+        ).where(TrackerEntry.tracker_id.in_(select(page.c.id))).subquery()
+
+        query = select(
+            tracker,
+            func.coalesce(ranked.c.entry_count, 0).label("entry_count"),
+            ranked.c.date.label("last_entry_date"),
+            ranked.c.value.label("last_entry_value"),
+        ).outerjoin(
+            ranked, and_(ranked.c.tracker_id == tracker.id, ranked.c.rn == 1)
+        ).order_by(tracker.created_at.desc(), tracker.id.desc())
+
+        return split_page(self.db.execute(query).all(), limit, key=lambda row: (row[0].created_at, row[0].id))
 
     def create_tracker(self, user_id: int, tracker_data: TrackerCreate) -> Tracker:
         """Create a new tracker"""
@@ -65,43 +154,111 @@ class TrackerRepository:
         return db_tracker
 
     def delete_tracker(self, tracker_id: int, user_id: int) -> bool:
-        """Delete a tracker (cascade deletes entries)"""
-        db_tracker = self.get_tracker_by_id(tracker_id, user_id)
-        if not db_tracker:
-            return False
-
-        self.db.delete(db_tracker)
+        """Delete a tracker in one statement (entries go with it via ON DELETE CASCADE)"""
+        result = self.db.execute(
+            delete(Tracker).where(Tracker.id == tracker_id, Tracker.user_id == user_id)
+        )
         self.db.commit()
-        return True
+        return result.rowcount > 0
 
     # TrackerEntry CRUD operations
-    def get_entry_by_id(self, entry_id: int, tracker_id: int, user_id: int) -> Optional[TrackerEntry]:
-        """Get an entry by ID, ensuring it belongs to user's tracker"""
-        return self.db.query(TrackerEntry)\
-            .join(Tracker)\
-            .filter(
-                TrackerEntry.id == entry_id,
-                TrackerEntry.tracker_id == tracker_id,
-                Tracker.user_id == user_id
-            ).first()
+    def get_entry_by_id(
+        self, entry_id: int, tracker_id: int, user_id: int, for_update: bool = False
+    ) -> Optional[TrackerEntry]:
+        """Get an entry by ID, ensuring it belongs to user's tracker (optionally locking the entry row)"""
+        query = select(TrackerEntry).where(
+            TrackerEntry.id == entry_id,
+            TrackerEntry.tracker_id == tracker_id,
+            TrackerEntry.tracker_id.in_(self._user_tracker_ids(user_id)),
+        )
+        if for_update:
+            query = query.with_for_update()
+        return self.db.scalar(query)
+
+    @staticmethod
+    def _user_tracker_ids(user_id: int):
+        return select(Tracker.id).where(Tracker.user_id == user_id)
 
-    def get_entries_by_tracker(self, tracker_id: int, user_id: int) -> List[TrackerEntry]:
-        """Get all entries for a tracker"""
+    def get_entries_by_tracker(
+        self, tracker_id: int, user_id: int,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[TrackerEntry]:
+        """Get entries for a tracker, newest first, optionally windowed"""
         # First verify the tracker belongs to the user
-        tracker = self.get_tracker_by_id(tracker_id, user_id)
-        if not tracker:
+        if not self.exists_for_user(Tracker, tracker_id, user_id):
             return []
 
-        return self.db.query(TrackerEntry)\
-            .filter(TrackerEntry.tracker_id == tracker_id)\
-            .order_by(desc(TrackerEntry.date))\
-            .all()
+        query = select(TrackerEntry).where(TrackerEntry.tracker_id == tracker_id)
+        query = self._entry_window(query, date_from, date_to)\
+            .order_by(TrackerEntry.date.desc(), TrackerEntry.id.desc())\
+            .limit(limit)
+        return list(self.db.scalars(query))
+
+    def get_entry_buckets(
+        self, tracker_id: int, bucket: str,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None
+    ) -> list:
+        """Aggregate entries per day/week/month in SQL, oldest bucket first.
+
+        Returns rows of (start, min, max, avg, last, count); `last` is the newest value in the bucket.
+        """
+        start = self._bucket_start(bucket)
+        newest_first = (TrackerEntry.date.desc(), TrackerEntry.id.desc())
+        bucketed = select(
+            start.label("start"),
+            TrackerEntry.value,
+            func.first_value(TrackerEntry.value).over(partition_by=start, order_by=newest_first).label("last"),
+        ).where(TrackerEntry.tracker_id == tracker_id)
+        bucketed = self._entry_window(bucketed, date_from, date_to).subquery()
+
+        query = select(
+            bucketed.c.start,
+            func.min(bucketed.c.value),
+            func.max(bucketed.c.value),
+            func.avg(bucketed.c.value),
+            func.max(bucketed.c.last),
+            func.count(),
+        ).group_by(bucketed.c.start).order_by(bucketed.c.start)
+        return self.db.execute(query).all()
+
+    def _bucket_start(self, bucket: str):
+        # date_trunc on Postgres; equivalent date() arithmetic for local SQLite databases
+        if self.db.get_bind().dialect.name == "sqlite":
+            return {
+                "day": func.date(TrackerEntry.date),
+                "week": func.date(TrackerEntry.date, "weekday 0", "-6 days"),  # Monday, like date_trunc
+                "month": func.strftime("%Y-%m-01", TrackerEntry.date),
+            }[bucket]
+        return func.date_trunc(bucket, TrackerEntry.date)
+
+    def get_entry_points(
+        self, tracker_id: int, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None
+    ) -> list:
+        """Get (date, value) pairs for a tracker, oldest first, without building ORM objects"""
+        query = select(TrackerEntry.date, TrackerEntry.value).where(TrackerEntry.tracker_id == tracker_id)
+        query = self._entry_window(query, date_from, date_to).order_by(TrackerEntry.date, TrackerEntry.id)
+        return self.db.execute(query).all()
+
+    def iter_user_entries(
+        self, user_id: int,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, batch_size: int = 1000
+    ) -> Iterator[TrackerEntry]:
+        """Stream every entry of the user's trackers, fetching `batch_size` rows at a time"""
+        query = select(TrackerEntry)\
+            .join(Tracker, Tracker.id == TrackerEntry.tracker_id)\
+            .where(Tracker.user_id == user_id)
+        query = self._entry_window(query, date_from, date_to)\
+            .order_by(TrackerEntry.tracker_id, TrackerEntry.date.desc(), TrackerEntry.id.desc())\
+            .execution_options(yield_per=batch_size)
+        for entry in self.db.scalars(query):
+            yield entry
+            # Rows already written out don't need to stay in the identity map
+            self.db.expunge(entry)
 
     def create_entry(self, tracker_id: int, user_id: int, entry_data: TrackerEntryCreate) -> Optional[TrackerEntry]:
         """Create a new entry for a tracker"""
         # Verify tracker belongs to user
-        tracker = self.get_tracker_by_id(tracker_id, user_id)
-        if not tracker:
+        if not self.exists_for_user(Tracker, tracker_id, user_id):
             return None
 
         db_entry = TrackerEntry(
@@ -114,9 +271,39 @@ class TrackerRepository:
         self.db.refresh(db_entry)
         return db_entry
 
+    def upsert_entries(self, tracker_id: int, entries: List[TrackerEntryBatchItem], chunk_size: int = 1000) -> int:
+        """Insert entries in multi-row statements, overwriting date and value on (tracker_id, external_id) conflicts.
+
+        Re-sending the same batch is idempotent. Duplicate external_ids within a batch collapse to the
+        last one (Postgres rejects one statement touching the same row twice). Returns rows written.
+        """
+        now = datetime.utcnow()
+        rows = list({
+            entry.external_id: {"tracker_id": tracker_id, "external_id": entry.external_id,
+                                "date": entry.date, "value": entry.value,
+                                "created_at": now, "updated_at": now}
+            for entry in entries
+        }.values())
+
+        dialect_insert = sqlite.insert if self.db.get_bind().dialect.name == "sqlite" else postgresql.insert
+        try:
+            for start in range(0, len(rows), chunk_size):
+                stmt = dialect_insert(TrackerEntry).values(rows[start:start + chunk_size])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[TrackerEntry.tracker_id, TrackerEntry.external_id],
+                    set_={"date": stmt.excluded.date, "value": stmt.excluded.value,
+                          "updated_at": stmt.excluded.updated_at},
+                )
+                self.db.execute(stmt)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise e
+        return len(rows)
+
     def update_entry(self, entry_id: int, tracker_id: int, user_id: int, entry_data: TrackerEntryUpdate) -> Optional[TrackerEntry]:
         """Update an existing entry"""
-        db_entry = self.get_entry_by_id(entry_id, tracker_id, user_id)
+        db_entry = self.get_entry_by_id(entry_id, tracker_id, user_id, for_update=True)
         if not db_entry:
             return None
 
@@ -129,11 +316,13 @@ class TrackerRepository:
         return db_entry
 
     def delete_entry(self, entry_id: int, tracker_id: int, user_id: int) -> bool:
-        """Delete an entry"""
-        db_entry = self.get_entry_by_id(entry_id, tracker_id, user_id)
-        if not db_entry:
-            return False
-
-        self.db.delete(db_entry)
+        """Delete an entry in one statement, scoped to the user's tracker"""
+        result = self.db.execute(
+            delete(TrackerEntry).where(
+                TrackerEntry.id == entry_id,
+                TrackerEntry.tracker_id == tracker_id,
+                TrackerEntry.tracker_id.in_(self._user_tracker_ids(user_id)),
+            )
+        )
         self.db.commit()
-        return True
+        return result.rowcount > 0
@@ -1,27 +1,68 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload, contains_eager, aliased
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, or_, select, insert, update, delete, distinct
+from collections import defaultdict
 from typing import List, Optional
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
+import uuid
 
+from ..core.pagination import Page, keyset_page, split_page
 from ..models.workout_log_model import WorkoutLog, WorkoutExercise, WorkoutSet
-from ..schemas.workout_log_schema import WorkoutLogCreate, WorkoutLogUpdate
+from ..schemas.workout_log_schema import (
+    WorkoutLogCreate,
+    WorkoutLogUpdate,
+    WorkoutExerciseCreate,
+    WorkoutSetCreate,
+)
+
+
+# Per-log aggregates for the list view, computed in one grouped query.
+# To add one, add its SQL expression here and a matching field on WorkoutLogListResponse.
+SUMMARY_AGGREGATES = {
+    "exercise_count": func.count(distinct(WorkoutExercise.id)),
+    "total_sets": func.count(WorkoutSet.id),
+    "total_volume": func.coalesce(func.sum(WorkoutSet.weight * WorkoutSet.reps), 0.0),
+    "max_weight": func.max(WorkoutSet.weight),
+}
 
 
 class WorkoutLogRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_all_workout_logs(self, user_id: UUID, limit: int = 100) -> List[WorkoutLog]:
-        """Get all workout logs for a user, ordered by date descending."""
-        return (
+    def get_all_workout_logs(
+        self, user_id: UUID, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[WorkoutLog]:
+        """Get a page of workout logs for a user, newest first (exercises and sets in one query per level)."""
+        query = keyset_page(
             self.db.query(WorkoutLog)
-            .filter(WorkoutLog.user_id == user_id)
-            .order_by(WorkoutLog.workout_date.desc())
-            .limit(limit)
-            .all()
+            .options(selectinload(WorkoutLog.exercises).selectinload(WorkoutExercise.sets))
+            .filter(WorkoutLog.user_id == user_id),
+            WorkoutLog.workout_date, WorkoutLog.id, cursor, limit,
+        )
+        return split_page(query.all(), limit, key=lambda log: (log.workout_date, log.id))
+
+    def get_workout_log_summaries(self, user_id: UUID, limit: int = 100, cursor: Optional[str] = None) -> Page:
+        """Get a page of workout logs with SUMMARY_AGGREGATES in a single query.
+
+        Returns rows of (WorkoutLog, *aggregates); aggregates are addressable by name.
+        The page of logs is picked first so only its exercises and sets are aggregated.
+        """
+        page = keyset_page(
+            select(WorkoutLog).where(WorkoutLog.user_id == user_id),
+            WorkoutLog.workout_date, WorkoutLog.id, cursor, limit,
+        ).subquery()
+        log = aliased(WorkoutLog, page)
+
+        query = (
+            select(log, *(aggregate.label(name) for name, aggregate in SUMMARY_AGGREGATES.items()))
+            .outerjoin(WorkoutExercise, WorkoutExercise.workout_log_id == log.id)
+            .outerjoin(WorkoutSet, WorkoutSet.workout_exercise_id == WorkoutExercise.id)
+            .group_by(*page.c)
+            .order_by(log.workout_date.desc(), log.id.desc())
         )
+        return split_page(self.db.execute(query).all(), limit, key=lambda row: (row[0].workout_date, row[0].id))
 
     def get_workout_logs_by_date_range(
         self, user_id: UUID, start_date: date, end_date: date
@@ -29,6 +70,7 @@ class WorkoutLogRepository:
         """Get workout logs within a date range."""
         return (
             self.db.query(WorkoutLog)
+            .options(selectinload(WorkoutLog.exercises).selectinload(WorkoutExercise.sets))
             .filter(
                 and_(
                     WorkoutLog.user_id == user_id,
@@ -44,46 +86,47 @@ class WorkoutLogRepository:
         """Get a specific workout log by ID, ensuring it belongs to the user."""
         return (
             self.db.query(WorkoutLog)
+            .options(selectinload(WorkoutLog.exercises).selectinload(WorkoutExercise.sets))
             .filter(WorkoutLog.id == log_id, WorkoutLog.user_id == user_id)
             .first()
         )
 
     def create_workout_log(self, user_id: UUID, log_data: WorkoutLogCreate) -> WorkoutLog:
-        """Create a new workout log with exercises and sets."""
+        """Create a new workout log with exercises and sets.
+
+        IDs are generated client-side so the log, its exercises and its sets go
+        out as three batched INSERTs instead of one flush per exercise.
+        """
         try:
-            # Create the workout log
-            workout_log = WorkoutLog(
-                user_id=user_id,
-                workout_date=log_data.workout_date,
-                routine_title=log_data.routine_title,
-                day_label=log_data.day_label,
+            log_id = uuid.uuid4()
+            now = datetime.utcnow()
+
+            self.db.execute(
+                insert(WorkoutLog),
+                [{
+                    "id": log_id,
+                    "user_id": user_id,
+                    "workout_date": log_data.workout_date,
+                    "routine_title": log_data.routine_title,
+                    "day_label": log_data.day_label,
+                    "created_at": now,
+                }],
             )
-            self.db.add(workout_log)
-            self.db.flush()  # Get the ID without committing
 
-            # Create exercises for this workout log
+            exercise_rows = []
+            set_rows = []
             for exercise_data in log_data.exercises:
-                exercise = WorkoutExercise(
-                    workout_log_id=workout_log.id,
-                    exercise_name=exercise_data.exercise_name,
-                    position=exercise_data.position,
-                )
-                self.db.add(exercise)
-                self.db.flush()  # Get the exercise ID
-
-                # Create sets for this exercise
-                for set_data in exercise_data.sets:
-                    workout_set = WorkoutSet(
-                        workout_exercise_id=exercise.id,
-                        weight=set_data.weight,
-                        reps=set_data.reps,
-                        position=set_data.position,
-                    )
-                    self.db.add(workout_set)
+                exercise_id = uuid.uuid4()
+                exercise_rows.append(self._exercise_row(exercise_id, log_id, exercise_data, now))
+                set_rows.extend(self._set_row(exercise_id, set_data, now) for set_data in exercise_data.sets)
+
+            if exercise_rows:
+                self.db.execute(insert(WorkoutExercise), exercise_rows)
+            if set_rows:
+                self.db.execute(insert(WorkoutSet), set_rows)
 
             self.db.commit()
-            self.db.refresh(workout_log)
-            return workout_log
+            return self.get_workout_log_by_id(log_id, user_id)
         except SQLAlchemyError as e:
             self.db.rollback()
             raise e
@@ -91,51 +134,143 @@ class WorkoutLogRepository:
     def update_workout_log(
         self, log_id: UUID, user_id: UUID, log_data: WorkoutLogUpdate
     ) -> Optional[WorkoutLog]:
-        """Update a workout log and its exercises."""
+        """Update a workout log and its exercises.
+
+        Exercises and sets are matched to the stored ones by position; only rows
+        that actually changed are inserted, updated or deleted.
+        """
         try:
-            workout_log = self.get_workout_log_by_id(log_id, user_id)
-            if not workout_log:
-                return None
+            now = datetime.utcnow()
 
-            # Update workout log fields
-            workout_log.workout_date = log_data.workout_date
-            workout_log.routine_title = log_data.routine_title
-            workout_log.day_label = log_data.day_label
+            # Update workout log fields (the WHERE clause doubles as the ownership check)
+            result = self.db.execute(
+                update(WorkoutLog)
+                .where(WorkoutLog.id == log_id, WorkoutLog.user_id == user_id)
+                .values(
+                    workout_date=log_data.workout_date,
+                    routine_title=log_data.routine_title,
+                    day_label=log_data.day_label,
+                    updated_at=now,
+                )
+            )
+            if result.rowcount == 0:
+                self.db.rollback()
+                return None
 
-            # If exercises are provided, replace all existing exercises and sets
             if log_data.exercises is not None:
-                # Delete existing exercises (cascade will delete sets)
-                self.db.query(WorkoutExercise).filter(
-                    WorkoutExercise.workout_log_id == log_id
-                ).delete()
-
-                # Add new exercises
-                for exercise_data in log_data.exercises:
-                    exercise = WorkoutExercise(
-                        workout_log_id=workout_log.id,
-                        exercise_name=exercise_data.exercise_name,
-                        position=exercise_data.position,
-                    )
-                    self.db.add(exercise)
-                    self.db.flush()  # Get the exercise ID
-
-                    # Add sets for this exercise
-                    for set_data in exercise_data.sets:
-                        workout_set = WorkoutSet(
-                            workout_exercise_id=exercise.id,
-                            weight=set_data.weight,
-                            reps=set_data.reps,
-                            position=set_data.position,
-                        )
-                        self.db.add(workout_set)
+                self._sync_exercises(log_id, log_data.exercises, now)
 
             self.db.commit()
-            self.db.refresh(workout_log)
-            return workout_log
+            return self.get_workout_log_by_id(log_id, user_id)
         except SQLAlchemyError as e:
             self.db.rollback()
             raise e
 
+    def _sync_exercises(self, log_id: UUID, exercises: List[WorkoutExerciseCreate], now: datetime) -> None:
+        """Diff the requested exercises/sets against the stored rows and write only the changes."""
+        stored_exercises = self.db.execute(
+            select(WorkoutExercise.id, WorkoutExercise.position, WorkoutExercise.exercise_name)
+            .where(WorkoutExercise.workout_log_id == log_id)
+            .order_by(WorkoutExercise.position)
+        ).all()
+        stored_sets = self.db.execute(
+            select(
+                WorkoutSet.id, WorkoutSet.workout_exercise_id, WorkoutSet.position,
+                WorkoutSet.weight, WorkoutSet.reps,
+            )
+            .join(WorkoutExercise, WorkoutSet.workout_exercise_id == WorkoutExercise.id)
+            .where(WorkoutExercise.workout_log_id == log_id)
+            .order_by(WorkoutSet.position)
+        ).all()
+
+        sets_by_exercise = defaultdict(list)
+        for stored_set in stored_sets:
+            sets_by_exercise[stored_set.workout_exercise_id].append(stored_set)
+
+        exercise_inserts, exercise_updates, set_inserts, set_updates = [], [], [], []
+        deleted_set_ids = []
+
+        unmatched_exercises = self._group_by_position(stored_exercises)
+        for exercise_data in exercises:
+            stored = self._take_at_position(unmatched_exercises, exercise_data.position)
+            if stored is None:
+                exercise_id = uuid.uuid4()
+                exercise_inserts.append(self._exercise_row(exercise_id, log_id, exercise_data, now))
+                set_inserts.extend(self._set_row(exercise_id, set_data, now) for set_data in exercise_data.sets)
+                continue
+
+            if stored.exercise_name != exercise_data.exercise_name:
+                exercise_updates.append({"id": stored.id, "exercise_name": exercise_data.exercise_name})
+
+            unmatched_sets = self._group_by_position(sets_by_exercise[stored.id])
+            for set_data in exercise_data.sets:
+                stored_set = self._take_at_position(unmatched_sets, set_data.position)
+                if stored_set is None:
+                    set_inserts.append(self._set_row(stored.id, set_data, now))
+                elif (stored_set.weight, stored_set.reps) != (set_data.weight, set_data.reps):
+                    set_updates.append({"id": stored_set.id, "weight": set_data.weight, "reps": set_data.reps})
+            deleted_set_ids.extend(row.id for group in unmatched_sets.values() for row in group)
+
+        deleted_exercise_ids = [row.id for group in unmatched_exercises.values() for row in group]
+
+        if deleted_set_ids or deleted_exercise_ids:
+            self.db.execute(
+                delete(WorkoutSet)
+                .where(or_(
+                    WorkoutSet.id.in_(deleted_set_ids),
+                    WorkoutSet.workout_exercise_id.in_(deleted_exercise_ids),
+                ))
+                .execution_options(synchronize_session=False)
+            )
+        if deleted_exercise_ids:
+            self.db.execute(
+                delete(WorkoutExercise)
+                .where(WorkoutExercise.id.in_(deleted_exercise_ids))
+                .execution_options(synchronize_session=False)
+            )
+        if exercise_inserts:
+            self.db.execute(insert(WorkoutExercise), exercise_inserts)
+        if set_inserts:
+            self.db.execute(insert(WorkoutSet), set_inserts)
+        if exercise_updates:
+            self.db.execute(update(WorkoutExercise), exercise_updates)
+        if set_updates:
+            self.db.execute(update(WorkoutSet), set_updates)
+
+    @staticmethod
+    def _group_by_position(rows) -> dict:
+        grouped = defaultdict(list)
+        for row in rows:
+            grouped[row.position].append(row)
+        return grouped
+
+    @staticmethod
+    def _take_at_position(grouped: dict, position: int):
+        """Pop the first stored row at this position (positions may repeat)."""
+        rows = grouped.get(position)
+        return rows.pop(0) if rows else None
+
+    @staticmethod
+    def _exercise_row(exercise_id: UUID, log_id: UUID, exercise_data: WorkoutExerciseCreate, now: datetime) -> dict:
+        return {
+            "id": exercise_id,
+            "workout_log_id": log_id,
+            "exercise_name": exercise_data.exercise_name,
+            "position": exercise_data.position,
+            "created_at": now,
+        }
+
+    @staticmethod
+    def _set_row(exercise_id: UUID, set_data: WorkoutSetCreate, now: datetime) -> dict:
+        return {
+            "id": uuid.uuid4(),
+            "workout_exercise_id": exercise_id,
+            "weight": set_data.weight,
+            "reps": set_data.reps,
+            "position": set_data.position,
+            "created_at": now,
+        }
+
     def delete_workout_log(self, log_id: UUID, user_id: UUID) -> bool:
         """Delete a workout log (exercises and sets will be cascade deleted)."""
         try:
@@ -157,6 +292,10 @@ class WorkoutLogRepository:
         return (
             self.db.query(WorkoutExercise)
             .join(WorkoutLog)
+            .options(
+                contains_eager(WorkoutExercise.workout_log),
+                selectinload(WorkoutExercise.sets),
+            )
             .filter(
                 and_(
                     WorkoutLog.user_id == user_id,
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .controllers import user_controller, auth_controller, ai_chat_controller, post_controller, user_profile_controller, tracker_controller, routine_controller, workout_log_controller
+from .controllers import user_controller, auth_controller, ai_chat_controller, post_controller, user_profile_controller, tracker_controller, routine_controller, workout_log_controller, journal_controller, metrics_controller
 
 router = APIRouter()
 
@@ -26,3 +26,9 @@ router.include_router(routine_controller.router)
 
 # Workout Log routes (Workout history tracking)
 router.include_router(workout_log_controller.router)
+
+# Journal routes (Progress photo sessions)
+router.include_router(journal_controller.router)
+
+# Metrics routes (Operational counters, admin only)
+router.include_router(metrics_controller.router)
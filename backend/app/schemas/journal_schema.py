@@ -10,7 +10,7 @@ class JournalSessionCreate(BaseModel):
 class JournalSessionResponse(BaseModel):
     id: int
     name: str
-    cover_image_base64: Optional[str] = None
+    cover_image_url: Optional[str] = None  # thumbnail of the first entry
     created_at: datetime
 
     class Config:
@@ -26,7 +26,9 @@ class JournalEntryResponse(BaseModel):
     id: int
     session_id: int
     date: datetime
-    image_base64: str
+    # None until migrate_journal_images.py has moved a legacy inline image
+    image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
     weight: Optional[float] = None
     created_at: datetime
 
@@ -1,12 +1,19 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
 from datetime import datetime
 
 
 class PostPhotoBase(BaseModel):
     photo_url: str
     photo_path: str
+    # Smaller variants; fall back to photo_url when missing (older photos)
+    thumbnail_url: Optional[str] = None
+    feed_url: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
     is_primary: bool = False
+    # 'processing': a direct upload whose variants aren't stored yet (URLs resolve once 'ready')
+    status: Literal['processing', 'ready'] = 'ready'
 
 
 class PostPhotoCreate(PostPhotoBase):
@@ -22,6 +29,25 @@ class PostPhotoResponse(PostPhotoBase):
         from_attributes = True
 
 
+class PhotoUploadUrlsRequest(BaseModel):
+    # One entry per photo, e.g. ["image/jpeg", "image/png"]
+    content_types: List[str] = Field(..., min_length=1)
+
+
+class PhotoUploadUrl(BaseModel):
+    path: str
+    signed_url: str  # PUT the file here (multipart field "file")
+    token: str
+
+
+class PhotoUploadUrlsResponse(BaseModel):
+    uploads: List[PhotoUploadUrl]
+
+
+class PhotoFinalizeRequest(BaseModel):
+    paths: List[str] = Field(..., min_length=1)  # `path` values from upload-urls, in display order
+
+
 class PostBase(BaseModel):
     content: Optional[str] = None
 
@@ -61,4 +87,5 @@ class PostListResponse(BaseModel):
     total: int
     page: int
     page_size: int
-    total_pages: int
\ No newline at end of file
+    total_pages: int
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
\ No newline at end of file
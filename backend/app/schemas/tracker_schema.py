@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 from uuid import UUID
 
@@ -18,9 +18,23 @@ class TrackerEntryUpdate(TrackerEntryBase):
     pass
 
 
+class TrackerEntryBatchItem(TrackerEntryBase):
+    external_id: str = Field(..., min_length=1, max_length=255)  # stable per sample on the client
+
+
+class TrackerEntryBatchCreate(BaseModel):
+    entries: List[TrackerEntryBatchItem] = Field(..., min_length=1, max_length=10000)
+
+
+class TrackerEntryBatchResponse(BaseModel):
+    received: int
+    written: int  # distinct external_ids inserted or updated (later duplicates in a batch win)
+
+
 class TrackerEntryResponse(TrackerEntryBase):
     id: int
     tracker_id: int
+    external_id: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -66,3 +80,43 @@ class TrackerListResponse(TrackerBase):
 
     class Config:
         from_attributes = True
+
+
+# Chart series (GET /trackers/{id}/series)
+class TrackerSeriesBucket(BaseModel):
+    start: datetime  # start of the day/week/month
+    min: float
+    max: float
+    avg: float
+    last: float  # value of the newest entry in the bucket
+    count: int
+
+
+class TrackerSeriesPoint(BaseModel):
+    date: datetime
+    value: float
+
+
+class TrackerSeriesResponse(BaseModel):
+    tracker_id: int
+    mode: Literal["bucket", "lttb"]
+    bucket: Optional[Literal["day", "week", "month"]] = None
+    source_points: int  # raw entries in the requested window
+    buckets: List[TrackerSeriesBucket] = []
+    points: List[TrackerSeriesPoint] = []
+
+
+# NDJSON export lines (GET /trackers/export): trackers first, then their entries
+class TrackerExportLine(TrackerBase):
+    type: Literal["tracker"] = "tracker"
+    id: int
+    user_id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TrackerEntryExportLine(TrackerEntryResponse):
+    type: Literal["entry"] = "entry"
@@ -90,6 +90,8 @@ class WorkoutLogListResponse(WorkoutLogBase):
     user_id: UUID  # ⚠️ UUID not int!
     exercise_count: int = 0
     total_sets: int = 0
+    total_volume: float = 0.0  # sum of weight x reps
+    max_weight: Optional[float] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -2,18 +2,25 @@
 AI Chat Service
 Business logic for AI chatbot conversations
 """
-from typing import Dict, Any, List, Tuple
+from contextlib import aclosing
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+from ..core.pagination import Page
 from ..repositories.ai_chat_repository import AIChatRepository
-from ..services.gemini_service import GeminiService
+from ..services.gemini_service import GeminiService, GeminiUnavailableError
 from ..models.ai_chat_model import ChatRoleEnum, AIChatSession, AIChatMessage
+from ..core.config import settings
+from .chat_context import (
+    DISCLAIMER_KEYWORDS, HISTORY_FETCH_LIMIT, MEDICAL_DISCLAIMER,
+    build_history, fit_to_budget, make_snapshot, messages_to_fold, read_snapshot, summary_prompt
+)
 
 
 class AIChatService:
     """Service for AI chat business logic"""
     
-    def __init__(self, repository: AIChatRepository):
+    def __init__(self, repository: AIChatRepository, gemini_service: GeminiService):
         self.repository = repository
-        self.gemini_service = GeminiService()
+        self.gemini_service = gemini_service
     
     async def create_session(self, user_id: str, title: str = "New Chat") -> AIChatSession:
         """Create a new chat session"""
@@ -22,10 +29,12 @@ class AIChatService:
     async def get_user_sessions(
         self, 
         user_id: str, 
-        is_archived: bool = False
-    ) -> List[AIChatSession]:
-        """Get all sessions for a user"""
-        return await self.repository.get_user_sessions(user_id, is_archived)
+        is_archived: bool = False,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Page[AIChatSession]:
+        """Get a page of sessions for a user"""
+        return await self.repository.get_user_sessions(user_id, is_archived, limit, cursor)
     
     async def get_session_with_messages(
         self, 
@@ -68,72 +77,175 @@ class AIChatService:
         Returns:
             Tuple of (user_message, assistant_message)
         """
-        # Verify session exists and belongs to user
-        session = await self.repository.get_session_by_id(session_id, user_id)
-        if not session:
-            raise ValueError("Session not found")
-        
-        # Create user message
-        user_message = await self.repository.create_message(
-            session_id=session_id,
-            role=ChatRoleEnum.USER,
-            content=content
-        )
+        session, user_message = await self.start_message(session_id, user_id, content)
         
         # Generate AI response using Gemini
         try:
             system_prompt = self.gemini_service.get_default_system_prompt()
             ai_response = await self.gemini_service.generate_response(
                 user_message=content,
-                system_prompt=system_prompt
-            )
-            
-            # Check if medical disclaimer should be shown
-            disclaimer_keywords = [
-                "injury", "pain", "hurt", "medical", "doctor", "physician", 
-                "surgery", "condition", "disease", "medication"
-            ]
-            needs_disclaimer = any(
-                keyword in content.lower() 
-                for keyword in disclaimer_keywords
+                system_prompt=system_prompt,
+                history=await self._history(session, user_message)
             )
             
             # Add disclaimer to response if needed
             response_content = ai_response["response_text"]
+            needs_disclaimer = self._needs_disclaimer(content)
             if needs_disclaimer:
-                response_content = (
-                    f"{response_content}\n\n"
-                    "⚠️ **Medical Disclaimer:** This advice is for informational purposes only. "
-                    "Please consult with a healthcare professional for medical concerns or injuries."
-                )
+                response_content += MEDICAL_DISCLAIMER
             
-            # Create assistant message
-            assistant_message = await self.repository.create_message(
-                session_id=session_id,
-                role=ChatRoleEnum.ASSISTANT,
-                content=response_content,
-                tokens_used=ai_response.get("tokens_used"),
-                model_version=ai_response.get("model_version"),
-                safety_flag=ai_response.get("safety_flag", False),
-                disclaimer_shown=needs_disclaimer
+            assistant_message = await self._finish_message(
+                session_id, session.title, content, response_content, ai_response, needs_disclaimer
             )
-            
-            # Auto-generate title from first message if still "New Chat"
-            if session.title == "New Chat":
-                title = self._generate_session_title(content)
-                await self.repository.update_session_last_message(
-                    session_id, 
-                    title=title
-                )
-            else:
-                await self.repository.update_session_last_message(session_id)
-            
-            return user_message, assistant_message
         
+        except GeminiUnavailableError:
+            await self.repository.update_session_last_message(session_id)
+            raise
         except Exception as e:
             # If AI generation fails, still update session timestamp
             await self.repository.update_session_last_message(session_id)
             raise ValueError(f"Failed to generate AI response: {str(e)}")
+        
+        return user_message, assistant_message
+    
+    async def start_message(
+        self, 
+        session_id: str, 
+        user_id: str, 
+        content: str
+    ) -> Tuple[AIChatSession, AIChatMessage]:
+        """Verify the session belongs to the user and store their message"""
+        session = await self.repository.get_session_by_id(session_id, user_id)
+        if not session:
+            raise ValueError("Session not found")
+        
+        user_message = await self.repository.create_message(
+            session_id=session_id,
+            role=ChatRoleEnum.USER,
+            content=content
+        )
+        return session, user_message
+    
+    async def stream_reply(
+        self, 
+        session: AIChatSession, 
+        user_message: AIChatMessage
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream the AI reply to a message stored by start_message
+        
+        Yields ("delta", text) as Gemini produces it, then ("done", assistant_message).
+        The reply is only persisted once the stream completes, so a client that
+        disconnects (cancelling this iterator) leaves no partial message behind.
+        """
+        session_id, content = str(session.id), user_message.content
+        system_prompt = self.gemini_service.get_default_system_prompt()
+        history = await self._history(session, user_message)
+        parts: List[str] = []
+        ai_response: Dict[str, Any] = {}
+        try:
+            # aclosing: on cancellation the Gemini stream (and its concurrency slot)
+            # is released right away rather than whenever the generator is collected
+            async with aclosing(self.gemini_service.stream_response(content, system_prompt, history)) as chunks:
+                async for chunk in chunks:
+                    if "text" in chunk:
+                        parts.append(chunk["text"])
+                        yield "delta", chunk["text"]
+                    else:
+                        ai_response = chunk
+        except GeminiUnavailableError:
+            await self.repository.update_session_last_message(session_id)
+            raise
+        except Exception as e:
+            await self.repository.update_session_last_message(session_id)
+            raise ValueError(f"Failed to generate AI response: {str(e)}")
+        
+        needs_disclaimer = self._needs_disclaimer(content)
+        if needs_disclaimer:
+            parts.append(MEDICAL_DISCLAIMER)
+            yield "delta", MEDICAL_DISCLAIMER
+        
+        assistant_message = await self._finish_message(
+            session_id, session.title, content, "".join(parts), ai_response, needs_disclaimer
+        )
+        yield "done", assistant_message
+    
+    async def _history(self, session: AIChatSession, user_message: AIChatMessage) -> Optional[str]:
+        """Rolling summary plus the most recent turns that fit AI_CONTEXT_TOKEN_BUDGET"""
+        summary, summarized_through = read_snapshot(session.context_snapshot)
+        recent = await self.repository.get_recent_messages(
+            str(session.id), summarized_through, HISTORY_FETCH_LIMIT
+        )
+        earlier = [message for message in recent if message.id != user_message.id]
+        return build_history(summary, fit_to_budget(earlier, settings.AI_CONTEXT_TOKEN_BUDGET))
+    
+    async def compact_history(self, session_id: str, user_id: str) -> None:
+        """
+        Fold the oldest unsummarized turns into the session summary once they exceed the budget
+        
+        Costs a Gemini call every few turns, so callers run it after the reply has been sent.
+        """
+        session = await self.repository.get_session_by_id(session_id, user_id)
+        if not session:
+            return
+        
+        summary, summarized_through = read_snapshot(session.context_snapshot)
+        recent = await self.repository.get_recent_messages(
+            str(session.id), summarized_through, HISTORY_FETCH_LIMIT
+        )
+        fold = messages_to_fold(recent[::-1], settings.AI_CONTEXT_TOKEN_BUDGET)
+        if not fold:
+            return
+        
+        try:
+            result = await self.gemini_service.generate_response(
+                summary_prompt(summary, fold, settings.AI_SUMMARY_MAX_TOKENS),
+                max_output_tokens=settings.AI_SUMMARY_MAX_TOKENS
+            )
+        except Exception as e:
+            # Retried after the next message; until then the history is just trimmed
+            print(f"Warning: Failed to summarize chat session {session.id}: {e}")
+            return
+        
+        snapshot = make_snapshot(result["response_text"].strip(), fold[-1].created_at)
+        await self.repository.update_context_snapshot(str(session.id), snapshot)
+    
+    async def _finish_message(
+        self,
+        session_id: str,
+        session_title: str,
+        content: str,
+        response_content: str,
+        ai_response: Dict[str, Any],
+        needs_disclaimer: bool
+    ) -> AIChatMessage:
+        """Store the assistant reply and bump the session (titling it on the first message)"""
+        assistant_message = await self.repository.create_message(
+            session_id=session_id,
+            role=ChatRoleEnum.ASSISTANT,
+            content=response_content,
+            tokens_used=ai_response.get("tokens_used"),
+            model_version=ai_response.get("model_version"),
+            safety_flag=ai_response.get("safety_flag", False),
+            disclaimer_shown=needs_disclaimer
+        )
+        
+        # Auto-generate title from first message if still "New Chat"
+        if session_title == "New Chat":
+            title = self._generate_session_title(content)
+            await self.repository.update_session_last_message(
+                session_id, 
+                title=title
+            )
+        else:
+            await self.repository.update_session_last_message(session_id)
+        
+        return assistant_message
+    
+    @staticmethod
+    def _needs_disclaimer(content: str) -> bool:
+        """Check if medical disclaimer should be shown"""
+        return any(keyword in content.lower() for keyword in DISCLAIMER_KEYWORDS)
     
     def _generate_session_title(self, first_message: str) -> str:
         """Generate a short title from the first message"""
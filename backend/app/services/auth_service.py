@@ -1,10 +1,15 @@
 from typing import Optional, Dict, Any
-from ..core.supabase_client import get_supabase_client
+from ..core.supabase_client import get_supabase_client, get_supabase_auth_client
+from ..core.executors import run_supabase
+from ..core.token_cache import verified_token_cache
+from ..core.security import decode_supabase_token
+from ..core.config import settings
 from ..schemas.auth_schema import (
     SignupRequest, LoginRequest, UserRole, 
     RoleApplicationRequest, ApplicationStatus
 )
 from gotrue.errors import AuthApiError
+from jose import JWTError
 import uuid
 
 
@@ -13,6 +18,7 @@ class AuthService:
     
     def __init__(self):
         self.supabase = get_supabase_client()
+        self.supabase_auth = get_supabase_auth_client()
     
     async def signup(self, signup_data: SignupRequest) -> Dict[str, Any]:
         """
@@ -21,7 +27,7 @@ class AuthService:
         """
         try:
             # Create user in Supabase Auth
-            auth_response = self.supabase.auth.sign_up({
+            auth_response = await run_supabase(self.supabase_auth.auth.sign_up, {
                 "email": signup_data.email,
                 "password": signup_data.password,
                 "options": {
@@ -45,7 +51,7 @@ class AuthService:
                 "role": UserRole.NORMAL_USER.value,
             }
             
-            self.supabase.table("users").insert(user_data).execute()
+            await run_supabase(self.supabase.table("users").insert(user_data).execute)
             
             # Check if session exists (email confirmation disabled) or not (email confirmation required)
             if auth_response.session:
@@ -87,7 +93,7 @@ class AuthService:
     async def login(self, login_data: LoginRequest) -> Dict[str, Any]:
         """Authenticate user and return tokens"""
         try:
-            auth_response = self.supabase.auth.sign_in_with_password({
+            auth_response = await run_supabase(self.supabase_auth.auth.sign_in_with_password, {
                 "email": login_data.email,
                 "password": login_data.password
             })
@@ -96,7 +102,9 @@ class AuthService:
                 raise ValueError("Login failed")
             
             # Get user role from database
-            user_record = self.supabase.table("users").select("*").eq("id", auth_response.user.id).single().execute()
+            user_record = await run_supabase(
+                self.supabase.table("users").select("*").eq("id", auth_response.user.id).single().execute
+            )
             
             return {
                 "access_token": auth_response.session.access_token,
@@ -119,13 +127,15 @@ class AuthService:
     async def refresh_token(self, refresh_token: str) -> Dict[str, Any]:
         """Refresh access token"""
         try:
-            auth_response = self.supabase.auth.refresh_session(refresh_token)
+            auth_response = await run_supabase(self.supabase_auth.auth.refresh_session, refresh_token)
             
             if not auth_response.session:
                 raise ValueError("Token refresh failed")
             
             # Get user role from database
-            user_record = self.supabase.table("users").select("*").eq("id", auth_response.user.id).single().execute()
+            user_record = await run_supabase(
+                self.supabase.table("users").select("*").eq("id", auth_response.user.id).single().execute
+            )
             
             return {
                 "access_token": auth_response.session.access_token,
@@ -145,24 +155,37 @@ class AuthService:
     
     async def logout(self, access_token: str) -> bool:
         """Logout user (invalidate session)"""
+        # Evict first so the token stops authenticating even if revoking fails
+        verified_token_cache.invalidate(access_token)
         try:
-            self.supabase.auth.sign_out()
+            # The shared auth client's session belongs to whoever signed in last on
+            # this worker, so revoke the caller's own token through the admin API
+            await run_supabase(self.supabase.auth.admin.sign_out, access_token)
             return True
         except Exception as e:
             raise ValueError(f"Logout failed: {str(e)}")
     
     async def get_user_from_token(self, access_token: str) -> Optional[Dict[str, Any]]:
-        """Get user details from access token"""
+        """Get user details from access token (served from the verified-token cache when possible)"""
+        cached_user = verified_token_cache.get(access_token)
+        if cached_user:
+            return cached_user
+
+        if settings.AUTH_VERIFY_MODE == "local":
+            return await self._get_user_from_verified_claims(access_token)
+
         try:
-            user = self.supabase.auth.get_user(access_token)
+            user = await run_supabase(self.supabase_auth.auth.get_user, access_token)
             
             if not user or not user.user:
                 return None
             
             # Get full user data from database
-            user_record = self.supabase.table("users").select("*").eq("id", user.user.id).single().execute()
+            user_record = await run_supabase(
+                self.supabase.table("users").select("*").eq("id", user.user.id).single().execute
+            )
             
-            return {
+            resolved_user = {
                 "id": user.user.id,
                 "email": user.user.email,
                 "full_name": user_record.data.get("full_name"),
@@ -170,18 +193,73 @@ class AuthService:
                 "role": user_record.data.get("role", UserRole.NORMAL_USER.value),
                 "created_at": user_record.data.get("created_at")
             }
+            verified_token_cache.set(access_token, resolved_user)
+            return resolved_user
         except Exception as e:
             return None
     
+    async def _get_user_from_verified_claims(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a user from a locally verified access token
+        Supabase is only queried when a claim is missing or the user record
+        changed after the token was issued.
+        """
+        try:
+            claims = await decode_supabase_token(access_token)
+        except JWTError:
+            return None
+
+        user_id = claims.get("sub")
+        if not user_id:
+            return None
+
+        # Users can edit their own user_metadata, so the role is only trusted
+        # from app_metadata, which only the service key can write
+        metadata = claims.get("user_metadata") or {}
+        role = (claims.get("app_metadata") or {}).get("role")
+        has_claims = claims.get("email") and role and metadata.get("full_name")
+        is_stale = verified_token_cache.changed_since(user_id, claims.get("iat"))
+
+        if has_claims and not is_stale:
+            resolved_user = {
+                "id": user_id,
+                "email": claims["email"],
+                "full_name": metadata["full_name"],
+                "phone_number": metadata.get("phone_number"),
+                "role": role,
+                "created_at": None
+            }
+        else:
+            try:
+                user_record = await run_supabase(
+                    self.supabase.table("users").select("*").eq("id", user_id).single().execute
+                )
+            except Exception:
+                return None
+
+            resolved_user = {
+                "id": user_id,
+                "email": claims.get("email") or user_record.data.get("email"),
+                "full_name": user_record.data.get("full_name"),
+                "phone_number": user_record.data.get("phone_number"),
+                "role": user_record.data.get("role", UserRole.NORMAL_USER.value),
+                "created_at": user_record.data.get("created_at")
+            }
+
+        verified_token_cache.set(access_token, resolved_user)
+        return resolved_user
+    
     async def update_user_role(self, user_id: str, new_role: UserRole) -> bool:
         """Update user's role (admin only operation)"""
         try:
-            self.supabase.table("users").update({"role": new_role.value}).eq("id", user_id).execute()
+            await run_supabase(self.supabase.table("users").update({"role": new_role.value}).eq("id", user_id).execute)
+            verified_token_cache.invalidate_user(user_id)
             
-            # Also update in auth metadata
-            self.supabase.auth.admin.update_user_by_id(
+            # Also update in app metadata (read-only for users, unlike user_metadata)
+            await run_supabase(
+                self.supabase.auth.admin.update_user_by_id,
                 user_id,
-                {"user_metadata": {"role": new_role.value}}
+                {"app_metadata": {"role": new_role.value}}
             )
             return True
         except Exception as e:
@@ -200,7 +278,8 @@ class AuthService:
                 raise ValueError("No fields to update")
             
             # Update in public.users table
-            result = self.supabase.table("users").update(update_data).eq("id", user_id).execute()
+            result = await run_supabase(self.supabase.table("users").update(update_data).eq("id", user_id).execute)
+            verified_token_cache.invalidate_user(user_id)
             
             # Also update in auth metadata if full_name changed
             if full_name is not None or phone_number is not None:
@@ -210,7 +289,8 @@ class AuthService:
                 if phone_number is not None:
                     auth_metadata["phone_number"] = phone_number
                 
-                self.supabase.auth.admin.update_user_by_id(
+                await run_supabase(
+                    self.supabase.auth.admin.update_user_by_id,
                     user_id,
                     {"user_metadata": auth_metadata}
                 )
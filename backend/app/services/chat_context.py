@@ -0,0 +1,137 @@
+"""
+Conversation memory for AI chat
+Recent turns are replayed up to a token budget; turns that fall out of it are
+folded into a rolling summary kept in AIChatSession.context_snapshot, so the
+prompt stays bounded however long a session gets.
+"""
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..models.ai_chat_model import AIChatMessage, ChatRoleEnum
+
+# Rough ratio for English text; exact counts would cost a Gemini call per turn
+CHARS_PER_TOKEN = 4
+
+# Appended to replies about injuries and medical topics
+MEDICAL_DISCLAIMER = (
+    "\n\n"
+    "⚠️ **Medical Disclaimer:** This advice is for informational purposes only. "
+    "Please consult with a healthcare professional for medical concerns or injuries."
+)
+
+# Topics that get MEDICAL_DISCLAIMER appended
+DISCLAIMER_KEYWORDS = [
+    "injury", "pain", "hurt", "medical", "doctor", "physician", 
+    "surgery", "condition", "disease", "medication"
+]
+
+# Details about the asker; replies to messages carrying them are never shared
+# through the response cache
+_FIRST_PERSON = re.compile(r"\b(i|i'm|im|i've|ive|i'd|me|my|mine|myself)\b")
+_BODY_DETAILS = re.compile(r"\b(years? old|yrs? old|aged?|weigh\w*|pounds|lbs?|kilos?|kgs?|height|tall|bmi)\b")
+_HEALTH_TERMS = re.compile(
+    r"\b(blood pressure|blood sugar|heart|diabet\w*|asthma\w*|pregnan\w*|cholesterol|arthritis|hernia\w*"
+    r"|diagnos\w*|allerg\w*|injur\w*|sick|ill|illness|recover\w*|periods?|menopaus\w*|thyroid"
+    r"|knees?|back|shoulders?|joints?|hips?)\b"
+)
+
+# Most messages read back per request (newest first)
+HISTORY_FETCH_LIMIT = 200
+
+SUMMARY_PROMPT = """Summarize this conversation between a user and their fitness coach so the coach
+can continue it later. Keep the user's goals, stats, injuries, preferences and any plans or
+numbers already agreed on; drop small talk. Write short plain sentences, at most {max_words} words.
+
+{previous}Conversation:
+{turns}
+
+Summary:"""
+
+
+def has_personal_context(message: str) -> bool:
+    """True if a message carries details about the asker: numbers (age, weight), body
+    measurements, a DISCLAIMER_KEYWORDS hit or a health term in first-person wording"""
+    text = message.lower()
+    if any(char.isdigit() for char in text) or _BODY_DETAILS.search(text):
+        return True
+    if any(keyword in text for keyword in DISCLAIMER_KEYWORDS):
+        return True
+    return bool(_FIRST_PERSON.search(text) and _HEALTH_TERMS.search(text))
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate Gemini token count of a text"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def read_snapshot(snapshot: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[datetime]]:
+    """Return (summary, summarized_through) from a session's context_snapshot"""
+    snapshot = snapshot or {}
+    through = snapshot.get("summarized_through")
+    return snapshot.get("summary") or None, datetime.fromisoformat(through) if through else None
+
+
+def make_snapshot(summary: str, summarized_through: datetime) -> Dict[str, Any]:
+    """context_snapshot for a summary covering every message up to summarized_through"""
+    return {"summary": summary, "summarized_through": summarized_through.isoformat()}
+
+
+def _turn_text(message: AIChatMessage) -> str:
+    speaker = "User" if message.role == ChatRoleEnum.USER else "Assistant"
+    content = message.content
+    if message.disclaimer_shown:
+        # Boilerplate the model doesn't need to see again
+        content = content.replace(MEDICAL_DISCLAIMER, "")
+    return f"{speaker}: {content.strip()}"
+
+
+def format_turns(messages: Sequence[AIChatMessage]) -> str:
+    return "\n\n".join(_turn_text(message) for message in messages)
+
+
+def fit_to_budget(newest_first: Sequence[AIChatMessage], budget: int) -> List[AIChatMessage]:
+    """The most recent messages whose text fits in budget tokens, oldest first"""
+    kept, used = [], 0
+    for message in newest_first:
+        used += estimate_tokens(_turn_text(message))
+        if used > budget:
+            break
+        kept.append(message)
+    return kept[::-1]
+
+
+def messages_to_fold(oldest_first: Sequence[AIChatMessage], budget: int) -> List[AIChatMessage]:
+    """Oldest messages to move into the summary once the unsummarized ones exceed budget.
+
+    Folds down to half the budget, so summarizing happens every few turns rather
+    than on every message.
+    """
+    sizes = [estimate_tokens(_turn_text(message)) for message in oldest_first]
+    total = sum(sizes)
+    if total <= budget:
+        return []
+    count = 0
+    while count < len(sizes) and total > budget // 2:
+        total -= sizes[count]
+        count += 1
+    return list(oldest_first[:count])
+
+
+def summary_prompt(previous_summary: Optional[str], messages: Sequence[AIChatMessage], max_tokens: int) -> str:
+    previous = f"Summary so far:\n{previous_summary}\n\n" if previous_summary else ""
+    return SUMMARY_PROMPT.format(
+        max_words=max_tokens * 3 // 4,
+        previous=previous,
+        turns=format_turns(messages),
+    )
+
+
+def build_history(summary: Optional[str], turns: Sequence[AIChatMessage]) -> Optional[str]:
+    """Conversation context to put between the system prompt and the new message"""
+    sections = []
+    if summary:
+        sections.append(f"Summary of the earlier conversation:\n{summary}")
+    if turns:
+        sections.append(f"Recent conversation:\n{format_turns(turns)}")
+    return "\n\n".join(sections) or None
@@ -2,13 +2,29 @@
 Google Gemini AI Service
 Handles direct integration with Google's Generative AI API
 """
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Optional, Dict, Any, AsyncIterator
 import google.generativeai as genai
 from ..core.config import settings
+from ..core.ai_response_cache import ai_response_cache
+from .chat_context import has_personal_context
+
+
+# Shared by every GeminiService in the process
+_gemini_slots = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+
+
+class GeminiUnavailableError(Exception):
+    """Gemini didn't answer within GEMINI_TIMEOUT_SECONDS (waiting for a slot included)"""
 
 
 class GeminiService:
-    """Service for interacting with Google Gemini AI"""
+    """Service for interacting with Google Gemini AI
+    
+    Create one per process (app.state.gemini, see main.lifespan): genai.configure
+    drops the SDK's cached clients, so a new instance per request would also
+    open a new connection per request.
+    """
     
     def __init__(self):
         """Initialize Gemini API with API key"""
@@ -52,7 +68,9 @@ class GeminiService:
     async def generate_response(
         self, 
         user_message: str, 
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        history: Optional[str] = None,
+        max_output_tokens: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Generate AI response using Gemini
@@ -60,19 +78,32 @@ class GeminiService:
         Args:
             user_message: User's input message
             system_prompt: Optional system instructions for context
+            history: Optional earlier conversation (summary and recent turns)
+            max_output_tokens: Optional lower cap on the response length
         
         Returns:
             Dict with response text, model version, and token usage
         """
+        # Only context-free chat questions are cached; summaries and anything
+        # carrying the user's conversation or personal details always go to Gemini
+        personal = history is not None or has_personal_context(user_message)
+        cacheable = not personal and max_output_tokens is None
+        if personal:
+            ai_response_cache.record_bypass()
+        elif cacheable:
+            cached = ai_response_cache.get(user_message, system_prompt)
+            if cached is not None:
+                return {**cached, "tokens_used": 0}
+        
         try:
-            # Build the prompt
-            if system_prompt:
-                prompt = f"{system_prompt}\n\nUser: {user_message}\n\nAssistant:"
-            else:
-                prompt = user_message
+            prompt = self._build_prompt(user_message, system_prompt, history)
+            # Merged over the model's generation_config by the SDK
+            generation_config = {"max_output_tokens": max_output_tokens} if max_output_tokens else None
             
-            # Generate response
-            response = self.model.generate_content(prompt)
+            # Generate response (async API, so the event loop keeps serving other requests)
+            response = await asyncio.wait_for(
+                self._generate(prompt, generation_config), settings.GEMINI_TIMEOUT_SECONDS
+            )
             
             # Extract response text
             response_text = response.text if response.text else ""
@@ -85,21 +116,110 @@ class GeminiService:
                     response.usage_metadata.candidates_token_count
                 )
             
-            # Check for safety flags
+            # Check for safety flags (block_reason is an enum; 0 means not blocked)
             safety_flag = False
             if hasattr(response, 'prompt_feedback'):
-                safety_flag = response.prompt_feedback.block_reason is not None
+                safety_flag = bool(response.prompt_feedback.block_reason)
             
-            return {
+            result = {
                 "response_text": response_text,
                 "model_version": "gemini-1.5-pro",
                 "tokens_used": tokens_used,
                 "safety_flag": safety_flag
             }
+            if cacheable and response_text and not safety_flag:
+                ai_response_cache.set(user_message, system_prompt, result)
+            return result
         
+        except asyncio.TimeoutError:
+            raise GeminiUnavailableError("The AI assistant took too long to respond, please try again")
         except Exception as e:
             raise ValueError(f"Gemini API error: {str(e)}")
     
+    async def stream_response(
+        self, 
+        user_message: str, 
+        system_prompt: Optional[str] = None,
+        history: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream an AI response from Gemini as it is generated
+        
+        Yields {"text": ...} for each chunk, then one final dict with
+        model_version, tokens_used and safety_flag (same keys as generate_response).
+        Closing the iterator early cancels the underlying request. Cached
+        answers (see generate_response) arrive as a single chunk.
+        """
+        cacheable = history is None and not has_personal_context(user_message)
+        if not cacheable:
+            ai_response_cache.record_bypass()
+        else:
+            cached = ai_response_cache.get(user_message, system_prompt)
+            if cached is not None:
+                yield {"text": cached.pop("response_text")}
+                yield {**cached, "tokens_used": 0}
+                return
+        
+        timeout = settings.GEMINI_TIMEOUT_SECONDS
+        try:
+            await asyncio.wait_for(_gemini_slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise GeminiUnavailableError("The AI assistant took too long to respond, please try again")
+        
+        try:
+            prompt = self._build_prompt(user_message, system_prompt, history)
+            response = await asyncio.wait_for(
+                self.model.generate_content_async(prompt, stream=True), timeout
+            )
+            
+            parts = []
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout)
+                except StopAsyncIteration:
+                    break
+                # Chunks without parts (e.g. only safety ratings) carry no text
+                if chunk.parts:
+                    parts.append(chunk.text)
+                    yield {"text": chunk.text}
+            
+            tokens_used = None
+            usage = getattr(response, 'usage_metadata', None)
+            if usage is not None:
+                tokens_used = usage.prompt_token_count + usage.candidates_token_count
+            
+            result = {
+                "model_version": "gemini-1.5-pro",
+                "tokens_used": tokens_used,
+                "safety_flag": bool(response.prompt_feedback.block_reason)
+            }
+            if cacheable and parts and not result["safety_flag"]:
+                ai_response_cache.set(user_message, system_prompt, {**result, "response_text": "".join(parts)})
+            yield result
+        
+        except asyncio.TimeoutError:
+            raise GeminiUnavailableError("The AI assistant took too long to respond, please try again")
+        except Exception as e:
+            raise ValueError(f"Gemini API error: {str(e)}")
+        finally:
+            _gemini_slots.release()
+    
+    async def warm_up(self) -> None:
+        """Open the model's connection ahead of the first chat message"""
+        await asyncio.wait_for(self.model.count_tokens_async("ping"), settings.GEMINI_TIMEOUT_SECONDS)
+    
+    async def _generate(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None):
+        async with _gemini_slots:
+            return await self.model.generate_content_async(prompt, generation_config=generation_config)
+    
+    @staticmethod
+    def _build_prompt(user_message: str, system_prompt: Optional[str], history: Optional[str] = None) -> str:
+        if not system_prompt and not history:
+            return user_message
+        sections = [section for section in (system_prompt, history) if section]
+        return "\n\n".join(sections + [f"User: {user_message}", "Assistant:"])
+    
     def get_default_system_prompt(self) -> str:
         """Get the default system prompt for fitness coaching"""
         return """You are an expert fitness and nutrition coach AI assistant for Pump Fiction, 
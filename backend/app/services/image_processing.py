@@ -0,0 +1,95 @@
+"""
+Image decoding and resizing for uploaded photos
+CPU-bound helpers; run them off the event loop.
+"""
+import base64
+import binascii
+import io
+import os
+import tempfile
+from typing import Dict, Tuple
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Stored post photo variants: name -> longest edge in px (never upscaled)
+POST_PHOTO_VARIANTS = {"thumb": 320, "feed": 1080, "full": 2048}
+
+# Formats accepted from clients, by the content type they're stored under
+ALLOWED_CONTENT_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+
+
+def decode_data_uri(data_uri: str) -> Tuple[bytes, str]:
+    """Return (bytes, content_type) from a data:image/...;base64,<...> URI (ValueError if malformed)"""
+    header, sep, encoded = data_uri.partition(",")
+    if not sep or not header.startswith("data:") or not header.endswith(";base64"):
+        raise ValueError("image_base64 must be a data URI like data:image/jpeg;base64,<...>")
+
+    content_type = header[len("data:"):-len(";base64")].lower()
+    if content_type == "image/jpg":
+        content_type = "image/jpeg"
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise ValueError(f"Unsupported image type: {content_type}")
+
+    try:
+        return base64.b64decode(encoded, validate=True), content_type
+    except binascii.Error:
+        raise ValueError("image_base64 is not valid base64")
+
+
+def make_thumbnail(data: bytes, max_px: int, quality: int = 80) -> bytes:
+    """Downscale an image to fit max_px x max_px and re-encode it as JPEG (ValueError if not an image)"""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            # Honour the camera's orientation tag before dropping metadata
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_px, max_px))
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            out = io.BytesIO()
+            image.save(out, format="JPEG", quality=quality, optimize=True)
+            return out.getvalue()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ValueError("Could not read image") from e
+
+
+def decode_with_thumbnail(data_uri: str, max_px: int) -> Tuple[bytes, str, bytes]:
+    """Decode a data URI and thumbnail it in one process-pool hop; returns (bytes, content_type, thumbnail)"""
+    data, content_type = decode_data_uri(data_uri)
+    # Also rejects payloads that aren't decodable images before anything is stored
+    return data, content_type, make_thumbnail(data, max_px)
+
+
+def render_variants(src_path: str, sizes: Dict[str, int], quality: int) -> Dict[str, Tuple[str, int, int]]:
+    """Decode an image file once and write each size as WebP to a temp file.
+
+    Returns {name: (path, width, height)}; the caller deletes the files. EXIF
+    (camera, GPS) is dropped once the orientation has been applied. Meant for
+    the process pool: takes and returns paths so no image bytes are pickled.
+    """
+    written: Dict[str, Tuple[str, int, int]] = {}
+    try:
+        with Image.open(src_path) as image:
+            # Let JPEG decode straight at a reduced scale when the largest variant allows it
+            largest = max(sizes.values())
+            image.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+            for name, max_px in sorted(sizes.items(), key=lambda item: -item[1]):
+                variant = image.copy()
+                variant.thumbnail((max_px, max_px), Image.LANCZOS)
+                fd, path = tempfile.mkstemp(suffix=".webp")
+                with os.fdopen(fd, "wb") as out:
+                    variant.save(out, format="WEBP", quality=quality, method=4)
+                written[name] = (path, variant.width, variant.height)
+        return written
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        for path, _, _ in written.values():
+            os.unlink(path)
+        raise ValueError("Could not read image") from e
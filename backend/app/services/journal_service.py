@@ -1,37 +1,144 @@
-from typing import List, Optional
+import hashlib
+import mimetypes
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from ..repositories.journal_repository import JournalRepository
 from ..models.journal_model import JournalSession, JournalEntry
+from ..schemas.journal_schema import JournalSessionResponse, JournalEntryResponse
+from ..core.blob_store import get_blob_store
+from ..core.config import settings
+from ..core.executors import run_cpu, run_db, run_supabase
+from .image_processing import ALLOWED_CONTENT_TYPES, decode_data_uri, decode_with_thumbnail
+
+
+# (start, end) inclusive -> chunks of the image
+ImageReader = Callable[[int, int], Iterator[bytes]]
+
+
+class JournalImage(NamedTuple):
+    entry_id: int
+    etag: str
+    key: Optional[str]  # blob store key; None for a legacy inline image
 
 
 class JournalService:
     def __init__(self, db: Session):
         self.db = db
         self.repo = JournalRepository(db)
+        self.store = get_blob_store(settings.JOURNAL_BUCKET)
 
-    async def create_session(self, user_id: str, name: str) -> JournalSession:
-        return await self.repo.create_session(user_id, name)
+    async def create_session(self, user_id: str, name: str) -> JournalSessionResponse:
+        session = await run_db(self.repo.create_session, user_id, name)
+        return self._session_response(session, {})
 
-    async def list_sessions(self, user_id: str) -> List[JournalSession]:
-        return await self.repo.list_sessions(user_id)
+    async def list_sessions(self, user_id: str) -> List[JournalSessionResponse]:
+        sessions = await run_db(self.repo.list_sessions, user_id)
+        urls = await self._urls(session.cover_image_path for session in sessions)
+        return [self._session_response(session, urls) for session in sessions]
 
-    async def add_entry(self, session_id: int, user_id: str, image_base64: str, weight: Optional[float]) -> JournalEntry:
-        # verify session belongs to user
-        session = await self.repo.get_session(session_id, user_id)
-        if not session:
+    async def add_entry(self, session_id: int, user_id: str, image_base64: str, weight: Optional[float]) -> JournalEntryResponse:
+        # verify session belongs to user (without loading its entries)
+        if not await run_db(self.repo.exists_for_user, JournalSession, session_id, user_id):
             raise HTTPException(status_code=404, detail="Session not found")
 
-        if not image_base64 or ';base64,' not in image_base64:
-            raise HTTPException(status_code=400, detail="image_base64 must be a data URI like data:image/jpeg;base64,<...>")
+        try:
+            data, content_type, thumbnail = await run_cpu(
+                decode_with_thumbnail, image_base64 or "", settings.JOURNAL_THUMBNAIL_PX
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        image_path, thumbnail_path = await run_supabase(
+            self.store_image, user_id, session_id, data, content_type, thumbnail
+        )
+
+        try:
+            entry = await run_db(self.repo.add_entry, session_id, image_path, thumbnail_path, weight)
+        except Exception:
+            # Don't leave orphaned objects behind a failed insert
+            await run_supabase(self.store.delete, [image_path, thumbnail_path])
+            raise
+
+        # first entry's thumbnail becomes the cover if the session doesn't have one
+        await run_db(self.repo.set_session_cover, session_id, thumbnail_path, True)
+
+        urls = await self._urls([image_path, thumbnail_path])
+        return self._entry_response(entry, urls)
+
+    async def list_entries(self, session_id: int, user_id: str) -> List[JournalEntryResponse]:
+        entries = await run_db(self.repo.list_entries, session_id, user_id)
+        urls = await self._urls(key for entry in entries for key in (entry.image_path, entry.thumbnail_path))
+        return [self._entry_response(entry, urls) for entry in entries]
+
+    async def get_entry_image(self, entry_id: int, user_id: str, thumbnail: bool = False) -> JournalImage:
+        """Locate an entry's image without reading it, so If-None-Match can be answered first"""
+        ref = await run_db(self.repo.get_entry_image_ref, entry_id, user_id)
+        if not ref:
+            raise HTTPException(status_code=404, detail="Entry not found")
+
+        key = (ref.thumbnail_path if thumbnail else None) or ref.image_path
+        if key:
+            # Keys are never reused for other content, so they make strong validators
+            return JournalImage(entry_id, f'"{hashlib.sha1(key.encode()).hexdigest()}"', key)
+        if ref.has_legacy_image:
+            return JournalImage(entry_id, f'"legacy-{entry_id}"', None)
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    async def open_image(self, image: JournalImage) -> Tuple[int, str, ImageReader]:
+        """Return (size, content_type, reader) for an image found by get_entry_image"""
+        if image.key:
+            try:
+                size = await run_supabase(self.store.size, image.key)
+            except FileNotFoundError:
+                raise HTTPException(status_code=404, detail="Image not found")
+            content_type = mimetypes.guess_type(image.key)[0] or "application/octet-stream"
+            return size, content_type, lambda start, end: self.store.iter_range(image.key, start, end)
+
+        # Not yet moved by migrate_journal_images.py: decoded in memory
+        try:
+            legacy = await run_db(self.repo.get_legacy_image, image.entry_id)
+            data, content_type = await run_cpu(decode_data_uri, legacy or "")
+        except ValueError:
+            raise HTTPException(status_code=500, detail="Stored image is unreadable")
+        return len(data), content_type, lambda start, end: iter([data[start:end + 1]])
 
-        entry = await self.repo.add_entry(session_id, image_base64, weight)
+    def store_image(self, user_id: str, session_id: int, data: bytes, content_type: str, thumbnail: bytes) -> Tuple[str, str]:
+        """Upload an image and its thumbnail (blocking); returns (image_path, thumbnail_path)"""
+        stem = f"{user_id}/{session_id}/{uuid.uuid4().hex}"
+        image_path = f"{stem}.{ALLOWED_CONTENT_TYPES[content_type]}"
+        thumbnail_path = f"{stem}_thumb.jpg"
+        try:
+            self.store.put(image_path, data, content_type)
+            self.store.put(thumbnail_path, thumbnail, "image/jpeg")
+        except Exception:
+            self.store.delete([image_path, thumbnail_path])
+            raise
+        return image_path, thumbnail_path
 
-        # set cover image if session doesn't have one
-        if not session.cover_image_base64:
-            await self.repo.set_session_cover(session_id, image_base64)
+    async def _urls(self, keys: Iterable[Optional[str]]) -> Dict[str, str]:
+        keys = [key for key in keys if key]
+        if not keys:
+            return {}
+        return await run_supabase(self.store.urls, keys)
 
-        return entry
+    @staticmethod
+    def _session_response(session: JournalSession, urls: Dict[str, str]) -> JournalSessionResponse:
+        return JournalSessionResponse(
+            id=session.id,
+            name=session.name,
+            cover_image_url=urls.get(session.cover_image_path),
+            created_at=session.created_at,
+        )
 
-    async def list_entries(self, session_id: int, user_id: str) -> List[JournalEntry]:
-        return await self.repo.list_entries(session_id, user_id)
+    @staticmethod
+    def _entry_response(entry: JournalEntry, urls: Dict[str, str]) -> JournalEntryResponse:
+        return JournalEntryResponse(
+            id=entry.id,
+            session_id=entry.session_id,
+            date=entry.date,
+            image_url=urls.get(entry.image_path),
+            thumbnail_url=urls.get(entry.thumbnail_path),
+            weight=entry.weight,
+            created_at=entry.created_at,
+        )
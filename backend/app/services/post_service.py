@@ -1,15 +1,30 @@
+import asyncio
 import base64
+import os
+import re
+import tempfile
 import uuid
-from typing import List, Optional
+from typing import Awaitable, BinaryIO, Callable, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, UploadFile
 import io
 from ..repositories.post_repository import PostRepository
 from ..models.post_model import Post
-from ..schemas.post_schema import PostCreate, PostUpdate, PostResponse, PostWithUser, PostListResponse
+from ..schemas.post_schema import PostCreate, PostUpdate, PostResponse, PostWithUser, PostListResponse, PhotoUploadUrl, PhotoUploadUrlsResponse
+from ..core.blob_store import get_blob_store
+from ..core.config import settings
 from ..core.supabase_client import get_supabase_client
+from ..core.executors import run_supabase, run_db, run_cpu
+from .image_processing import ALLOWED_CONTENT_TYPES, POST_PHOTO_VARIANTS, render_variants
 import math
 
+# Read size for streaming uploads to disk
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Base64 characters decoded per step (a multiple of 4)
+BASE64_CHUNK_CHARS = 4 * 16 * 1024
+# File names handed out by create_upload_urls (after the direct_ prefix)
+DIRECT_UPLOAD_NAME = re.compile(r"[0-9a-f]{32}\.(%s)" % "|".join(sorted(set(ALLOWED_CONTENT_TYPES.values()))))
+
 
 class PostService:
     def __init__(self, db: Session):
@@ -17,23 +32,30 @@ class PostService:
         self.post_repository = PostRepository(db)
         self.supabase = get_supabase_client()
         self.storage_bucket = "post-photos"  # Create this bucket in Supabase
+        # Private bucket that direct uploads land in until they are processed
+        self.uploads = get_blob_store(settings.POST_UPLOADS_BUCKET)
     
     async def create_post(self, post_data: PostCreate, user_id: int) -> PostWithUser:
         """Create a new post with photos"""
+        # Reject oversized photos before the post is created
+        self._check_base64_photo_sizes(post_data.photos)
         try:
             # Create the post first
-            post = await self.post_repository.create_post(post_data, user_id)
+            post = await run_db(self.post_repository.create_post, post_data, user_id)
             
             # Upload photos if provided
             uploaded_photos = []
             if post_data.photos:
+                await self._release_connection()
                 uploaded_photos = await self._upload_photos(post_data.photos, post.id)
-                await self.post_repository.add_photos_to_post(post.id, uploaded_photos)
+                await run_db(self.post_repository.add_photos_to_post, post.id, uploaded_photos)
             
             # Get the complete post with photos and user info
-            complete_post = await self.post_repository.get_post_by_id(post.id)
+            complete_post = await run_db(self.post_repository.get_post_by_id, post.id)
             return self._convert_to_post_with_user(complete_post)
             
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create post: {str(e)}")
     
@@ -41,44 +63,26 @@ class PostService:
         """Upload photos from files for an existing post"""
         try:
             # Verify post belongs to user
-            post = await self.post_repository.get_post_by_id(post_id)
-            if not post or post.user_id != user_id:
-                raise HTTPException(status_code=404, detail="Post not found or not authorized")
+            await self._get_own_post(post_id, user_id)
             
-            # Upload files
-            uploaded_photos = []
+            # Reject bad files before anything is read or stored
             for file in files:
-                if not file.content_type.startswith('image/'):
+                if not (file.content_type or '').startswith('image/'):
                     raise HTTPException(status_code=400, detail=f"File {file.filename} is not an image")
-                
-                # Read file content
-                content = await file.read()
-                
-                # Generate unique filename
-                file_extension = file.filename.split('.')[-1] if '.' in file.filename else 'jpg'
-                filename = f"post_{post_id}_{uuid.uuid4()}.{file_extension}"
-                file_path = f"posts/{post_id}/{filename}"
-                
-                # Upload to Supabase storage
-                result = self.supabase.storage.from_(self.storage_bucket).upload(
-                    path=file_path,
-                    file=content,
-                    file_options={"content-type": file.content_type}
-                )
-                
-                if result.status_code != 200:
-                    raise HTTPException(status_code=500, detail=f"Failed to upload {file.filename}")
-                
-                # Get public URL
-                public_url = self.supabase.storage.from_(self.storage_bucket).get_public_url(file_path)
-                
-                uploaded_photos.append({
-                    'url': public_url,
-                    'path': file_path
-                })
+                if file.size is not None and file.size > settings.POST_PHOTO_MAX_BYTES:
+                    raise self._too_large(file.filename)
+            
+            async def upload(file: UploadFile) -> dict:
+                local_path = await self._spool_upload(file)
+                try:
+                    return await self._store_photo(post_id, local_path)
+                finally:
+                    await asyncio.to_thread(self._delete_local_files, [local_path])
+            
+            uploaded_photos = await self._upload_all([lambda file=file: upload(file) for file in files])
             
             # Add photos to post
-            await self.post_repository.add_photos_to_post(post_id, uploaded_photos)
+            await run_db(self.post_repository.add_photos_to_post, post_id, uploaded_photos)
             return uploaded_photos
             
         except HTTPException:
@@ -86,120 +90,391 @@ class PostService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to upload photos: {str(e)}")
     
+    async def create_upload_urls(self, post_id: int, user_id: int, content_types: List[str]) -> PhotoUploadUrlsResponse:
+        """Issue signed URLs so the client uploads photo bytes straight to storage"""
+        self._check_direct_uploads_enabled()
+        await self._get_own_post(post_id, user_id)
+        if len(content_types) > settings.POST_SIGNED_UPLOADS_MAX:
+            raise HTTPException(status_code=400, detail=f"At most {settings.POST_SIGNED_UPLOADS_MAX} photos per request")
+    
+        paths = []
+        for content_type in content_types:
+            extension = ALLOWED_CONTENT_TYPES.get(content_type.lower().replace('image/jpg', 'image/jpeg'))
+            if not extension:
+                raise HTTPException(status_code=400, detail=f"Unsupported image type: {content_type}")
+            paths.append(f"{self._direct_upload_prefix(post_id)}{uuid.uuid4().hex}.{extension}")
+    
+        bucket = self.supabase.storage.from_(settings.POST_UPLOADS_BUCKET)
+        try:
+            signed = await asyncio.gather(*(run_supabase(bucket.create_signed_upload_url, path) for path in paths))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to create upload URLs: {str(e)}")
+        return PhotoUploadUrlsResponse(uploads=[
+            PhotoUploadUrl(path=item['path'], signed_url=item['signed_url'], token=item['token'])
+            for item in signed
+        ])
+    
+    async def finalize_uploads(self, post_id: int, user_id: int, paths: List[str]) -> Tuple[PostWithUser, List[str]]:
+        """Attach photos uploaded through signed URLs; returns the post and the paths left to process.
+    
+        Only paths issued for this post are accepted. Each new one is claimed by
+        inserting its photo row ('processing'), so a path finalized twice, even
+        concurrently, is attached once. Claimed objects are size-checked with a
+        HEAD request; nothing is downloaded here. process_direct_uploads renders
+        the variants after the response is sent.
+        """
+        self._check_direct_uploads_enabled()
+        await self._get_own_post(post_id, user_id)
+        paths = list(dict.fromkeys(paths))
+        prefix = self._direct_upload_prefix(post_id)
+        for path in paths:
+            if not path.startswith(prefix) or not DIRECT_UPLOAD_NAME.fullmatch(path[len(prefix):]):
+                raise HTTPException(status_code=400, detail=f"{path} was not issued for post {post_id}")
+    
+        photos = {self._variant_paths(self._direct_upload_stem(path))['full']: path for path in paths}
+        claimed = set(await run_db(
+            self.post_repository.add_pending_photos, post_id, [self._photo_record(path) for path in photos]
+        ))
+        pending = [path for photo_path, path in photos.items() if photo_path in claimed]
+    
+        # The staging bucket already rejects oversized and non-image uploads; this catches
+        # files that were never uploaded and answers with the API's own limit
+        sizes = await asyncio.gather(*(run_supabase(self.uploads.size, path) for path in pending), return_exceptions=True)
+        error = None
+        for path, size in zip(pending, sizes):
+            if isinstance(size, FileNotFoundError):
+                error = HTTPException(status_code=400, detail=f"{path} has not been uploaded")
+            elif isinstance(size, BaseException):
+                error = HTTPException(status_code=500, detail=f"Failed to check {path}: {size}")
+            elif size > settings.POST_PHOTO_MAX_BYTES:
+                await self._remove_staged([path])
+                error = self._too_large(path)
+            if error:
+                await run_db(self.post_repository.remove_photos, post_id, list(claimed))
+                raise error
+    
+        return await self.get_post(post_id), pending
+    
+    async def process_direct_uploads(self, post_id: int, paths: List[str]) -> None:
+        """Render and store the variants of finalized direct uploads (background task).
+    
+        Each original is streamed to a temp file, processed like any other upload
+        (EXIF stripped, thumb/feed/full WebP variants) and then deleted from the
+        staging bucket. A photo that can't be processed is removed from the post.
+        """
+        semaphore = asyncio.Semaphore(settings.POST_UPLOAD_CONCURRENCY)
+    
+        async def render(path: str) -> Optional[dict]:
+            async with semaphore:
+                try:
+                    local_path = await run_supabase(self._download_to_file, path)
+                    try:
+                        return await self._store_photo(post_id, local_path, stem=self._direct_upload_stem(path))
+                    finally:
+                        await asyncio.to_thread(self._delete_local_files, [local_path])
+                except Exception as e:
+                    print(f"Warning: Failed to process direct upload {path}: {e!r}")
+                    return None
+                finally:
+                    await self._remove_staged([path])
+    
+        photos = await asyncio.gather(*(render(path) for path in paths))
+        # One session, so the rows are updated one at a time
+        for path, photo in zip(paths, photos):
+            if photo is None:
+                await run_db(self.post_repository.remove_photos, post_id,
+                             [self._variant_paths(self._direct_upload_stem(path))['full']])
+            elif not await run_db(self.post_repository.complete_photo, post_id, photo):
+                # Post deleted meanwhile: its photos' storage is already cleaned up
+                await self._remove_quietly(self._stored_paths(photo))
+    
+    @staticmethod
+    def _check_direct_uploads_enabled() -> None:
+        if not settings.POST_DIRECT_UPLOADS_ENABLED:
+            raise HTTPException(status_code=404, detail="Direct photo uploads are not enabled")
+    
+    async def _get_own_post(self, post_id: int, user_id: int) -> Post:
+        """Load a post owned by user_id (404 otherwise), then release the DB connection"""
+        post = await run_db(self.post_repository.get_post_by_id, post_id)
+        if not post or post.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Post not found or not authorized")
+        await self._release_connection()
+        return post
+    
+    async def _release_connection(self) -> None:
+        """End the session's transaction so its pooled connection isn't held through slow storage calls.
+        
+        Loaded objects stay readable (detached); the next repository call checks out a connection again.
+        """
+        await run_db(self.db.close)
+    
+    @staticmethod
+    def _direct_upload_prefix(post_id: int) -> str:
+        return f"posts/{post_id}/direct_"
+    
+    @staticmethod
+    def _direct_upload_stem(path: str) -> str:
+        """Variant stem of a direct upload; its full variant path is the photo row's key"""
+        return path.rsplit('.', 1)[0]
+    
+    def _download_to_file(self, file_path: str) -> str:
+        """Stream a staged upload to a temp file in chunks (blocking); returns its path"""
+        size = self.uploads.size(file_path)
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.upload') as out:
+            try:
+                if size:
+                    for chunk in self.uploads.iter_range(file_path, 0, size - 1, UPLOAD_CHUNK_BYTES):
+                        out.write(chunk)
+            except BaseException:
+                out.close()
+                os.unlink(out.name)
+                raise
+        return out.name
+    
     async def _upload_photos(self, photos: List[str], post_id: int) -> List[dict]:
         """Upload base64 encoded photos to Supabase storage"""
-        uploaded_photos = []
-        
-        for i, photo_data in enumerate(photos):
+        async def upload(photo_data: str) -> dict:
+            # Drop the data URL prefix if present (the format is detected from the bytes)
+            encoded = photo_data.split(',', 1)[1] if photo_data.startswith('data:') else photo_data
+            local_path = await asyncio.to_thread(self._spool_base64, encoded)
             try:
-                # Decode base64 image
-                if photo_data.startswith('data:image/'):
-                    # Remove data URL prefix
-                    header, encoded = photo_data.split(',', 1)
-                    image_data = base64.b64decode(encoded)
-                    # Extract file type from header
-                    file_extension = header.split('/')[1].split(';')[0]
-                else:
-                    # Assume it's pure base64
-                    image_data = base64.b64decode(photo_data)
-                    file_extension = 'jpg'  # Default
-                
-                # Generate unique filename
-                filename = f"post_{post_id}_{uuid.uuid4()}.{file_extension}"
-                file_path = f"posts/{post_id}/{filename}"
-                
-                # Upload to Supabase storage
-                result = self.supabase.storage.from_(self.storage_bucket).upload(
-                    path=file_path,
-                    file=image_data,
-                    file_options={"content-type": f"image/{file_extension}"}
-                )
-                
-                if result.status_code != 200:
-                    raise Exception(f"Upload failed for photo {i+1}")
-                
-                # Get public URL
-                public_url = self.supabase.storage.from_(self.storage_bucket).get_public_url(file_path)
-                
-                uploaded_photos.append({
-                    'url': public_url,
-                    'path': file_path
-                })
-                
-            except Exception as e:
-                # Clean up already uploaded photos if one fails
-                for uploaded in uploaded_photos:
-                    try:
-                        self.supabase.storage.from_(self.storage_bucket).remove([uploaded['path']])
-                    except:
-                        pass
-                raise Exception(f"Failed to upload photo {i+1}: {str(e)}")
+                return await self._store_photo(post_id, local_path)
+            finally:
+                await asyncio.to_thread(self._delete_local_files, [local_path])
+        
+        return await self._upload_all([lambda photo_data=photo_data: upload(photo_data) for photo_data in photos])
+    
+    async def _store_photo(self, post_id: int, local_path: str, stem: Optional[str] = None) -> dict:
+        """Render the thumb/feed/full WebP variants of a photo (process pool) and upload them together"""
+        try:
+            variants = await run_cpu(render_variants, local_path, POST_PHOTO_VARIANTS, settings.POST_PHOTO_QUALITY)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Photo is not a readable image")
+        
+        paths = self._variant_paths(stem or f"posts/{post_id}/post_{post_id}_{uuid.uuid4()}")
+        try:
+            results = await asyncio.gather(
+                *(run_supabase(self._put_file, paths[name], variant_path, "image/webp")
+                  for name, (variant_path, _, _) in variants.items()),
+                return_exceptions=True
+            )
+        finally:
+            await asyncio.to_thread(self._delete_local_files, [variant_path for variant_path, _, _ in variants.values()])
+        
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await self._remove_quietly(list(paths.values()))
+            raise errors[0]
+        
+        _, width, height = variants['full']
+        return {
+            **self._photo_record(paths['full']),
+            'thumbnail_url': self._public_url(paths['thumb']),
+            'thumbnail_path': paths['thumb'],
+            'feed_url': self._public_url(paths['feed']),
+            'feed_path': paths['feed'],
+            'width': width,
+            'height': height,
+        }
+    
+    @staticmethod
+    def _variant_paths(stem: str) -> dict:
+        return {name: f"{stem}_{name}.webp" for name in POST_PHOTO_VARIANTS}
+    
+    @staticmethod
+    def _check_base64_photo_sizes(photos: List[str]) -> None:
+        """Reject oversized base64 photos from their length alone, before decoding anything"""
+        for i, photo_data in enumerate(photos or []):
+            payload_chars = len(photo_data) - (photo_data.find(',') + 1)
+            if payload_chars * 3 // 4 > settings.POST_PHOTO_MAX_BYTES:
+                raise PostService._too_large(f"photo {i + 1}")
+    
+    @staticmethod
+    def _too_large(name: str) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"{name} is larger than {settings.POST_PHOTO_MAX_BYTES // (1024 * 1024)}MB"
+        )
+    
+    async def _upload_all(self, uploads: List[Callable[[], Awaitable[dict]]]) -> List[dict]:
+        """Run uploads concurrently (at most POST_UPLOAD_CONCURRENCY at a time), in order.
+        
+        If any fails, the ones that succeeded are removed in one storage call and the first error is raised.
+        """
+        semaphore = asyncio.Semaphore(settings.POST_UPLOAD_CONCURRENCY)
+        
+        async def bounded(upload: Callable[[], Awaitable[dict]]) -> dict:
+            async with semaphore:
+                return await upload()
+        
+        results = await asyncio.gather(*(bounded(upload) for upload in uploads), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if not errors:
+            return results
         
-        return uploaded_photos
+        # Clean up already uploaded photos if one fails
+        await self._remove_quietly([
+            path
+            for result in results if not isinstance(result, BaseException)
+            for path in self._stored_paths(result)
+        ])
+        raise errors[0]
+    
+    @staticmethod
+    def _stored_paths(photo) -> List[str]:
+        """Every storage object of a photo record or PostPhoto (all variants)"""
+        if isinstance(photo, dict):
+            paths = [photo.get('path'), photo.get('thumbnail_path'), photo.get('feed_path')]
+        else:
+            paths = [photo.photo_path, photo.thumbnail_path, photo.feed_path]
+        return [path for path in paths if path]
+    
+    async def _remove_staged(self, paths: List[str]) -> None:
+        """Delete direct-upload originals from the staging bucket, logging failures"""
+        try:
+            await run_supabase(self.uploads.delete, paths)
+        except Exception as e:
+            print(f"Warning: Failed to delete staged uploads {paths}: {e}")
+    
+    async def _remove_quietly(self, paths: List[str]) -> None:
+        if not paths:
+            return
+        try:
+            await run_supabase(self.supabase.storage.from_(self.storage_bucket).remove, paths)
+        except Exception as e:
+            print(f"Warning: Failed to clean up uploaded photos {paths}: {e}")
+    
+    @staticmethod
+    async def _spool_upload(file: UploadFile) -> str:
+        """Copy an upload to a temp file, enforcing the size limit as it goes; returns its path"""
+        # Local disk work: one thread hop for the whole copy, off the Supabase HTTP pool
+        return await asyncio.to_thread(PostService._copy_to_temp_file, file.file, file.filename)
+    
+    @staticmethod
+    def _copy_to_temp_file(source: BinaryIO, filename: Optional[str]) -> str:
+        """Copy a file object to a temp file in chunks (blocking); returns its path"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.upload') as out:
+            try:
+                received = 0
+                while chunk := source.read(UPLOAD_CHUNK_BYTES):
+                    received += len(chunk)
+                    if received > settings.POST_PHOTO_MAX_BYTES:
+                        raise PostService._too_large(filename)
+                    out.write(chunk)
+            except BaseException:
+                out.close()
+                os.unlink(out.name)
+                raise
+        return out.name
+    
+    @staticmethod
+    def _delete_local_files(local_paths: List[str]) -> None:
+        """Remove temp files (blocking)"""
+        for local_path in local_paths:
+            os.unlink(local_path)
+    
+    @staticmethod
+    def _spool_base64(encoded: str) -> str:
+        """Decode base64 into a temp file in chunks (blocking); returns its path"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.upload') as out:
+            carry = ''
+            for start in range(0, len(encoded), BASE64_CHUNK_CHARS):
+                # Decode whole 4-char groups only; whitespace is dropped and the remainder carried over
+                piece = carry + ''.join(encoded[start:start + BASE64_CHUNK_CHARS].split())
+                usable = len(piece) - len(piece) % 4
+                out.write(base64.b64decode(piece[:usable]))
+                carry = piece[usable:]
+            if carry:
+                out.write(base64.b64decode(carry + '=' * (-len(carry) % 4)))
+        return out.name
+    
+    def _put_file(self, file_path: str, local_path: str, content_type: str) -> None:
+        """Upload a local file to storage (blocking); the body is streamed from disk"""
+        with open(local_path, 'rb') as f:
+            result = self.supabase.storage.from_(self.storage_bucket).upload(
+                path=file_path,
+                file=f,
+                file_options={"content-type": content_type}
+            )
+        if result.status_code != 200:
+            raise Exception(f"Upload failed for {file_path}")
+    
+    def _public_url(self, file_path: str) -> str:
+        return self.supabase.storage.from_(self.storage_bucket).get_public_url(file_path)
+    
+    def _photo_record(self, file_path: str) -> dict:
+        # Get public URL
+        return {
+            'url': self._public_url(file_path),
+            'path': file_path
+        }
     
     async def get_post(self, post_id: int) -> PostWithUser:
         """Get a single post by ID"""
-        post = await self.post_repository.get_post_by_id(post_id)
+        post = await run_db(self.post_repository.get_post_by_id, post_id)
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
         return self._convert_to_post_with_user(post)
     
-    async def get_user_posts(self, user_id: int, page: int = 1, page_size: int = 20) -> PostListResponse:
+    async def get_user_posts(self, user_id: int, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> PostListResponse:
         """Get posts for a specific user with pagination"""
         skip = (page - 1) * page_size
-        posts = await self.post_repository.get_posts_by_user(user_id, skip, page_size)
-        total = await self.post_repository.count_user_posts(user_id)
+        posts, next_cursor = await run_db(self.post_repository.get_posts_by_user, user_id, skip, page_size, cursor)
+        total = await run_db(self.post_repository.count_user_posts, user_id)
         
         return PostListResponse(
             posts=[self._convert_to_post_with_user(post) for post in posts],
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=math.ceil(total / page_size)
+            total_pages=math.ceil(total / page_size),
+            next_cursor=next_cursor
         )
     
-    async def get_all_posts(self, page: int = 1, page_size: int = 20) -> PostListResponse:
+    async def get_all_posts(self, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> PostListResponse:
         """Get all posts with pagination"""
         skip = (page - 1) * page_size
-        posts = await self.post_repository.get_all_posts(skip, page_size)
-        total = await self.post_repository.count_all_posts()
+        posts, next_cursor = await run_db(self.post_repository.get_all_posts, skip, page_size, cursor)
+        total = await run_db(self.post_repository.count_all_posts)
         
         return PostListResponse(
             posts=[self._convert_to_post_with_user(post) for post in posts],
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=math.ceil(total / page_size)
+            total_pages=math.ceil(total / page_size),
+            next_cursor=next_cursor
         )
     
     async def update_post(self, post_id: int, post_data: PostUpdate, user_id: int) -> PostWithUser:
         """Update a post"""
-        post = await self.post_repository.update_post(post_id, post_data, user_id)
+        post = await run_db(self.post_repository.update_post, post_id, post_data, user_id)
         if not post:
             raise HTTPException(status_code=404, detail="Post not found or not authorized")
         
         # Get updated post with relations
-        updated_post = await self.post_repository.get_post_by_id(post.id)
+        updated_post = await run_db(self.post_repository.get_post_by_id, post.id)
         return self._convert_to_post_with_user(updated_post)
     
     async def delete_post(self, post_id: int, user_id: int) -> bool:
         """Delete a post and its photos"""
         # Get post first to get photo paths
-        post = await self.post_repository.get_post_by_id(post_id)
+        post = await run_db(self.post_repository.get_post_by_id, post_id)
         if not post or post.user_id != user_id:
             raise HTTPException(status_code=404, detail="Post not found or not authorized")
+        await self._release_connection()
         
-        # Delete photos from storage
+        # Delete photos (all variants) from storage
         if post.photos:
-            photo_paths = [photo.photo_path for photo in post.photos]
+            photo_paths = [path for photo in post.photos for path in self._stored_paths(photo)]
             try:
-                self.supabase.storage.from_(self.storage_bucket).remove(photo_paths)
+                await run_supabase(self.supabase.storage.from_(self.storage_bucket).remove, photo_paths)
             except Exception as e:
                 # Log error but don't fail the deletion
                 print(f"Warning: Failed to delete some photos from storage: {e}")
         
         # Soft delete the post
-        return await self.post_repository.delete_post(post_id, user_id)
+        return await run_db(self.post_repository.delete_post, post_id, user_id)
     
     def _convert_to_post_with_user(self, post: Post) -> PostWithUser:
         """Convert Post model to PostWithUser response"""
@@ -223,7 +498,12 @@ class PostService:
                     'post_id': photo.post_id,
                     'photo_url': photo.photo_url,
                     'photo_path': photo.photo_path,
+                    'thumbnail_url': photo.thumbnail_url,
+                    'feed_url': photo.feed_url,
+                    'width': photo.width,
+                    'height': photo.height,
                     'is_primary': photo.is_primary,
+                    'status': photo.status or 'ready',
                     'created_at': photo.created_at
                 }
                 for photo in (post.photos or [])
@@ -1,11 +1,17 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
+from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from ..core.pagination import Page
+from ..core.downsampling import lttb_indices
 from ..repositories.tracker_repository import TrackerRepository
 from ..schemas.tracker_schema import (
     TrackerCreate, TrackerUpdate, TrackerResponse, TrackerListResponse,
-    TrackerEntryCreate, TrackerEntryUpdate, TrackerEntryResponse
+    TrackerEntryCreate, TrackerEntryUpdate, TrackerEntryResponse,
+    TrackerExportLine, TrackerEntryExportLine,
+    TrackerSeriesResponse, TrackerSeriesBucket, TrackerSeriesPoint,
+    TrackerEntryBatchCreate, TrackerEntryBatchResponse
 )
 from ..models.tracker_model import Tracker, TrackerEntry
 
@@ -17,47 +23,37 @@ class TrackerService:
         self.repository = TrackerRepository(db)
 
     # Tracker operations
-    def get_tracker(self, tracker_id: int, user_id: int) -> TrackerResponse:
-        """Get a tracker by ID"""
-        tracker = self.repository.get_tracker_by_id(tracker_id, user_id)
+    def get_tracker(
+        self, tracker_id: int, user_id: int,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, entries_limit: Optional[int] = None
+    ) -> TrackerResponse:
+        """Get a tracker by ID (entries newest first, optionally windowed)"""
+        tracker = self.repository.get_tracker_by_id(tracker_id, user_id, date_from, date_to, entries_limit)
         if not tracker:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Tracker not found"
             )
 
-        # Sort entries by date (newest first) before returning
-        tracker.entries.sort(key=lambda e: e.date, reverse=True)
         return TrackerResponse.from_orm(tracker)
 
-    def get_all_trackers(self, user_id: int) -> List[TrackerResponse]:
-        """Get all trackers for a user with full entry data"""
-        trackers = self.repository.get_trackers_by_user(user_id)
+    def get_all_trackers(
+        self, user_id: int, limit: int = 100, cursor: Optional[str] = None,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, entries_limit: Optional[int] = None
+    ) -> Page[TrackerResponse]:
+        """Get a page of trackers for a user with entry data (newest first, optionally windowed)"""
+        trackers, next_cursor = self.repository.get_trackers_by_user(
+            user_id, limit, cursor, date_from, date_to, entries_limit
+        )
 
-        # Sort entries within each tracker
-        for tracker in trackers:
-            tracker.entries.sort(key=lambda e: e.date, reverse=True)
+        return Page([TrackerResponse.from_orm(tracker) for tracker in trackers], next_cursor)
 
-        return [TrackerResponse.from_orm(tracker) for tracker in trackers]
+    def get_trackers_list(self, user_id: int, limit: int = 100, cursor: Optional[str] = None) -> Page[TrackerListResponse]:
+        """Get a page of trackers for a user (optimized for list view)"""
+        rows, next_cursor = self.repository.get_tracker_summaries(user_id, limit, cursor)
 
-    def get_trackers_list(self, user_id: int) -> List[TrackerListResponse]:
-        """Get all trackers for a user (optimized for list view)"""
-        trackers = self.repository.get_trackers_list_by_user(user_id)
-
-        result = []
-        for tracker in trackers:
-            # Get last entry info if exists
-            last_entry_date = None
-            last_entry_value = None
-            entry_count = len(tracker.entries)
-
-            if tracker.entries:
-                # Sort to get the latest entry
-                sorted_entries = sorted(tracker.entries, key=lambda e: e.date, reverse=True)
-                last_entry_date = sorted_entries[0].date
-                last_entry_value = sorted_entries[0].value
-
-            result.append(TrackerListResponse(
+        result = [
+            TrackerListResponse(
                 id=tracker.id,
                 user_id=tracker.user_id,
                 name=tracker.name,
@@ -68,9 +64,11 @@ class TrackerService:
                 last_entry_value=last_entry_value,
                 created_at=tracker.created_at,
                 updated_at=tracker.updated_at
-            ))
+            )
+            for tracker, entry_count, last_entry_date, last_entry_value in rows
+        ]
 
-        return result
+        return Page(result, next_cursor)
 
     def create_tracker(self, user_id: int, tracker_data: TrackerCreate) -> TrackerResponse:
         """Create a new tracker"""
@@ -86,7 +84,6 @@ class TrackerService:
                 detail="Tracker not found"
             )
 
-        tracker.entries.sort(key=lambda e: e.date, reverse=True)
         return TrackerResponse.from_orm(tracker)
 
     def delete_tracker(self, tracker_id: int, user_id: int) -> bool:
@@ -100,11 +97,64 @@ class TrackerService:
         return True
 
     # TrackerEntry operations
-    def get_entries(self, tracker_id: int, user_id: int) -> List[TrackerEntryResponse]:
-        """Get all entries for a tracker"""
-        entries = self.repository.get_entries_by_tracker(tracker_id, user_id)
+    def get_entries(
+        self, tracker_id: int, user_id: int,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None, limit: Optional[int] = None
+    ) -> List[TrackerEntryResponse]:
+        """Get entries for a tracker (newest first, optionally windowed)"""
+        entries = self.repository.get_entries_by_tracker(tracker_id, user_id, date_from, date_to, limit)
         return [TrackerEntryResponse.from_orm(entry) for entry in entries]
 
+    def get_series(
+        self, tracker_id: int, user_id: int,
+        bucket: Optional[str] = None, points: Optional[int] = None,
+        date_from: Optional[datetime] = None, date_to: Optional[datetime] = None
+    ) -> TrackerSeriesResponse:
+        """Get a chart-sized series: SQL bucket aggregates, or LTTB downsampled to `points`"""
+        if not self.repository.exists_for_user(Tracker, tracker_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tracker not found"
+            )
+
+        if points is None:
+            rows = self.repository.get_entry_buckets(tracker_id, bucket or "day", date_from, date_to)
+            buckets = [
+                TrackerSeriesBucket(start=start, min=low, max=high, avg=avg, last=last, count=count)
+                for start, low, high, avg, last, count in rows
+            ]
+            return TrackerSeriesResponse(
+                tracker_id=tracker_id,
+                mode="bucket",
+                bucket=bucket or "day",
+                source_points=sum(b.count for b in buckets),
+                buckets=buckets
+            )
+
+        rows = self.repository.get_entry_points(tracker_id, date_from, date_to)
+        keep = lttb_indices([row.date.timestamp() for row in rows], [row.value for row in rows], points)
+        return TrackerSeriesResponse(
+            tracker_id=tracker_id,
+            mode="lttb",
+            source_points=len(rows),
+            points=[TrackerSeriesPoint(date=rows[i].date, value=rows[i].value) for i in keep]
+        )
+
+    def export_ndjson(
+        self, user_id: int, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """Yield NDJSON lines: every tracker, then every entry grouped by tracker (newest first)"""
+        cursor = None
+        while True:
+            trackers, cursor = self.repository.get_trackers_list_by_user(user_id, 500, cursor)
+            for tracker in trackers:
+                yield TrackerExportLine.model_validate(tracker).model_dump_json() + "\n"
+            if not cursor:
+                break
+
+        for entry in self.repository.iter_user_entries(user_id, date_from, date_to):
+            yield TrackerEntryExportLine.model_validate(entry).model_dump_json() + "\n"
+
     def create_entry(self, tracker_id: int, user_id: int, entry_data: TrackerEntryCreate) -> TrackerEntryResponse:
         """Create a new entry"""
         entry = self.repository.create_entry(tracker_id, user_id, entry_data)
@@ -115,6 +165,19 @@ class TrackerService:
             )
         return TrackerEntryResponse.from_orm(entry)
 
+    def create_entries_batch(
+        self, tracker_id: int, user_id: int, batch: TrackerEntryBatchCreate
+    ) -> TrackerEntryBatchResponse:
+        """Upsert many entries at once (idempotent on tracker_id + external_id)"""
+        if not self.repository.exists_for_user(Tracker, tracker_id, user_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tracker not found"
+            )
+
+        written = self.repository.upsert_entries(tracker_id, batch.entries)
+        return TrackerEntryBatchResponse(received=len(batch.entries), written=written)
+
     def update_entry(self, entry_id: int, tracker_id: int, user_id: int, entry_data: TrackerEntryUpdate) -> TrackerEntryResponse:
         """Update an entry"""
         entry = self.repository.update_entry(entry_id, tracker_id, user_id, entry_data)
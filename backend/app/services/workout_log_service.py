@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from datetime import date
 from fastapi import HTTPException, status
 
-from ..repositories.workout_log_repository import WorkoutLogRepository
+from ..core.pagination import Page
+from ..repositories.workout_log_repository import WorkoutLogRepository, SUMMARY_AGGREGATES
 from ..schemas.workout_log_schema import (
     WorkoutLogCreate,
     WorkoutLogUpdate,
@@ -17,29 +18,33 @@ class WorkoutLogService:
     def __init__(self, db: Session):
         self.repository = WorkoutLogRepository(db)
 
-    def get_all_workout_logs(self, user_id: UUID, limit: int = 100) -> List[WorkoutLogResponse]:
-        """Get all workout logs for a user."""
-        workout_logs = self.repository.get_all_workout_logs(user_id, limit)
-        return [WorkoutLogResponse.model_validate(log) for log in workout_logs]
+    def get_all_workout_logs(
+        self, user_id: UUID, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[WorkoutLogResponse]:
+        """Get a page of workout logs for a user."""
+        workout_logs, next_cursor = self.repository.get_all_workout_logs(user_id, limit, cursor=cursor)
+        return Page([WorkoutLogResponse.model_validate(log) for log in workout_logs], next_cursor)
 
-    def get_workout_logs_list(self, user_id: UUID, limit: int = 100) -> List[WorkoutLogListResponse]:
-        """Get workout logs with summary info (optimized for list view)."""
-        workout_logs = self.repository.get_all_workout_logs(user_id, limit)
+    def get_workout_logs_list(
+        self, user_id: UUID, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[WorkoutLogListResponse]:
+        """Get a page of workout logs with summary info (optimized for list view)."""
+        rows, next_cursor = self.repository.get_workout_log_summaries(user_id, limit, cursor)
 
-        return [
+        return Page([
             WorkoutLogListResponse(
                 id=log.id,
                 user_id=log.user_id,
                 workout_date=log.workout_date,
                 routine_title=log.routine_title,
                 day_label=log.day_label,
-                exercise_count=len(log.exercises),
-                total_sets=sum(len(ex.sets) for ex in log.exercises),
                 created_at=log.created_at,
                 updated_at=log.updated_at,
+                **{name: row._mapping[name] for name in SUMMARY_AGGREGATES},
             )
-            for log in workout_logs
-        ]
+            for row in rows
+            for log in (row[0],)
+        ], next_cursor)
 
     def get_workout_logs_by_date_range(
         self, user_id: UUID, start_date: date, end_date: date
@@ -0,0 +1,87 @@
+"""
+Load benchmark: sync repository calls inline vs. dispatched to the DB executor
+Run from backend directory: python benchmark_db_dispatch.py [--requests 200] [--concurrency 50]
+
+Two throwaway endpoints run the same blocking "repository" call (a real
+SQLAlchemy query plus simulated network latency to the database):
+  /inline      calls it directly inside `async def`, like the controllers used to
+  /dispatched  awaits app.core.executors.run_db, like the controllers do now
+Requests are fired concurrently through the ASGI app and throughput is reported.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.executors import run_db, db_executor
+
+
+def build_app(latency_s: float) -> FastAPI:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    def blocking_repository_call() -> int:
+        with engine.connect() as conn:
+            value = conn.execute(text("SELECT 1")).scalar()
+        time.sleep(latency_s)  # round trip to a remote Postgres
+        return value
+
+    app = FastAPI()
+
+    @app.get("/inline")
+    async def inline():
+        return {"value": blocking_repository_call()}
+
+    @app.get("/dispatched")
+    async def dispatched():
+        return {"value": await run_db(blocking_repository_call)}
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, total: int, concurrency: int) -> float:
+    """Return requests/second for `total` requests with `concurrency` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one_request():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    return total / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated DB round trip")
+    args = parser.parse_args()
+
+    app = build_app(args.latency_ms / 1000)
+
+    print("=" * 60)
+    print("DB DISPATCH BENCHMARK")
+    print("=" * 60)
+    print(f"Requests: {args.requests}, concurrency: {args.concurrency}, "
+          f"latency: {args.latency_ms}ms, db workers: {db_executor._max_workers}")
+
+    before = await measure(app, "/inline", args.requests, args.concurrency)
+    after = await measure(app, "/dispatched", args.requests, args.concurrency)
+
+    print(f"\nBefore (inline on event loop):  {before:8.1f} req/s")
+    print(f"After  (run_db thread pool):    {after:8.1f} req/s")
+    print(f"Speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
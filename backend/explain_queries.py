@@ -0,0 +1,264 @@
+"""
+Index coverage check: EXPLAIN every hot repository list query
+Run from backend directory: python explain_queries.py [--database-url URL]
+
+Seeds a few users' worth of workout logs, trackers, posts, routines and chat
+sessions inside a transaction, calls the real repository methods, EXPLAINs each
+SELECT they issued and rolls everything back. A query fails the check when its
+plan reads one of the app tables without an index:
+  Postgres  runs with enable_seqscan=off, so any remaining Seq Scan means no
+            usable index exists (not just that the seeded table is small)
+  SQLite    any plain SCAN or AUTOMATIC index on an app table
+Sorts that the index could not absorb are reported but do not fail the check.
+
+Defaults to an in-memory SQLite database built from the models, which checks
+the Index(...) declarations. Pass the DATABASE_URL of a staging copy to check
+the SQL migrations that were actually applied.
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import user_model, user_profile_model, post_model, tracker_model, routine_model, workout_log_model, ai_chat_model  # noqa: F401 (mapper registry)
+from app.models.user_model import User
+from app.models.workout_log_model import WorkoutLog, WorkoutExercise, WorkoutSet
+from app.models.tracker_model import Tracker, TrackerEntry
+from app.models.post_model import Post, PostPhoto
+from app.models.routine_model import RoutineHeader, RoutineExercise
+from app.models.ai_chat_model import AIChatSession
+from app.repositories.workout_log_repository import WorkoutLogRepository
+from app.repositories.tracker_repository import TrackerRepository
+from app.repositories.post_repository import PostRepository
+from app.repositories.routine_repository import RoutineRepository
+from app.repositories.ai_chat_repository import AIChatRepository
+
+TABLES = [
+    User.__table__,
+    WorkoutLog.__table__, WorkoutExercise.__table__, WorkoutSet.__table__,
+    Tracker.__table__, TrackerEntry.__table__,
+    Post.__table__, PostPhoto.__table__,
+    RoutineHeader.__table__, RoutineExercise.__table__,
+    AIChatSession.__table__,
+]
+CHECKED_TABLES = {table.name for table in TABLES}
+
+USERS, LOGS, TRACKERS, ENTRIES, POSTS, ROUTINES, SESSIONS = 3, 40, 5, 60, 40, 6, 15
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    # Only so the models can be created on the default SQLite database
+    return "JSON"
+
+
+def seed(session, is_postgres: bool) -> list:
+    """Add sample rows for a few users and return their ids"""
+    users = [User(email=f"explain-{uuid.uuid4()}@example.com", hashed_password="x") for _ in range(USERS)]
+    session.add_all(users)
+    session.flush()
+
+    start = datetime(2024, 1, 1)
+    for n, user in enumerate(users):
+        for i in range(LOGS):
+            log = WorkoutLog(user_id=user.id, workout_date=date(2024, 1, 1) + timedelta(days=i))
+            for e in range(3):
+                exercise = WorkoutExercise(exercise_name=f"Exercise {e}", position=e)
+                exercise.sets = [WorkoutSet(weight=20.0 + s, reps=8, position=s) for s in range(3)]
+                log.exercises.append(exercise)
+            session.add(log)
+
+        for i in range(TRACKERS):
+            tracker = Tracker(user_id=user.id, name=f"Tracker {i}", unit="kg", created_at=start + timedelta(hours=i))
+            tracker.entries = [TrackerEntry(date=start + timedelta(days=d), value=70.0 + d) for d in range(ENTRIES)]
+            session.add(tracker)
+
+        for i in range(POSTS):
+            # posts.user_id is UUID in SQL but declared Integer on the model
+            post = Post(user_id=user.id if is_postgres else n + 1, content=f"Post {i}",
+                        created_at=start + timedelta(hours=i))
+            post.photos = [PostPhoto(photo_url="https://example.com/p.jpg", photo_path=f"posts/{i}/p.jpg")]
+            session.add(post)
+
+        for i in range(ROUTINES):
+            routine = RoutineHeader(user_id=user.id, title=f"Routine {i}", created_at=start + timedelta(days=i))
+            routine.exercises = [RoutineExercise(title=f"Exercise {e}", position=e) for e in range(4)]
+            session.add(routine)
+
+        for i in range(SESSIONS):
+            session.add(AIChatSession(user_id=user.id, title=f"Chat {i}", context_snapshot={},
+                                      last_message_at=start + timedelta(hours=i)))
+
+    session.flush()
+    return [user.id for user in users]
+
+
+def sync_checks(user_id):
+    """(name, fn(sync_session)) pairs calling the repositories like the services do"""
+    def second_page(repo_call):
+        # Run page 1, then the cursor query for page 2
+        def run(session):
+            first = repo_call(session, None)
+            return repo_call(session, first.next_cursor)
+        return run
+
+    def tracker_entries(session):
+        trackers, _ = TrackerRepository(session).get_trackers_list_by_user(user_id, 1)
+        return TrackerRepository(session).get_entries_by_tracker(trackers[0].id, user_id)
+
+    return [
+        ("workout logs (full)", second_page(
+            lambda s, cursor: WorkoutLogRepository(s).get_all_workout_logs(user_id, 10, cursor=cursor))),
+        ("workout logs (summary)", second_page(
+            lambda s, cursor: WorkoutLogRepository(s).get_workout_log_summaries(user_id, 10, cursor))),
+        ("workout logs by date range", lambda s: WorkoutLogRepository(s).get_workout_logs_by_date_range(
+            user_id, date(2024, 1, 10), date(2024, 1, 20))),
+        ("exercise history", lambda s: WorkoutLogRepository(s).get_exercise_history(user_id, "Exercise 1")),
+        ("trackers (full)", second_page(
+            lambda s, cursor: TrackerRepository(s).get_trackers_by_user(user_id, 2, cursor))),
+        ("trackers (list)", second_page(
+            lambda s, cursor: TrackerRepository(s).get_tracker_summaries(user_id, 2, cursor))),
+        ("tracker entries", tracker_entries),
+        ("posts feed", second_page(lambda s, cursor: PostRepository(s).get_all_posts(0, 10, cursor))),
+        ("routines", lambda s: RoutineRepository(s).get_all_routines(user_id)),
+    ]
+
+
+def _pg_problems(plan: dict, problems: list, notes: list) -> None:
+    node_type = plan.get("Node Type")
+    relation = plan.get("Relation Name")
+    if node_type == "Seq Scan" and relation in CHECKED_TABLES:
+        problems.append(f"Seq Scan on {relation}")
+    if node_type in ("Sort", "Incremental Sort"):
+        notes.append(f"{node_type} on {', '.join(plan.get('Sort Key', []))}")
+    for child in plan.get("Plans", []):
+        _pg_problems(child, problems, notes)
+
+
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def _sqlite_problems(details: list, problems: list, notes: list) -> None:
+    for detail in details:
+        scan = _SQLITE_SCAN.match(detail)
+        if scan and scan.group(1) in CHECKED_TABLES and "USING" not in detail:
+            problems.append(detail)
+        elif "AUTOMATIC" in detail:
+            problems.append(detail)
+        elif "TEMP B-TREE" in detail:
+            notes.append(detail)
+
+
+async def explain(conn, is_postgres: bool, statement: str, parameters) -> tuple:
+    """Return (problems, notes) for one captured statement"""
+    problems, notes = [], []
+    if is_postgres:
+        result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        plan = result.scalar()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        _pg_problems(plan[0]["Plan"], problems, notes)
+    else:
+        result = await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        _sqlite_problems([row[3] for row in result.all()], problems, notes)
+    return problems, notes
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite+aiosqlite://",
+                        help="async SQLAlchemy URL (default: in-memory SQLite from the models)")
+    parser.add_argument("--verbose", action="store_true", help="print every statement and its findings")
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url, poolclass=StaticPool)
+    is_postgres = engine.dialect.name == "postgresql"
+
+    recording, captured = [False], []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if recording[0] and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    print("=" * 60)
+    print("INDEX COVERAGE (EXPLAIN) CHECK")
+    print("=" * 60)
+    print(f"Database: {engine.dialect.name}")
+
+    failures = 0
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            if not is_postgres:
+                await conn.run_sync(Base.metadata.create_all, tables=TABLES)
+
+            session = AsyncSession(bind=conn, expire_on_commit=False)
+            user_ids = await session.run_sync(seed, is_postgres)
+            user_id = user_ids[0]
+
+            if is_postgres:
+                await conn.exec_driver_sql("ANALYZE " + ", ".join(sorted(CHECKED_TABLES)))
+                await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+            checks = [
+                (name, lambda fn=fn: session.run_sync(fn)) for name, fn in sync_checks(user_id)
+            ] + [
+                ("chat sessions", lambda: AIChatRepository(session).get_user_sessions(str(user_id), limit=5)),
+            ]
+
+            for name, run in checks:
+                captured.clear()
+                recording[0] = True
+                try:
+                    await run()
+                finally:
+                    recording[0] = False
+
+                problems, notes = [], []
+                for statement, parameters in dict.fromkeys((s, _freeze(p)) for s, p in captured):
+                    found, noted = await explain(conn, is_postgres, statement, _thaw(parameters))
+                    problems += found
+                    notes += noted
+                    if args.verbose:
+                        print(f"\n{statement}\n  -> {found or 'ok'} {noted or ''}")
+
+                failures += bool(problems)
+                status = "❌" if problems else "✅"
+                print(f"{status} {name}: {len(captured)} queries"
+                      + (f" | {'; '.join(dict.fromkeys(problems))}" if problems else "")
+                      + (f" | sorts: {'; '.join(dict.fromkeys(notes))}" if notes else ""))
+
+            await session.close()
+        finally:
+            # Nothing seeded here is ever kept
+            await transaction.rollback()
+
+    await engine.dispose()
+    print(f"\n{'All queries use indexes' if not failures else f'{failures} query group(s) scan without an index'}")
+    return 1 if failures else 0
+
+
+def _freeze(parameters):
+    # Make DBAPI parameters hashable so identical statements are explained once
+    if isinstance(parameters, dict):
+        return ("dict", tuple(sorted(parameters.items())))
+    return ("seq", tuple(parameters or ()))
+
+
+def _thaw(frozen):
+    kind, items = frozen
+    return dict(items) if kind == "dict" else items
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,122 @@
+"""
+Move legacy base64 journal images into the blob store
+Run from backend directory after migrations/move_journal_images_to_storage.sql:
+    python migrate_journal_images.py [--batch-size 50] [--dry-run]
+
+For each entry that still has image_base64 and no image_path, uploads the image
+and a thumbnail (same keys and sizes as new uploads), records the keys and
+empties image_base64. Sessions then get their cover from the first entry's
+thumbnail. Every batch is committed on its own, so the script can be stopped
+and rerun at any time; rows already moved are skipped.
+"""
+import argparse
+import sys
+
+from sqlalchemy import select, update, func
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import user_model, user_profile_model, post_model, tracker_model, routine_model, workout_log_model, ai_chat_model  # noqa: F401 (mapper registry)
+from app.models.journal_model import JournalSession, JournalEntry
+from app.services.image_processing import decode_with_thumbnail
+from app.services.journal_service import JournalService
+
+
+def _legacy_entries(db, after_id: int, batch_size: int) -> list:
+    return db.execute(
+        select(JournalEntry.id, JournalEntry.session_id, JournalSession.user_id, JournalEntry.image_base64)
+        .join(JournalSession, JournalSession.id == JournalEntry.session_id)
+        .where(JournalEntry.id > after_id, JournalEntry.image_path.is_(None), JournalEntry.image_base64.isnot(None))
+        .order_by(JournalEntry.id)
+        .limit(batch_size)
+    ).all()
+
+
+def migrate_entries(batch_size: int, dry_run: bool) -> tuple:
+    """Return (moved, failed) entry counts"""
+    moved, failed, last_id = 0, 0, 0
+    while True:
+        db = SessionLocal()
+        try:
+            service = JournalService(db)
+            rows = _legacy_entries(db, last_id, batch_size)
+            if not rows:
+                return moved, failed
+
+            for entry_id, session_id, user_id, image_base64 in rows:
+                last_id = entry_id
+                if dry_run:
+                    moved += 1
+                    continue
+                try:
+                    data, content_type, thumbnail = decode_with_thumbnail(image_base64, settings.JOURNAL_THUMBNAIL_PX)
+                    image_path, thumbnail_path = service.store_image(user_id, session_id, data, content_type, thumbnail)
+                except Exception as e:
+                    # Left in place so a later run can retry it
+                    print(f"❌ entry {entry_id}: {e}")
+                    failed += 1
+                    continue
+
+                db.execute(
+                    update(JournalEntry)
+                    .where(JournalEntry.id == entry_id)
+                    .values(image_path=image_path, thumbnail_path=thumbnail_path, image_base64=None)
+                )
+                moved += 1
+
+            db.commit()
+            print(f"  ... {moved} entries moved (last id {last_id})")
+        finally:
+            db.close()
+
+
+def migrate_covers(dry_run: bool) -> int:
+    """Point sessions without a cover at their first entry's thumbnail and drop inline covers"""
+    db = SessionLocal()
+    try:
+        first_thumbnail = select(JournalEntry.thumbnail_path)\
+            .where(JournalEntry.session_id == JournalSession.id, JournalEntry.thumbnail_path.isnot(None))\
+            .order_by(JournalEntry.date, JournalEntry.id)\
+            .limit(1)\
+            .scalar_subquery()
+        if dry_run:
+            return db.scalar(select(func.count()).select_from(JournalSession).where(JournalSession.cover_image_path.is_(None), first_thumbnail.isnot(None)))
+
+        result = db.execute(
+            update(JournalSession)
+            .where(JournalSession.cover_image_path.is_(None), first_thumbnail.isnot(None))
+            .values(cover_image_path=first_thumbnail)
+        )
+        db.execute(
+            update(JournalSession)
+            .where(JournalSession.cover_image_path.isnot(None), JournalSession.cover_image_base64.isnot(None))
+            .values(cover_image_base64=None)
+        )
+        db.commit()
+        return result.rowcount
+    finally:
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=50, help="entries read and committed per batch")
+    parser.add_argument("--dry-run", action="store_true", help="only count what would be moved")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("JOURNAL IMAGES -> BLOB STORE" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 60)
+
+    moved, failed = migrate_entries(args.batch_size, args.dry_run)
+    covers = migrate_covers(args.dry_run)
+
+    print(f"\n✅ Entries moved: {moved}")
+    print(f"✅ Session covers set: {covers}")
+    if failed:
+        print(f"❌ Entries failed: {failed} (rerun to retry)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
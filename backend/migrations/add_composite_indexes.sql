@@ -0,0 +1,39 @@
+-- =====================================================
+-- Composite Indexes Migration
+-- =====================================================
+-- Covers the per-user, newest-first list queries so each page is an index
+-- range scan instead of a filter + sort over the whole table.
+-- Columns end in `id` where the list is keyset paginated on (timestamp, id).
+-- Matching Index(...) declarations live in the models' __table_args__.
+-- Check coverage afterwards with: python explain_queries.py --database-url <url>
+
+-- Workout history: WHERE user_id = ? ORDER BY workout_date DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_workout_logs_user_date_id ON workout_logs(user_id, workout_date, id);
+-- Superseded by idx_workout_logs_user_date_id
+DROP INDEX IF EXISTS idx_workout_logs_user_date;
+
+-- Exercises/sets per log (already created by create_workout_logs_tables.sql on fresh setups)
+CREATE INDEX IF NOT EXISTS idx_workout_exercises_workout_log_id ON workout_exercises(workout_log_id);
+CREATE INDEX IF NOT EXISTS idx_workout_sets_workout_exercise_id ON workout_sets(workout_exercise_id);
+
+-- Trackers: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_trackers_user_created ON trackers(user_id, created_at, id);
+
+-- Tracker entries: WHERE tracker_id = ? ORDER BY date DESC
+CREATE INDEX IF NOT EXISTS idx_tracker_entries_tracker_date ON tracker_entries(tracker_id, date);
+
+-- Global feed: WHERE is_active ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_posts_active_created ON posts(is_active, created_at, id);
+-- Profile feed: WHERE user_id = ? AND is_active ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_posts_user_active_created ON posts(user_id, is_active, created_at, id);
+-- A lone boolean index is never selective enough to be used; superseded by the two above
+DROP INDEX IF EXISTS idx_posts_active;
+
+-- Routines: WHERE user_id = ? AND is_archived = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_routine_headers_user_archived_created ON routine_headers(user_id, is_archived, created_at);
+
+-- AI chat sessions: WHERE user_id = ? AND is_archived = ? ORDER BY last_message_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS idx_ai_chat_sessions_user_archived_last ON ai_chat_sessions(user_id, is_archived, last_message_at, id);
+
+-- Refresh planner statistics for the touched tables
+ANALYZE workout_logs, workout_exercises, workout_sets, trackers, tracker_entries, posts, routine_headers, ai_chat_sessions;
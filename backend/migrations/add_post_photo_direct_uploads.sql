@@ -0,0 +1,11 @@
+-- =====================================================
+-- Post Photo Direct Uploads Migration
+-- =====================================================
+-- Photos finalized through POST /posts/{id}/photos/finalize are inserted as
+-- 'processing' and marked 'ready' once a background task has stored their
+-- variants. The unique index makes that insert the claim on an upload, so
+-- two concurrent finalizes of the same path can't both attach it.
+
+ALTER TABLE post_photos ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'ready';
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_post_photos_post_path ON post_photos(post_id, photo_path);
@@ -0,0 +1,14 @@
+-- =====================================================
+-- Post Photo Variants Migration
+-- =====================================================
+-- Uploaded post photos are now re-encoded to WebP (EXIF stripped) in three
+-- sizes. photo_url/photo_path hold the full-size variant; these columns hold
+-- the smaller ones. Photos uploaded earlier keep NULLs and clients fall back
+-- to photo_url.
+
+ALTER TABLE post_photos ADD COLUMN IF NOT EXISTS thumbnail_url TEXT;
+ALTER TABLE post_photos ADD COLUMN IF NOT EXISTS thumbnail_path TEXT;
+ALTER TABLE post_photos ADD COLUMN IF NOT EXISTS feed_url TEXT;
+ALTER TABLE post_photos ADD COLUMN IF NOT EXISTS feed_path TEXT;
+ALTER TABLE post_photos ADD COLUMN IF NOT EXISTS width INTEGER;
+ALTER TABLE post_photos ADD COLUMN IF NOT EXISTS height INTEGER;
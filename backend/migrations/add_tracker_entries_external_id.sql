@@ -0,0 +1,17 @@
+-- =====================================================
+-- external_id on tracker_entries
+-- =====================================================
+-- Lets POST /trackers/{id}/entries:batch upsert with ON CONFLICT on a
+-- client-supplied key, so device imports can be retried without creating
+-- duplicate data points. Entries created by hand keep external_id NULL and
+-- may share a date freely.
+
+ALTER TABLE tracker_entries ADD COLUMN IF NOT EXISTS external_id VARCHAR(255);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_tracker_entries_tracker_external_id
+    ON tracker_entries(tracker_id, external_id);
+
+-- Undo the table-wide (tracker_id, date) constraint if an earlier draft of this
+-- migration was applied, and bring back the plain index it replaced
+ALTER TABLE tracker_entries DROP CONSTRAINT IF EXISTS uq_tracker_entries_tracker_date;
+CREATE INDEX IF NOT EXISTS idx_tracker_entries_tracker_date ON tracker_entries(tracker_id, date);
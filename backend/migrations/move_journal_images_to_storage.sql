@@ -0,0 +1,31 @@
+-- =====================================================
+-- Journal Images -> Object Storage Migration
+-- =====================================================
+-- Journal photos move from base64 Text columns to the `journal-photos` storage
+-- bucket; rows keep only the object keys of the image and its thumbnail.
+-- Run this first, deploy, then move existing rows with:
+--   python migrate_journal_images.py
+-- Safe to run more than once.
+
+ALTER TABLE journal_entries ADD COLUMN IF NOT EXISTS image_path TEXT;
+ALTER TABLE journal_entries ADD COLUMN IF NOT EXISTS thumbnail_path TEXT;
+ALTER TABLE journal_sessions ADD COLUMN IF NOT EXISTS cover_image_path TEXT;
+
+-- Legacy inline columns stay readable until the data is moved, but new rows leave them empty
+ALTER TABLE journal_entries ADD COLUMN IF NOT EXISTS image_base64 TEXT;
+ALTER TABLE journal_entries ALTER COLUMN image_base64 DROP NOT NULL;
+ALTER TABLE journal_sessions ADD COLUMN IF NOT EXISTS cover_image_base64 TEXT;
+
+-- Tables created from add_journal_tables.sql also have a NOT NULL image_url that the app never writes
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'journal_entries' AND column_name = 'image_url'
+    ) THEN
+        ALTER TABLE journal_entries ALTER COLUMN image_url DROP NOT NULL;
+    END IF;
+END $$;
+
+-- After migrate_journal_images.py has emptied the base64 columns, reclaim the space with:
+--   VACUUM FULL journal_entries, journal_sessions;
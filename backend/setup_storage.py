@@ -3,6 +3,7 @@ Setup script to create the required Supabase storage bucket for posts
 Run this script once to set up the storage bucket
 """
 
+from app.core.config import settings
 from app.core.supabase_client import get_supabase_client
 
 
@@ -60,6 +61,52 @@ def setup_storage_bucket():
             print("You may need to create the bucket manually in Supabase dashboard")
 
 
+def setup_journal_bucket():
+    """Create the private journal-photos bucket (served through signed URLs)"""
+    supabase = get_supabase_client()
+    bucket_name = settings.JOURNAL_BUCKET
+
+    try:
+        supabase.storage.create_bucket(
+            bucket_name,
+            options={
+                "public": False,  # Progress photos are only reachable through signed URLs
+                "file_size_limit": 20971520,  # 20MB limit per file
+                "allowed_mime_types": ["image/jpeg", "image/png", "image/gif", "image/webp"]
+            }
+        )
+        print(f"✅ Successfully created bucket: {bucket_name}")
+    except Exception as e:
+        if "already exists" in str(e).lower():
+            print(f"✅ Bucket {bucket_name} already exists")
+        else:
+            print(f"❌ Error creating bucket: {e}")
+            print("You may need to create the bucket manually in Supabase dashboard")
+
+
+def setup_post_uploads_bucket():
+    """Create the private post-uploads bucket that direct (signed URL) uploads land in"""
+    supabase = get_supabase_client()
+    bucket_name = settings.POST_UPLOADS_BUCKET
+
+    try:
+        supabase.storage.create_bucket(
+            bucket_name,
+            options={
+                "public": False,  # Originals keep their EXIF; only the processed variants are public
+                "file_size_limit": settings.POST_PHOTO_MAX_BYTES,  # Enforced on signed uploads too
+                "allowed_mime_types": ["image/jpeg", "image/png", "image/gif", "image/webp"]
+            }
+        )
+        print(f"✅ Successfully created bucket: {bucket_name}")
+    except Exception as e:
+        if "already exists" in str(e).lower():
+            print(f"✅ Bucket {bucket_name} already exists")
+        else:
+            print(f"❌ Error creating bucket: {e}")
+            print("You may need to create the bucket manually in Supabase dashboard")
+
+
 def list_buckets():
     """List all storage buckets"""
     supabase = get_supabase_client()
@@ -75,5 +122,7 @@ def list_buckets():
 if __name__ == "__main__":
     print("🚀 Setting up Supabase storage for posts...")
     setup_storage_bucket()
+    setup_journal_bucket()
+    setup_post_uploads_bucket()
     print("\n📦 Current buckets:")
     list_buckets()
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Unit tests for the AI response cache in app/core/ai_response_cache.py and the
+personal-context bypass in app/services/gemini_service.py
+Run from backend directory: python test_ai_response_cache.py  (or: pytest test_ai_response_cache.py)
+"""
+import asyncio
+import types
+
+from app.core.ai_response_cache import AIResponseCache, ai_response_cache, normalize
+from app.services.chat_context import has_personal_context
+from app.services.gemini_service import GeminiService
+
+SYSTEM = "You are a fitness coach."
+REPLY = {"response_text": "3-5 sets of 6-12 reps", "model_version": "m", "tokens_used": 120, "safety_flag": False}
+
+
+def _cache(similarity: float = 0.0) -> AIResponseCache:
+    return AIResponseCache(max_entries=100, ttl_seconds=60, similarity=similarity)
+
+
+def test_normalize():
+    assert normalize("  How many SETS,  for hypertrophy?? ") == "how many sets for hypertrophy"
+    assert normalize("Best warm-up before squats!") == "best warmup before squats"
+    assert normalize("What's a deload") == "what's a deload"
+    print("✅ normalize lowercases, joins hyphenated words and drops punctuation")
+
+
+def test_exact_hit_and_miss():
+    cache = _cache()
+    assert cache.get("How many sets for hypertrophy?", SYSTEM) is None
+    cache.set("How many sets for hypertrophy?", SYSTEM, REPLY)
+
+    assert cache.get("how many sets for HYPERTROPHY", SYSTEM) == REPLY
+    assert cache.get("How many sets for hypertrophy?", "A different prompt") is None  # prompt version
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["fuzzy_hits"], stats["misses"]) == (1, 0, 2)
+    assert stats["tokens_saved"] == 120
+    print("✅ exact hits ignore case/punctuation and are scoped to the system prompt")
+
+
+def test_returned_reply_is_a_copy():
+    cache = _cache()
+    cache.set("what is a deload", SYSTEM, REPLY)
+    cache.get("what is a deload", SYSTEM).pop("response_text")
+    assert cache.get("what is a deload", SYSTEM) == REPLY
+    print("✅ callers can't modify a cached reply")
+
+
+def test_fuzzy_off_by_default():
+    cache = _cache()
+    cache.set("is it safe to squat with high blood pressure", SYSTEM, REPLY)
+    assert cache.get("is it safe to squat with low blood pressure", SYSTEM) is None
+    assert cache.get("how safe is it to squat with high blood pressure", SYSTEM) is None
+    assert cache.stats()["fuzzy_hits"] == 0
+    print("✅ without AI_CACHE_SIMILARITY only exact questions are reused")
+
+
+def test_fuzzy_match_when_enabled():
+    cache = _cache(similarity=0.8)
+    for i, question in enumerate([
+        "best exercises for bigger biceps",
+        "how long should i rest between sets",
+        "what should i eat before a morning workout",
+    ]):
+        cache.set(question, SYSTEM, {**REPLY, "response_text": f"answer {i}"})
+
+    assert cache.get("how long should i rest between my sets", SYSTEM)["response_text"] == "answer 1"
+    assert cache.get("best stretches for tight hamstrings", SYSTEM) is None
+    stats = cache.stats()
+    assert (stats["fuzzy_hits"], stats["misses"]) == (1, 1)
+    print("✅ fuzzy matching returns near-identical questions only when enabled")
+
+
+def test_personal_context_detection():
+    personal = [
+        "I'm a 45 year old beginner, should I take creatine?",
+        "I weigh 90kg, how much protein do I need?",
+        "I have low blood pressure, can I do squats and deadlifts?",
+        "my knee hurts when I lunge",
+        "is creatine ok if I'm pregnant",
+        "what should I do about lower back pain",
+        "I am forty years old, how often should I train?",
+    ]
+    generic = [
+        "how many sets for hypertrophy",
+        "what is progressive overload",
+        "I'm a beginner, what split should I follow?",
+        "best warm-up before squats",
+    ]
+    for message in personal:
+        assert has_personal_context(message), message
+    for message in generic:
+        assert not has_personal_context(message), message
+    print("✅ numbers, body details, health terms and disclaimer keywords count as personal")
+
+
+class _FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        return types.SimpleNamespace(
+            text=f"answer {self.calls}",
+            usage_metadata=types.SimpleNamespace(prompt_token_count=10, candidates_token_count=20),
+            prompt_feedback=types.SimpleNamespace(block_reason=0),
+        )
+
+
+def _gemini() -> GeminiService:
+    service = GeminiService.__new__(GeminiService)
+    service.model = _FakeModel()
+    return service
+
+
+def test_bypass_counters():
+    ai_response_cache.clear()
+    service = _gemini()
+    before = ai_response_cache.stats()
+
+    async def ask(message, history=None):
+        return (await service.generate_response(message, SYSTEM, history=history))["response_text"]
+
+    async def run():
+        # Personal messages skip the cache both ways: never read, never stored
+        assert await ask("I'm 16, is creatine safe for me?") == "answer 1"
+        assert await ask("I'm 16, is creatine safe for me?") == "answer 2"
+        # Anything with conversation history is bypassed too
+        assert await ask("is creatine safe", history="User: hi") == "answer 3"
+        # A generic question is answered once, then served from the cache
+        assert await ask("is creatine safe") == "answer 4"
+        assert await ask("Is creatine safe?") == "answer 4"
+
+    asyncio.run(run())
+    after = ai_response_cache.stats()
+    assert after["bypassed"] - before["bypassed"] == 3
+    assert after["exact_hits"] - before["exact_hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+    assert service.model.calls == 4
+    ai_response_cache.clear()
+    print("✅ personal and in-conversation messages bypass the cache and are counted")
+
+
+if __name__ == "__main__":
+    test_normalize()
+    test_exact_hit_and_miss()
+    test_returned_reply_is_a_copy()
+    test_fuzzy_off_by_default()
+    test_fuzzy_match_when_enabled()
+    test_personal_context_detection()
+    test_bypass_counters()
@@ -0,0 +1,52 @@
+"""
+Unit tests for LTTB downsampling in app/core/downsampling.py
+Run from backend directory: python test_downsampling.py  (or: pytest test_downsampling.py)
+"""
+import math
+
+from app.core.downsampling import lttb_indices
+
+
+def _series(n: int):
+    xs = [float(i) for i in range(n)]
+    ys = [math.sin(i / 7) * 10 + (i % 5) for i in range(n)]
+    return xs, ys
+
+
+def test_output_length_matches_threshold():
+    for n, threshold in [(1000, 100), (1000, 3), (101, 100), (5000, 777)]:
+        xs, ys = _series(n)
+        indices = lttb_indices(xs, ys, threshold)
+        assert len(indices) == threshold, f"n={n}: got {len(indices)} points, wanted {threshold}"
+        assert indices == sorted(set(indices)), f"n={n}: indices are not strictly increasing"
+    print("✅ LTTB returns exactly threshold points in order")
+
+
+def test_first_and_last_points_are_kept():
+    xs, ys = _series(500)
+    indices = lttb_indices(xs, ys, 50)
+    assert indices[0] == 0 and indices[-1] == len(xs) - 1
+    print("✅ LTTB keeps the first and last points")
+
+
+def test_short_series_pass_through():
+    xs, ys = _series(20)
+    assert lttb_indices(xs, ys, 20) == list(range(20))
+    assert lttb_indices(xs, ys, 500) == list(range(20))
+    assert lttb_indices([], [], 10) == []
+    print("✅ series no longer than threshold are returned whole")
+
+
+def test_spike_is_kept():
+    xs = [float(i) for i in range(1000)]
+    ys = [0.0] * 1000
+    ys[437] = 100.0
+    assert 437 in lttb_indices(xs, ys, 30)
+    print("✅ LTTB keeps an isolated spike")
+
+
+if __name__ == "__main__":
+    test_output_length_matches_threshold()
+    test_first_and_last_points_are_kept()
+    test_short_series_pass_through()
+    test_spike_is_kept()
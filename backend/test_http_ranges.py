@@ -0,0 +1,117 @@
+"""
+Unit tests for the conditional/partial GET helpers in app/core/http_ranges.py
+and the ranged reads in app/core/blob_store.py
+Run from backend directory: python test_http_ranges.py  (or: pytest test_http_ranges.py)
+"""
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core.blob_store import SupabaseBlobStore, _slice_chunks
+from app.core.http_ranges import etag_matches, parse_byte_range
+
+ETAG = '"abc123"'
+
+
+def test_etag_matches():
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches(f'W/{ETAG}', ETAG)
+    assert etag_matches(f'"other", {ETAG}', ETAG)
+    assert etag_matches("*", ETAG)
+    assert not etag_matches(None, ETAG)
+    assert not etag_matches("", ETAG)
+    assert not etag_matches('"other"', ETAG)
+    assert not etag_matches("abc123", ETAG)  # unquoted is a different tag
+    print("✅ If-None-Match matches exact, weak, listed and * tags")
+
+
+def test_parse_byte_range_satisfiable():
+    cases = [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=990-5000", (990, 999)),  # end clamped to the last byte
+        ("bytes=-100", (900, 999)),      # suffix range
+        ("bytes=-5000", (0, 999)),       # suffix longer than the file
+        ("BYTES = 5-5", (5, 5)),
+    ]
+    for header, expected in cases:
+        assert parse_byte_range(header, 1000) == expected, header
+    print("✅ single byte ranges resolve to inclusive (start, end)")
+
+
+@pytest.mark.parametrize("header", [
+    None,
+    "",
+    "items=0-10",
+    "bytes=0-10,20-30",  # multi-range
+    "bytes=10",
+    "bytes=a-b",
+    "bytes=50-10",       # end before start: invalid, so ignored (RFC 9110 §14.2)
+])
+def test_parse_byte_range_whole_body(header):
+    assert parse_byte_range(header, 1000) is None
+
+
+def test_parse_byte_range_if_range():
+    assert parse_byte_range("bytes=0-9", 1000, if_range=ETAG, etag=ETAG) == (0, 9)
+    assert parse_byte_range("bytes=0-9", 1000, if_range='"stale"', etag=ETAG) is None
+    print("✅ a stale If-Range falls back to the whole body")
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=1000-", 1000),
+    ("bytes=1000-2000", 1000),
+    ("bytes=-0", 1000),
+    ("bytes=-10", 0),
+])
+def test_parse_byte_range_unsatisfiable(header, size):
+    with pytest.raises(HTTPException) as error:
+        parse_byte_range(header, size)
+    assert error.value.status_code == 416
+    assert error.value.headers["Content-Range"] == f"bytes */{size}"
+
+
+def test_slice_chunks():
+    data = bytes(range(100))
+    chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+    for start, end in [(0, 99), (0, 0), (6, 7), (13, 14), (50, 99), (99, 99), (3, 60)]:
+        assert b"".join(_slice_chunks(iter(chunks), start, end)) == data[start:end + 1], (start, end)
+    print("✅ chunk slicing returns exactly the requested bytes")
+
+
+def _store(handler) -> SupabaseBlobStore:
+    store = SupabaseBlobStore("bucket", 60)
+    store._http = httpx.Client(transport=httpx.MockTransport(handler))
+    store._read_url = lambda key: f"https://storage.test/{key}"
+    return store
+
+
+def test_iter_range_handles_ignored_range():
+    data = bytes(range(256)) * 40
+
+    def honours_range(request: httpx.Request) -> httpx.Response:
+        start, end = (int(v) for v in request.headers["range"].removeprefix("bytes=").split("-"))
+        return httpx.Response(206, content=data[start:end + 1])
+
+    def ignores_range(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=data)
+
+    for handler in (honours_range, ignores_range):
+        store = _store(handler)
+        got = b"".join(store.iter_range("a.jpg", 1000, 4999, chunk_size=1024))
+        assert got == data[1000:5000], handler.__name__
+    print("✅ iter_range returns the requested slice even when upstream ignores Range")
+
+
+if __name__ == "__main__":
+    test_etag_matches()
+    test_parse_byte_range_satisfiable()
+    for header in [None, "", "items=0-10", "bytes=0-10,20-30", "bytes=10", "bytes=a-b", "bytes=50-10"]:
+        test_parse_byte_range_whole_body(header)
+    print("✅ unsupported or invalid ranges fall back to the whole body")
+    test_parse_byte_range_if_range()
+    for header, size in [("bytes=1000-", 1000), ("bytes=1000-2000", 1000), ("bytes=-0", 1000), ("bytes=-10", 0)]:
+        test_parse_byte_range_unsatisfiable(header, size)
+    print("✅ ranges past the end are rejected with 416")
+    test_slice_chunks()
+    test_iter_range_handles_ignored_range()
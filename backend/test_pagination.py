@@ -0,0 +1,76 @@
+"""
+Unit tests for the keyset cursor helpers in app/core/pagination.py
+Run from backend directory: python test_pagination.py  (or: pytest test_pagination.py)
+"""
+import base64
+import json
+import uuid
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor, split_page
+
+
+def _b64(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    row_id = uuid.uuid4()
+    cases = [
+        (datetime(2024, 5, 1, 13, 45, 9, 123456), 42),
+        (date(2024, 2, 29), row_id),
+        ("Leg day", 7),
+        (3.5, "abc"),
+    ]
+    for sort_value, key in cases:
+        cursor = encode_cursor(sort_value, key)
+        assert not set(cursor) & set("+/="), f"cursor is not URL-safe: {cursor}"
+        decoded = decode_cursor(cursor)
+        assert decoded == (sort_value, key), f"{decoded} != {(sort_value, key)}"
+        assert [type(v) for v in decoded] == [type(sort_value), type(key)]
+    print("✅ cursors round-trip datetimes, dates, UUIDs and plain values")
+
+
+TAMPERED_CURSORS = [
+    "not-a-cursor",
+    "%%%",
+    _b64("not json"),
+    _b64(json.dumps([["v", 1]])),                        # one value instead of two
+    _b64(json.dumps([["x", 1], ["v", 2]])),              # unknown tag
+    _b64(json.dumps([["v", {"a": 1}], ["v", 2]])),       # non-scalar value
+    _b64(json.dumps([["dt", "yesterday"], ["v", 2]])),   # unparseable datetime
+    _b64(json.dumps([["u", "not-a-uuid"], ["v", 2]])),
+    _b64(json.dumps({"sort": 1, "id": 2})),
+    encode_cursor(date(2024, 1, 1), 5)[:-3],             # truncated
+]
+
+
+@pytest.mark.parametrize("cursor", TAMPERED_CURSORS)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_split_page():
+    rows = [(date(2024, 1, 10 - i), i) for i in range(5)]
+
+    items, next_cursor = split_page(rows, 5, key=lambda row: row)
+    assert items == rows and next_cursor is None
+
+    # limit+1 rows: the probe row is dropped and the cursor points at the last kept row
+    items, next_cursor = split_page(rows, 4, key=lambda row: row)
+    assert items == rows[:4]
+    assert decode_cursor(next_cursor) == rows[3]
+    print("✅ split_page trims the probe row and builds the next cursor")
+
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    for cursor in TAMPERED_CURSORS:
+        test_tampered_cursor_is_rejected(cursor)
+    print("✅ tampered cursors are rejected with 400")
+    test_split_page()
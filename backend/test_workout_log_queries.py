@@ -0,0 +1,117 @@
+"""
+Query-count regression test for the workout log read endpoints
+Seeds an in-memory SQLite database and asserts each endpoint issues a fixed
+number of SELECTs no matter how many logs, exercises and sets exist.
+Run from backend directory: python test_workout_log_queries.py  (or: pytest test_workout_log_queries.py)
+"""
+import uuid
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.core.database import Base
+from app.core.dependencies import get_db, get_current_user
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models import user_model, post_model, tracker_model, routine_model, user_profile_model  # noqa: F401 (mapper registry)
+from app.models.user_model import User
+from app.models.workout_log_model import WorkoutLog, WorkoutExercise, WorkoutSet
+
+USER_ID = uuid.uuid4()
+LOGS, EXERCISES_PER_LOG, SETS_PER_EXERCISE = 20, 6, 4
+
+# Endpoint -> expected number of SELECT statements
+EXPECTED_QUERIES = {
+    "/workout-logs": 3,                                  # logs, exercises, sets
+    "/workout-logs/list": 1,                             # one grouped aggregate query
+    "/workout-logs/date-range?start_date=2000-01-01&end_date=2100-01-01": 3,
+    "/workout-logs/exercise/Exercise/history": 2,        # exercises+logs, sets
+}
+
+
+engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+TestSession = sessionmaker(bind=engine, autoflush=False)
+selects = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_selects(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip().upper().startswith("SELECT"):
+        selects.append(statement)
+
+
+def _seed():
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, WorkoutLog.__table__, WorkoutExercise.__table__, WorkoutSet.__table__
+    ])
+    db = TestSession()
+    for i in range(LOGS):
+        log = WorkoutLog(user_id=USER_ID, workout_date=date(2024, 1, 1) + timedelta(days=i))
+        for e in range(EXERCISES_PER_LOG):
+            exercise = WorkoutExercise(exercise_name=f"Exercise {e}", position=e)
+            exercise.sets = [WorkoutSet(weight=20.0 * s, reps=8, position=s) for s in range(SETS_PER_EXERCISE)]
+            log.exercises.append(exercise)
+        db.add(log)
+    db.commit()
+    db.close()
+
+
+def _override_db():
+    db = TestSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _client() -> TestClient:
+    app.dependency_overrides[get_db] = _override_db
+    app.dependency_overrides[get_current_user] = lambda: {"id": USER_ID, "role": "normal_user"}
+    return TestClient(app)
+
+
+def test_workout_log_read_query_counts():
+    _seed()
+    client = _client()
+    try:
+        for path, expected in EXPECTED_QUERIES.items():
+            selects.clear()
+            response = client.get(path)
+            assert response.status_code == 200, f"{path}: {response.status_code} {response.text}"
+            assert len(selects) == expected, f"{path}: expected {expected} queries, got {len(selects)}"
+            print(f"✅ {path}: {len(selects)} queries")
+
+        # The detail endpoint loads one log with its whole tree in a fixed number of queries
+        log_id = client.get("/workout-logs").json()[0]["id"]
+        selects.clear()
+        response = client.get(f"/workout-logs/{log_id}")
+        assert response.status_code == 200
+        assert len(response.json()["exercises"]) == EXERCISES_PER_LOG
+        assert len(selects) == 3, f"/workout-logs/{{id}}: expected 3 queries, got {len(selects)}"
+        print(f"✅ /workout-logs/{{id}}: {len(selects)} queries")
+
+        # Following X-Next-Cursor walks every log exactly once, newest first
+        for path in ("/workout-logs", "/workout-logs/list"):
+            seen, cursor = [], None
+            while True:
+                params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+                response = client.get(path, params=params)
+                assert response.status_code == 200
+                seen += [log["workout_date"] for log in response.json()]
+                cursor = response.headers.get(NEXT_CURSOR_HEADER)
+                if not cursor:
+                    break
+            assert seen == sorted(seen, reverse=True) and len(set(seen)) == LOGS, f"{path}: bad pages {seen}"
+            print(f"✅ {path}: {LOGS} logs over cursor pages")
+
+        assert client.get("/workout-logs", params={"cursor": "not-a-cursor"}).status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+        Base.metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    test_workout_log_read_query_counts()
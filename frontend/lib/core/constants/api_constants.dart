@@ -43,6 +43,7 @@ class ApiConstants {
   static const String contentType = 'application/json';
   static const String authorization = 'Authorization';
   static const String bearer = 'Bearer';
+  static const String nextCursorHeader = 'X-Next-Cursor';
 
   // Storage keys
   static const String accessTokenKey = 'access_token';
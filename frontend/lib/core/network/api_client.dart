@@ -50,6 +50,30 @@ class ApiClient {
     );
   }
 
+  /// GETs a cursor-paginated list endpoint, following the `X-Next-Cursor`
+  /// header until the last page, and returns the items of every page.
+  Future<List<dynamic>> getAllPages(
+    String path, {
+    Map<String, dynamic>? queryParameters,
+  }) async {
+    final items = <dynamic>[];
+    String? cursor;
+    do {
+      final response = await _dio.get<dynamic>(
+        path,
+        queryParameters: {
+          ...?queryParameters,
+          if (cursor != null) 'cursor': cursor,
+        },
+      );
+      if (response.data is List) {
+        items.addAll(response.data as List);
+      }
+      cursor = response.headers.value(ApiConstants.nextCursorHeader);
+    } while (cursor != null && cursor.isNotEmpty);
+    return items;
+  }
+
   Future<Response<T>> post<T>(
     String path, {
     dynamic data,
@@ -36,26 +36,13 @@ class ChatRepositoryImpl implements ChatRepository {
   @override
   Future<List<ChatSessionModel>> getSessions({bool isArchived = false}) async {
     try {
-      final response = await _apiClient.get(
+      // Sessions are cursor paginated; follow X-Next-Cursor to load them all
+      final data = await _apiClient.getAllPages(
         ApiConstants.aiChatSessions,
         queryParameters: {'is_archived': isArchived},
       );
 
-      if (response.statusCode == 200) {
-        final data = response.data;
-        // Handle empty list or null response
-        if (data == null || (data is List && data.isEmpty)) {
-          return [];
-        }
-
-        if (data is! List) {
-          throw Exception('Invalid response format: expected list, got ${data.runtimeType}');
-        }
-
-        return data.map((json) => ChatSessionModel.fromJson(json as Map<String, dynamic>)).toList();
-      } else {
-        throw Exception('Failed to get sessions: ${response.statusCode}');
-      }
+      return data.map((json) => ChatSessionModel.fromJson(json as Map<String, dynamic>)).toList();
     } on DioException catch (e) {
       if (e.response?.statusCode == 404) {
         return []; // No sessions found, return empty list
@@ -1,5 +1,6 @@
 import 'dart:convert';
 import 'dart:io';
+import '../../../../core/constants/api_constants.dart';
 import '../../../../core/network/api_client.dart';
 import '../../journal/domain/journal_models.dart';
 
@@ -15,7 +16,7 @@ class JournalRepository {
             id: (e['id']).toString(),
             name: e['name'] as String,
             createdAt: DateTime.parse(e['created_at'] as String),
-            coverImageBase64: e['cover_image_base64'] as String?,
+            coverImageUrl: _absoluteUrl(e['cover_image_url'] as String?),
           ),
         )
         .toList();
@@ -31,7 +32,7 @@ class JournalRepository {
       id: (e['id']).toString(),
       name: e['name'] as String,
       createdAt: DateTime.parse(e['created_at'] as String),
-      coverImageBase64: e['cover_image_base64'] as String?,
+      coverImageUrl: _absoluteUrl(e['cover_image_url'] as String?),
     );
   }
 
@@ -41,15 +42,7 @@ class JournalRepository {
     );
     final list = (res.data?['entries'] as List? ?? []);
     return list
-        .map(
-          (e) => JournalEntry(
-            id: (e['id']).toString(),
-            sessionId: (e['session_id']).toString(),
-            date: DateTime.parse(e['date'] as String),
-            imageBase64: e['image_base64'] as String,
-            weight: (e['weight'] as num?)?.toDouble(),
-          ),
-        )
+        .map((e) => _entryFromJson(e as Map<String, dynamic>))
         .toList();
   }
 
@@ -69,16 +62,22 @@ class JournalRepository {
       '/journal/sessions/$sessionId/entries',
       data: payload,
     );
-    final e = res.data!;
-    return JournalEntry(
-      id: (e['id']).toString(),
-      sessionId: (e['session_id']).toString(),
-      date: DateTime.parse(e['date'] as String),
-      imageBase64: e['image_base64'] as String,
-      weight: (e['weight'] as num?)?.toDouble(),
-    );
+    return _entryFromJson(res.data!);
   }
 
+  JournalEntry _entryFromJson(Map<String, dynamic> e) => JournalEntry(
+    id: (e['id']).toString(),
+    sessionId: (e['session_id']).toString(),
+    date: DateTime.parse(e['date'] as String),
+    imageUrl: _absoluteUrl(e['image_url'] as String?),
+    thumbnailUrl: _absoluteUrl(e['thumbnail_url'] as String?),
+    weight: (e['weight'] as num?)?.toDouble(),
+  );
+
+  /// Signed storage URLs are absolute; the local dev store returns paths on the API host
+  String? _absoluteUrl(String? url) =>
+      url == null ? null : Uri.parse(ApiConstants.baseUrl).resolve(url).toString();
+
   String _inferMimeType(String path) {
     final lower = path.toLowerCase();
     if (lower.endsWith('.png')) return 'image/png';
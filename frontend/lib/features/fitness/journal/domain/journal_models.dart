@@ -5,40 +5,40 @@ class JournalSession {
   final String name;
   final DateTime createdAt;
 
-  /// Optional cover image path (first entry image)
-  final String? coverImageBase64;
+  /// Optional cover thumbnail URL (first entry image)
+  final String? coverImageUrl;
 
   const JournalSession({
     required this.id,
     required this.name,
     required this.createdAt,
-    this.coverImageBase64,
+    this.coverImageUrl,
   });
 
   JournalSession copyWith({
     String? id,
     String? name,
     DateTime? createdAt,
-    String? coverImageBase64,
+    String? coverImageUrl,
   }) => JournalSession(
     id: id ?? this.id,
     name: name ?? this.name,
     createdAt: createdAt ?? this.createdAt,
-    coverImageBase64: coverImageBase64 ?? this.coverImageBase64,
+    coverImageUrl: coverImageUrl ?? this.coverImageUrl,
   );
 
   Map<String, dynamic> toJson() => {
     'id': id,
     'name': name,
     'createdAt': createdAt.toIso8601String(),
-    'coverImageBase64': coverImageBase64,
+    'coverImageUrl': coverImageUrl,
   };
 
   factory JournalSession.fromJson(Map<String, dynamic> json) => JournalSession(
     id: json['id'] as String,
     name: json['name'] as String,
     createdAt: DateTime.parse(json['createdAt'] as String),
-    coverImageBase64: json['coverImageBase64'] as String?,
+    coverImageUrl: json['coverImageUrl'] as String?,
   );
 }
 
@@ -46,14 +46,16 @@ class JournalEntry {
   final String id;
   final String sessionId;
   final DateTime date;
-  final String imageBase64; // data URI base64 image
+  final String? imageUrl; // full-size image
+  final String? thumbnailUrl; // small JPEG for grids and lists
   final double? weight;
 
   const JournalEntry({
     required this.id,
     required this.sessionId,
     required this.date,
-    required this.imageBase64,
+    this.imageUrl,
+    this.thumbnailUrl,
     this.weight,
   });
 
@@ -61,13 +63,15 @@ class JournalEntry {
     String? id,
     String? sessionId,
     DateTime? date,
-    String? imageBase64,
+    String? imageUrl,
+    String? thumbnailUrl,
     double? weight,
   }) => JournalEntry(
     id: id ?? this.id,
     sessionId: sessionId ?? this.sessionId,
     date: date ?? this.date,
-    imageBase64: imageBase64 ?? this.imageBase64,
+    imageUrl: imageUrl ?? this.imageUrl,
+    thumbnailUrl: thumbnailUrl ?? this.thumbnailUrl,
     weight: weight ?? this.weight,
   );
 
@@ -75,7 +79,8 @@ class JournalEntry {
     'id': id,
     'sessionId': sessionId,
     'date': date.toIso8601String(),
-    'imageBase64': imageBase64,
+    'imageUrl': imageUrl,
+    'thumbnailUrl': thumbnailUrl,
     'weight': weight,
   };
 
@@ -83,7 +88,8 @@ class JournalEntry {
     id: json['id'] as String,
     sessionId: json['sessionId'] as String,
     date: DateTime.parse(json['date'] as String),
-    imageBase64: json['imageBase64'] as String,
+    imageUrl: json['imageUrl'] as String?,
+    thumbnailUrl: json['thumbnailUrl'] as String?,
     weight: (json['weight'] as num?)?.toDouble(),
   );
 
@@ -36,7 +36,7 @@ class JournalSessionDetailPage extends ConsumerWidget {
                 itemBuilder: (context, i) {
                   final e = entries[i];
                   return PosterCard(
-                    imageBase64: e.imageBase64,
+                    imageUrl: e.thumbnailUrl ?? e.imageUrl,
                     title: _formatDate(e.date),
                     weight: e.weight,
                   );
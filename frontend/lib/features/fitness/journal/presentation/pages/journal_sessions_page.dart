@@ -1,5 +1,3 @@
-import 'dart:convert';
-import 'dart:typed_data';
 import 'package:flutter/material.dart';
 import 'package:flutter_riverpod/flutter_riverpod.dart';
 import '../../../journal/domain/journal_providers.dart';
@@ -83,15 +81,15 @@ class _SessionTile extends StatelessWidget {
       tileColor: Theme.of(context).colorScheme.surface,
       leading: ClipRRect(
         borderRadius: BorderRadius.circular(8),
-        child: session.coverImageBase64 == null
+        child: session.coverImageUrl == null
             ? Container(
                 width: 56,
                 height: 56,
                 color: Theme.of(context).colorScheme.primaryContainer,
                 child: const Icon(Icons.image_not_supported_outlined),
               )
-            : Image.memory(
-                _decodeDataUri(session.coverImageBase64!),
+            : Image.network(
+                session.coverImageUrl!,
                 width: 56,
                 height: 56,
                 fit: BoxFit.cover,
@@ -115,12 +113,6 @@ class _SessionTile extends StatelessWidget {
       },
     );
   }
-
-  static Uint8List _decodeDataUri(String dataUri) {
-    final comma = dataUri.indexOf(',');
-    final b64 = comma >= 0 ? dataUri.substring(comma + 1) : dataUri;
-    return base64Decode(b64);
-  }
 }
 
 class _EmptyState extends StatelessWidget {
@@ -1,16 +1,14 @@
-import 'dart:convert';
-
 import 'package:flutter/material.dart';
 import 'package:google_fonts/google_fonts.dart';
 
 class PosterCard extends StatelessWidget {
   const PosterCard({
     super.key,
-    required this.imageBase64,
+    required this.imageUrl,
     required this.title,
     this.weight,
   });
-  final String imageBase64;
+  final String? imageUrl;
   final String title;
   final double? weight;
 
@@ -69,16 +67,15 @@ class PosterCard extends StatelessWidget {
   }
 
   Widget _buildImage() {
-    final comma = imageBase64.indexOf(',');
-    final b64 = comma >= 0 ? imageBase64.substring(comma + 1) : imageBase64;
-    final bytes = base64Decode(b64);
-    return Image.memory(
-      bytes,
+    final placeholder = Container(
+      color: Colors.black12,
+      child: const Icon(Icons.broken_image, size: 48, color: Colors.white70),
+    );
+    if (imageUrl == null) return placeholder;
+    return Image.network(
+      imageUrl!,
       fit: BoxFit.cover,
-      errorBuilder: (_, __, ___) => Container(
-        color: Colors.black12,
-        child: const Icon(Icons.broken_image, size: 48, color: Colors.white70),
-      ),
+      errorBuilder: (_, __, ___) => placeholder,
     );
   }
 }
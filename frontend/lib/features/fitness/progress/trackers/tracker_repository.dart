@@ -8,17 +8,13 @@ class TrackerRepository {
 
   TrackerRepository({ApiClient? apiClient}) : _apiClient = apiClient ?? ApiClient();
 
-  /// Get all trackers for the current user
+  /// Get all trackers for the current user (every page of the cursor-paginated list)
   Future<List<Tracker>> getTrackers() async {
     try {
-      final response = await _apiClient.get(ApiConstants.trackers);
-
-      if (response.data is List) {
-        return (response.data as List)
-            .map((json) => Tracker.fromJson(json as Map<String, dynamic>))
-            .toList();
-      }
-      return [];
+      final trackers = await _apiClient.getAllPages(ApiConstants.trackers);
+      return trackers
+          .map((json) => Tracker.fromJson(json as Map<String, dynamic>))
+          .toList();
     } on DioException catch (e) {
       throw _handleError(e);
     }